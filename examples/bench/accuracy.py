@@ -0,0 +1,445 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Accuracy versus speed of the motrixsim solver settings.
+
+Every scenario is rolled out headless for each (max_iterations, timestep) setting and for a
+high-iteration reference. Each setting reports its throughput and how far it drifts from the
+reference: the RMSE of the hinge and slide joint positions, of the free joint positions and of the
+orientation angle of the free and ball joints, contact penetration depth and energy drift. Settings
+that no other setting beats on both speed and every error are marked as Pareto optimal.
+
+The scenarios are the ones of the gyroscope, Newton's cradle and grasp benches.
+
+Usage:
+    uv run examples/bench/accuracy.py
+    uv run examples/bench/accuracy.py --scenarios=gyroscope --iterations=1,4,16 --timesteps=0.002,0.004
+"""
+
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+from absl import app, flags
+
+from motrixsim import SceneData, load_model
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "grasp"))
+
+from common import (  # noqa: E402
+    INIT_QPOS,
+    LEFT_CONTACT_SENSOR,
+    RIGHT_CONTACT_SENSOR,
+    SETTLING_END_TIME,
+    compute_ctrl_for_time,
+    parse_motrixsim_contact_sensor,
+)
+
+_Scenarios = flags.DEFINE_list(
+    "scenarios",
+    ["gyroscope", "gyroscope_zero_gravity", "newton_cradle", "grasp"],
+    "Scenarios to run: gyroscope, gyroscope_zero_gravity, newton_cradle, grasp.",
+)
+_Iterations = flags.DEFINE_list("iterations", ["1", "2", "4", "8", "16", "32"], "Solver iteration limits to compare.")
+_Timesteps = flags.DEFINE_list("timesteps", [], "Timesteps in seconds to compare (default: the model timestep).")
+_ReferenceIterations = flags.DEFINE_integer(
+    "reference_iterations", 200, "Solver iteration limit of the reference rollout.", lower_bound=1
+)
+_Duration = flags.DEFINE_float("duration", None, "Rollout duration in seconds (default: per scenario).")
+_SampleDt = flags.DEFINE_float("sample_dt", 0.01, "Interval of the trajectory samples compared with the reference.")
+_Seed = flags.DEFINE_integer("seed", 0, "Seed of the random controls (grasp shake).")
+_Shake = flags.DEFINE_boolean("shake", False, "Shake the arm after the grasp, with seeded noise.")
+_Json = flags.DEFINE_string("json", None, "Write the results to this JSON file.")
+
+_ASSETS_DIR = Path(__file__).resolve().parents[1] / "assets"
+
+
+@dataclass
+class Scenario:
+    path: Path
+    duration: float
+    setup: Callable = lambda model, data: None
+    control: Optional[Callable] = None
+    contact_sensors: tuple = ()
+
+
+@dataclass
+class DofLayout:
+    """Columns of `dof_pos` by kind: hinge and slide joints, free joint positions, quaternions."""
+
+    joint: np.ndarray
+    free_pos: np.ndarray
+    quat: np.ndarray
+
+    @classmethod
+    def of(cls, model) -> "DofLayout":
+        # floating bases are stored as [tx, ty, tz, qx, qy, qz, qw], ball joints as a quaternion
+        bases = [np.asarray(base.dof_pos_indices) for base in model.floating_bases]
+        balls = [joint.dof_pos_index + np.arange(4) for joint in model.joints if joint.num_dof_pos == 4]
+        return cls(
+            joint=np.array([joint.dof_pos_index for joint in model.joints if joint.num_dof_pos == 1], dtype=int),
+            free_pos=np.array([indices[:3] for indices in bases], dtype=int).reshape(-1, 3),
+            quat=np.array([indices[3:] for indices in bases] + balls, dtype=int).reshape(-1, 4),
+        )
+
+
+@dataclass
+class Rollout:
+    times: np.ndarray
+    dof_pos: np.ndarray
+    energy: np.ndarray
+    kinetic_energy: np.ndarray
+    penetration: np.ndarray
+    step_seconds: float
+    num_steps: int
+
+
+def _spin(body_name: str, angular_velocity):
+    def setup(model, data):
+        floatingbase = model.get_body(model.get_body_index(body_name)).floatingbase
+        floatingbase.set_local_angular_velocity(data, np.array(angular_velocity))
+
+    return setup
+
+
+def _grasp_setup(model, data):
+    model.get_body(model.get_body_index("link0")).set_dof_pos(data, INIT_QPOS)
+    _grasp_ctrl(model, data, INIT_QPOS[:7], INIT_QPOS[7])
+
+
+def _grasp_ctrl(model, data, arm, gripper):
+    if arm is not None:
+        start = model.get_actuator_index("actuator1")
+        for i, val in enumerate(arm):
+            model.get_actuator(start + i).set_ctrl(data, val)
+    if gripper is not None:
+        model.get_actuator(model.get_actuator_index("actuator8")).set_ctrl(data, gripper)
+
+
+def _grasp_control(model, data, sim_time, step_cnt, rng):
+    arm, gripper = compute_ctrl_for_time(sim_time, _Shake.value, rng=rng, shake_step=step_cnt)
+    _grasp_ctrl(model, data, arm, gripper)
+
+
+SCENARIOS = {
+    "gyroscope": Scenario(_ASSETS_DIR / "gyroscope.xml", 2.0, setup=_spin("gyro", [0, 0, 50])),
+    "gyroscope_zero_gravity": Scenario(
+        _ASSETS_DIR / "gyroscope_zero_gravity.xml", 2.0, setup=_spin("base", [10, 0, 5])
+    ),
+    "newton_cradle": Scenario(_ASSETS_DIR / "newton_cradle_mt.xml", 2.0),
+    "grasp": Scenario(
+        _ASSETS_DIR / "franka_emika_panda" / "scene_pick_cube.xml",
+        SETTLING_END_TIME + 1.0,
+        setup=_grasp_setup,
+        control=_grasp_control,
+        contact_sensors=(LEFT_CONTACT_SENSOR, RIGHT_CONTACT_SENSOR),
+    ),
+}
+
+
+class _EnergyMeter:
+    """
+    Total energy of all links from their states and mass properties.
+
+    The rotational and potential energies are read every step. The translational energy is computed after
+    the rollout from the center of mass positions, differentiated over the trajectory: the reported linear
+    velocities of child links do not follow their motion, while their positions and angular velocities do.
+    """
+
+    def __init__(self, model, data):
+        self.model = model
+        self.mass = np.array([link.mass for link in model.links])
+        self.com = np.array([link.center_of_mass for link in model.links], dtype=np.float64)
+        inertia = np.array([link.get_inertia_override(data) for link in model.links], dtype=np.float64)
+        ixx, iyy, izz, ixy, ixz, iyz = inertia.T
+        self.inertia = np.stack(
+            [np.stack([ixx, ixy, ixz], -1), np.stack([ixy, iyy, iyz], -1), np.stack([ixz, iyz, izz], -1)], -2
+        )
+        self.gravity = np.asarray(model.options.gravity, dtype=np.float64)
+
+    def read(self, data) -> tuple[np.ndarray, float, float]:
+        """Center of mass positions of the links, their rotational energy and their potential energy."""
+        rotation = self.model.get_link_rotation_mats(data).astype(np.float64)
+        position = self.model.get_link_poses(data)[:, :3].astype(np.float64)
+        angular = self.model.get_link_velocities(data)[:, 3:].astype(np.float64)
+        com = position + np.einsum("nij,nj->ni", rotation, self.com)
+        angular_local = np.einsum("nji,nj->ni", rotation, angular)
+        rotational = 0.5 * np.sum(np.einsum("ni,nij,nj->n", angular_local, self.inertia, angular_local))
+        potential = -np.sum(self.mass * (com @ self.gravity))
+        return com, float(rotational), float(potential)
+
+    def kinetic_energy(self, com: np.ndarray, rotational: np.ndarray, dt: float) -> np.ndarray:
+        """Kinetic energy along a trajectory of (num_samples, num_links, 3) center of mass positions."""
+        velocity = np.gradient(com, dt, axis=0)
+        return 0.5 * np.sum(self.mass * np.sum(velocity * velocity, -1), -1) + rotational
+
+
+def _penetration(model, data, contact_sensors: tuple) -> float:
+    """Deepest penetration in meters, from the contact sensors of the scenario or from all contacts."""
+    if contact_sensors:
+        dists = [
+            contact["dist"]
+            for name in contact_sensors
+            for contact in parse_motrixsim_contact_sensor(model.get_sensor_value(name, data))
+        ]
+    else:
+        dists = [contact.depth for contact in data.low.get_contacts()]
+    return max(0.0, -min(dists, default=0.0))
+
+
+def _rollout(scenario: Scenario, duration: float, max_iterations: int, timestep: Optional[float]) -> Rollout:
+    model = load_model(str(scenario.path))
+    model.options.max_iterations = max_iterations
+    if timestep is not None:
+        model.options.timestep = timestep
+    dt = float(model.options.timestep)
+    data = SceneData(model)
+    scenario.setup(model, data)
+    model.forward_kinematic(data)
+    energy_meter = _EnergyMeter(model, data)
+    rng = np.random.default_rng(_Seed.value)
+
+    num_steps = int(round(duration / dt))
+    times = np.arange(num_steps + 1) * dt
+    dof_pos = np.empty((num_steps + 1, model.num_dof_pos))
+    com = np.empty((num_steps + 1, model.num_links, 3))
+    rotational = np.empty(num_steps + 1)
+    potential = np.empty(num_steps + 1)
+    penetration = np.zeros(num_steps + 1)
+    dof_pos[0] = data.dof_pos
+    com[0], rotational[0], potential[0] = energy_meter.read(data)
+
+    step_seconds = 0.0
+    for i in range(num_steps):
+        if scenario.control is not None:
+            scenario.control(model, data, i * dt, i, rng)
+        # only the physics step is timed, not the recording
+        t0 = time.perf_counter()
+        model.step(data)
+        step_seconds += time.perf_counter() - t0
+        dof_pos[i + 1] = data.dof_pos
+        com[i + 1], rotational[i + 1], potential[i + 1] = energy_meter.read(data)
+        penetration[i + 1] = _penetration(model, data, scenario.contact_sensors)
+    kinetic_energy = energy_meter.kinetic_energy(com, rotational, dt)
+    return Rollout(times, dof_pos, kinetic_energy + potential, kinetic_energy, penetration, step_seconds, num_steps)
+
+
+def _interp(rollout: Rollout, sample_times: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Linear interpolation of per-step values of shape (num_steps + 1, ...) at the sample times."""
+    flat = values.reshape(len(values), -1)
+    resampled = np.empty((len(sample_times), flat.shape[1]))
+    for i, column in enumerate(flat.T):
+        resampled[:, i] = np.interp(sample_times, rollout.times, column)
+    return resampled.reshape(len(sample_times), *values.shape[1:])
+
+
+def _resample(rollout: Rollout, sample_times: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """`dof_pos` columns at the sample times, shape (num_samples, *columns.shape)."""
+    return _interp(rollout, sample_times, rollout.dof_pos[:, columns])
+
+
+def _resample_quat(rollout: Rollout, sample_times: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Quaternions of shape (num_quats, 4) at the sample times, interpolated between steps and normalized.
+
+    q and -q are the same rotation: the signs are made continuous along the rollout before the
+    componentwise interpolation, so a sign flip does not interpolate through zero.
+    """
+    quats = rollout.dof_pos[:, columns].copy()
+    flips = np.sum(quats[1:] * quats[:-1], axis=-1) < 0.0
+    signs = np.concatenate([np.ones((1, len(columns))), np.cumprod(np.where(flips, -1.0, 1.0), axis=0)])
+    quats *= signs[..., None]
+    resampled = _interp(rollout, sample_times, quats)
+    return resampled / np.linalg.norm(resampled, axis=-1, keepdims=True)
+
+
+def _rmse(error: np.ndarray) -> Optional[float]:
+    """Root mean square of the errors, None when the scenario has no dof of that kind."""
+    return float(np.sqrt(np.mean(error * error))) if error.size else None
+
+
+def _energy_drift(rollout: Rollout) -> float:
+    """Change of the total energy over the rollout, relative to the peak kinetic energy.
+
+    The potential energy depends on the height of the world origin, the kinetic energy does not.
+    """
+    scale = max(float(np.max(rollout.kinetic_energy)), 1e-9)
+    return float((rollout.energy[-1] - rollout.energy[0]) / scale)
+
+
+def _evaluate(rollout: Rollout, reference: Rollout, layout: DofLayout, duration: float) -> dict:
+    sample_times = np.arange(0.0, duration + 1e-9, _SampleDt.value)
+    joint_error = _resample(rollout, sample_times, layout.joint) - _resample(reference, sample_times, layout.joint)
+    free_error = np.linalg.norm(
+        _resample(rollout, sample_times, layout.free_pos) - _resample(reference, sample_times, layout.free_pos), axis=-1
+    )
+    # rotation angle between the orientations, sign invariant
+    dot = np.sum(
+        _resample_quat(rollout, sample_times, layout.quat) * _resample_quat(reference, sample_times, layout.quat),
+        axis=-1,
+    )
+    angle_error = 2.0 * np.arccos(np.minimum(np.abs(dot), 1.0))
+    return {
+        "steps_per_second": rollout.num_steps / rollout.step_seconds,
+        "realtime_factor": duration / rollout.step_seconds,
+        "joint_pos_rmse": _rmse(joint_error),
+        "free_pos_rmse": _rmse(free_error),
+        "orientation_rmse": _rmse(angle_error),
+        "max_penetration_mm": float(rollout.penetration.max() * 1000),
+        "mean_penetration_mm": float(rollout.penetration.mean() * 1000),
+        "energy_drift": _energy_drift(rollout),
+        "energy_drift_error": _energy_drift(rollout) - _energy_drift(reference),
+    }
+
+
+_ERROR_METRICS = ("joint_pos_rmse", "free_pos_rmse", "orientation_rmse")
+
+
+def _mark_pareto(rows: list[dict]) -> None:
+    """Mark the settings that no other setting beats on realtime factor and every error metric."""
+
+    def objectives(row: dict) -> list[float]:
+        # maximized: realtime factor and the negated errors of the dof kinds of the scenario
+        return [row["realtime_factor"]] + [-row[key] for key in _ERROR_METRICS if row[key] is not None]
+
+    for row in rows:
+        mine = objectives(row)
+        row["pareto"] = not any(
+            all(a >= b for a, b in zip(theirs, mine)) and any(a > b for a, b in zip(theirs, mine))
+            for theirs in map(objectives, rows)
+        )
+
+
+def _format_table(rows: list[dict]) -> str:
+    columns = [
+        ("pareto", "P", 3),
+        ("max_iterations", "Iters", 7),
+        ("timestep", "dt (s)", 9),
+        ("steps_per_second", "Steps/s", 12),
+        ("realtime_factor", "Realtime", 10),
+        ("joint_pos_rmse", "Joint RMSE", 11),
+        ("free_pos_rmse", "Free m RMSE", 12),
+        ("orientation_rmse", "Rot rad RMSE", 13),
+        ("max_penetration_mm", "Max pen mm", 12),
+        ("mean_penetration_mm", "Mean pen mm", 12),
+        ("energy_drift", "E drift", 10),
+        ("energy_drift_error", "E drift err", 12),
+    ]
+    lines = [" ".join(title.rjust(width) for _, title, width in columns)]
+    lines.append("-" * len(lines[0]))
+    for row in rows:
+        values = []
+        for key, _, width in columns:
+            value = row[key]
+            if value is None:
+                text = "-"
+            elif key == "pareto":
+                text = "*" if value else ""
+            elif key in ("max_iterations",):
+                text = str(value)
+            elif key == "timestep":
+                text = f"{value:.5f}"
+            elif key in ("steps_per_second", "realtime_factor"):
+                text = f"{value:.1f}"
+            elif key in ("energy_drift", "energy_drift_error"):
+                text = f"{value:+.2%}"
+            elif key in _ERROR_METRICS:
+                text = f"{value:.3e}"
+            else:
+                text = f"{value:.3f}"
+            values.append(text.rjust(width))
+        lines.append(" ".join(values))
+    return "\n".join(lines)
+
+
+def _run_scenario(name: str, iterations: list[int], timesteps: list[Optional[float]]) -> Optional[dict]:
+    scenario = SCENARIOS[name]
+    duration = _Duration.value or scenario.duration
+    print("=" * 100)
+    print(f"[{name}] {scenario.path}")
+    try:
+        model = load_model(str(scenario.path))
+    except Exception as exc:  # e.g. a missing mesh
+        print(f"  skipped: {exc}")
+        print()
+        return None
+
+    layout = DofLayout.of(model)
+    default_timestep = float(model.options.timestep)
+    resolved_timesteps = [timestep or default_timestep for timestep in timesteps]
+    reference_timestep = min(resolved_timesteps)
+    reference = _rollout(scenario, duration, _ReferenceIterations.value, reference_timestep)
+    print(
+        f"  Reference: {_ReferenceIterations.value} iterations, dt {reference_timestep:g} s, "
+        f"{duration:g} s rollout, energy drift {_energy_drift(reference):+.2%}"
+    )
+    print()
+
+    rows = []
+    for timestep in resolved_timesteps:
+        for max_iterations in iterations:
+            rollout = _rollout(scenario, duration, max_iterations, timestep)
+            rows.append(
+                {
+                    "max_iterations": max_iterations,
+                    "timestep": timestep,
+                    **_evaluate(rollout, reference, layout, duration),
+                }
+            )
+    _mark_pareto(rows)
+    print(_format_table(rows))
+    print()
+    return {
+        "scenario": name,
+        "path": str(scenario.path),
+        "duration": duration,
+        "reference": {"max_iterations": _ReferenceIterations.value, "timestep": reference_timestep},
+        "rows": rows,
+    }
+
+
+def main(argv):
+    names = [name.strip() for name in _Scenarios.value if name.strip()]
+    invalid = [name for name in names if name not in SCENARIOS]
+    if invalid:
+        raise app.UsageError(f"Unsupported scenarios: {', '.join(invalid)}")
+    iterations = sorted({int(value) for value in _Iterations.value})
+    timesteps = [float(value) for value in _Timesteps.value] or [None]
+    if min(iterations) < 1 or any(timestep <= 0.0 for timestep in timesteps if timestep is not None):
+        raise app.UsageError("--iterations and --timesteps must be positive")
+
+    print("Accuracy vs Speed Benchmark")
+    print(f"  Scenarios:  {', '.join(names)}")
+    print(f"  Iterations: {', '.join(map(str, iterations))}")
+    print(f"  Timesteps:  {', '.join(f'{t:g}' for t in timesteps if t is not None) or 'model default'}")
+    print(f"  Seed:       {_Seed.value}")
+    print("  The RMSEs are the errors against the reference, sampled every --sample_dt: hinge and slide joint")
+    print("  positions, free joint positions in m and the rotation angle of free and ball joints in rad;")
+    print("  E drift is the energy change over the rollout, E drift err its difference with the reference;")
+    print("  P marks the Pareto optimal settings on realtime factor and the RMSEs.")
+    print()
+
+    results = [result for name in names if (result := _run_scenario(name, iterations, timesteps)) is not None]
+    if _Json.value is not None:
+        Path(_Json.value).parent.mkdir(parents=True, exist_ok=True)
+        Path(_Json.value).write_text(json.dumps({"benchmark": "accuracy", "results": results}, indent=2))
+        print(f"Results written to {_Json.value}")
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -0,0 +1,348 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Benchmark the memory footprint of batched SceneData per environment.
+
+Every (model, batch size) point is measured in a fresh subprocess: the resident set size (RSS) is read
+after loading the model, after creating `SceneData(model, batch=(N,))` and after a few steps, which
+allocate the contact and solver workspaces.
+
+The bytes per env of a model are the slope of a linear fit of the RSS growth against the batch size,
+so fixed costs and page-granularity noise do not end up in the per-env figures. The slope is broken
+down into dof state and sensor outputs (sizes of the arrays), contacts (slope difference with contacts
+disabled) and the rest.
+
+A model whose marginal bytes per env grow with the batch size, by more than a relative tolerance and
+an absolute noise floor, is flagged as super-linear.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+
+from motrixsim import SceneData, msd
+
+ASSETS_DIR = Path(__file__).resolve().parents[1] / "assets"
+LIDAR_PROFILE_DIR = ASSETS_DIR / "lidar-profiles"
+DEFAULT_MODELS = {
+    "go1": ASSETS_DIR / "go1" / "scene.xml",
+    "go2": ASSETS_DIR / "go2" / "scene_flat.xml",
+    "spot": ASSETS_DIR / "boston_dynamics_spot" / "scene.xml",
+    "panda": ASSETS_DIR / "franka_emika_panda" / "scene.xml",
+    "g1": ASSETS_DIR / "g1" / "scene_flat.xml",
+}
+MIB = 1024 * 1024
+
+
+def positive_int(value: str) -> int:
+    parsed = int(value)
+    if parsed <= 0:
+        raise argparse.ArgumentTypeError("value must be greater than zero")
+    return parsed
+
+
+def batch_sizes(value: str) -> list[int]:
+    sizes = sorted({positive_int(size) for size in value.split(",")})
+    if not sizes:
+        raise argparse.ArgumentTypeError("at least one batch size is required")
+    return sizes
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--model",
+        action="append",
+        help="model name (one of the defaults) or MJCF path, repeatable (default: all default models)",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=batch_sizes,
+        default=[1, 64, 256, 1024, 4096],
+        help="comma separated batch sizes (default: 1,64,256,1024,4096)",
+    )
+    parser.add_argument("--steps", type=positive_int, default=10, help="steps run before reading the RSS")
+    parser.add_argument(
+        "--lidar", help="lidar catalog profile attached to every model, e.g. ouster_os1_rev6_32ch_10hz_512res"
+    )
+    parser.add_argument(
+        "--superlinear-tolerance",
+        type=float,
+        default=0.25,
+        help="flag a model when its marginal bytes/env at the largest batch exceed the smallest by this fraction",
+    )
+    parser.add_argument(
+        "--noise-floor-pages",
+        type=float,
+        default=4.0,
+        help="minimum increase of the marginal bytes/env, in memory pages, to flag a model as super-linear",
+    )
+    parser.add_argument("--json", type=Path, help="write the measurements to this JSON file")
+    # internal: measure one point and print it as JSON
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--num-envs", type=positive_int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--disable-contacts", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def current_rss() -> int:
+    """Resident set size of the process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        # peak RSS where /proc is missing, in bytes on macOS and KiB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def lidar_profile_rate(profile: str, catalog_path: Path = LIDAR_PROFILE_DIR / "catalog.xml") -> float:
+    """Scan rate of a catalog profile, which the lidar sensor must declare."""
+    root = ET.parse(catalog_path).getroot()
+    for include in root.findall("include"):
+        for lidar in ET.parse(catalog_path.parent / include.attrib["file"]).getroot().findall("./asset/lidar"):
+            if lidar.attrib["name"] == profile:
+                return float(lidar.attrib["hzrange"].split()[0])
+    raise ValueError(f"unknown lidar profile '{profile}'")
+
+
+def load_world(model_path: Path, lidar_profile: str | None) -> msd.World:
+    world = msd.from_file(model_path)
+    if lidar_profile is not None:
+        lidar_mjcf = f"""<mujoco model="memory_benchmark_lidar_mount">
+  <include file="catalog.xml" />
+  <worldbody>
+    <body name="memory_benchmark_lidar_mount" pos="0 0 1">
+      <site name="memory_benchmark_lidar_site" quat="0.5 0.5 0.5 0.5" size="0.01" />
+    </body>
+  </worldbody>
+  <sensor>
+    <lidar name="memory_benchmark_lidar" site="memory_benchmark_lidar_site"
+      asset="{lidar_profile}" exclude="parentbody" hz="{lidar_profile_rate(lidar_profile):g}" />
+  </sensor>
+</mujoco>"""
+        world.attach(msd.from_str(lidar_mjcf, file_path=str(LIDAR_PROFILE_DIR / "memory_benchmark_lidar.xml")))
+    return world
+
+
+def sensor_names(world: msd.World) -> tuple[list[str], list[str]]:
+    """Names of the lidar sensors and of the other sensors of the world, unnamed sensors cannot be read."""
+    sensors = world.sensors
+    lidars = [sensor.name for sensor in sensors.lidar if sensor.name]
+    others = [
+        sensor.name
+        for group in (sensors.subtree, sensors.frame, sensors.joint, sensors.touch, sensors.contact)
+        for sensor in group
+        if sensor.name
+    ]
+    return lidars, others
+
+
+def measure(model_path: Path, num_envs: int, steps: int, lidar_profile: str | None, disable_contacts: bool) -> dict:
+    """Measure one point in the current process, which must not have created any other SceneData."""
+    world = load_world(model_path, lidar_profile)
+    model = world.build()
+    model.options.disable_contacts = disable_contacts
+    lidars, others = sensor_names(world)
+
+    rss_model = current_rss()
+    data = SceneData(model, batch=(num_envs,))
+    rss_data = current_rss()
+    for _ in range(steps):
+        model.step(data)
+    rss_step = current_rss()
+
+    return {
+        "rss_model": rss_model,
+        "rss_data": rss_data,
+        "rss_step": rss_step,
+        "dof_state_bytes": data.dof_pos.nbytes + data.dof_vel.nbytes + data.actuator_ctrls.nbytes,
+        "lidar_bytes": sum(model.get_sensor_value(name, data).nbytes for name in lidars),
+        "sensor_bytes": sum(model.get_sensor_value(name, data).nbytes for name in others),
+    }
+
+
+def run_worker(args: argparse.Namespace, model_path: Path, num_envs: int, disable_contacts: bool) -> dict | None:
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        f"--worker={model_path}",
+        f"--num-envs={num_envs}",
+        f"--steps={args.steps}",
+    ]
+    if args.lidar is not None:
+        command.append(f"--lidar={args.lidar}")
+    if disable_contacts:
+        command.append("--disable-contacts")
+    process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()
+        print(f"  {num_envs} envs failed: {error[-1] if error else f'exit status {process.returncode}'}")
+        return None
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def measurement_row(point: dict, no_contacts: dict, num_envs: int) -> dict:
+    """Bytes of one batch size, the whole data and its parts."""
+    return {
+        "num_envs": num_envs,
+        "total_bytes": point["rss_step"] - point["rss_model"],
+        "no_contacts_total_bytes": no_contacts["rss_step"] - no_contacts["rss_model"],
+        "allocation_bytes": point["rss_data"] - point["rss_model"],
+        "step_growth_bytes": point["rss_step"] - point["rss_data"],
+        "dof_state_bytes": point["dof_state_bytes"],
+        "lidar_bytes": point["lidar_bytes"],
+        "sensor_bytes": point["sensor_bytes"],
+    }
+
+
+def linear_fit(rows: list[dict]) -> dict | None:
+    """
+    Fixed bytes and bytes per env of a model, from least-squares fits of the bytes against the batch size.
+
+    The RSS is page granular and includes allocations made once per process, so the per-env costs are
+    slopes between batch sizes rather than totals divided by the batch size. None with a single batch size.
+    """
+    if len(rows) < 2:
+        return None
+    num_envs = np.array([row["num_envs"] for row in rows], dtype=np.float64)
+
+    def slope(name: str) -> tuple[float, float]:
+        per_env, fixed = np.polyfit(num_envs, [row[name] for row in rows], 1)
+        return float(per_env), float(fixed)
+
+    bytes_per_env, fixed_bytes = slope("total_bytes")
+    parts = {
+        "dof_state": slope("dof_state_bytes")[0],
+        "lidar": slope("lidar_bytes")[0],
+        "sensors": slope("sensor_bytes")[0],
+        "contacts": bytes_per_env - slope("no_contacts_total_bytes")[0],
+    }
+    return {
+        "fixed_bytes": fixed_bytes,
+        "bytes_per_env": bytes_per_env,
+        **{f"{name}_bytes_per_env": value for name, value in parts.items()},
+        "other_bytes_per_env": bytes_per_env - sum(parts.values()),
+    }
+
+
+def marginal_bytes_per_env(rows: list[dict]) -> list[float]:
+    """Bytes added per extra env between consecutive batch sizes."""
+    return [
+        (curr["total_bytes"] - prev["total_bytes"]) / (curr["num_envs"] - prev["num_envs"])
+        for prev, curr in zip(rows, rows[1:])
+    ]
+
+
+def superlinear_growth(marginals: list[float], tolerance: float, noise_floor: float) -> bool:
+    """
+    Whether the marginal bytes per env grow from the smallest to the largest batch sizes.
+
+    The first pair is dominated by fixed costs, later ones stay flat for linear growth. Small marginals
+    are RSS page noise, so the reference is at least the noise floor and the increase must exceed both
+    the relative tolerance and the noise floor. False with fewer than two marginals.
+    """
+    if len(marginals) < 2:
+        return False
+    reference = max(marginals[0], noise_floor)
+    increase = marginals[-1] - reference
+    return bool(increase > tolerance * reference and increase > noise_floor)
+
+
+def run_model(args: argparse.Namespace, name: str, model_path: Path) -> dict:
+    print("=" * 100)
+    print(f"[{name}] {model_path}")
+    rows = []
+    for num_envs in args.batch_sizes:
+        point = run_worker(args, model_path, num_envs, disable_contacts=False)
+        no_contacts = run_worker(args, model_path, num_envs, disable_contacts=True) if point else None
+        if point is None or no_contacts is None:
+            continue
+        rows.append(measurement_row(point, no_contacts, num_envs))
+
+    if not rows:
+        return {"model": name, "path": str(model_path), "rows": [], "fit": None, "superlinear": False}
+
+    header = f"  {'Envs':>6}{'RSS MiB':>10}{'RSS/env':>12}{'marginal':>12}"
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    marginals = marginal_bytes_per_env(rows)
+    for row, marginal in zip(rows, [None, *marginals]):
+        print(
+            f"  {row['num_envs']:>6}{row['total_bytes'] / MIB:>10.1f}{row['total_bytes'] / row['num_envs']:>12,.0f}"
+            + (f"{marginal:>12,.0f}" if marginal is not None else f"{'':>12}")
+        )
+
+    fit = linear_fit(rows)
+    if fit is not None:
+        print()
+        print(f"  Linear fit: {fit['fixed_bytes'] / MIB:.1f} MiB fixed + {fit['bytes_per_env']:,.0f} B/env")
+        for part in ("dof_state", "lidar", "sensors", "contacts", "other"):
+            print(f"    {part:<12}{fit[f'{part}_bytes_per_env']:>12,.0f} B/env")
+
+    noise_floor = args.noise_floor_pages * os.sysconf("SC_PAGE_SIZE")
+    superlinear = superlinear_growth(marginals, args.superlinear_tolerance, noise_floor)
+    if len(marginals) >= 2:
+        verdict = "SUPER-LINEAR" if superlinear else "linear"
+        print(
+            f"  Growth: {verdict} (marginal bytes/env {marginals[0]:,.0f} at the smallest and "
+            f"{marginals[-1]:,.0f} at the largest batch, noise floor {noise_floor:,.0f})"
+        )
+    print()
+    return {"model": name, "path": str(model_path), "rows": rows, "fit": fit, "superlinear": superlinear}
+
+
+def selected_models(names: list[str] | None) -> list[tuple[str, Path]]:
+    if not names:
+        return list(DEFAULT_MODELS.items())
+    return [(name, DEFAULT_MODELS[name]) if name in DEFAULT_MODELS else (Path(name).stem, Path(name)) for name in names]
+
+
+def main() -> None:
+    args = create_argument_parser().parse_args()
+    if args.worker is not None:
+        print(json.dumps(measure(args.worker, args.num_envs, args.steps, args.lidar, args.disable_contacts)))
+        return
+
+    print("SceneData Memory Benchmark")
+    print(f"  Batch sizes: {', '.join(map(str, args.batch_sizes))}")
+    print(f"  Steps:       {args.steps}")
+    print(f"  Lidar:       {args.lidar or 'none'}")
+    print("  Marginal is the bytes added per extra env since the previous batch size, the per-env")
+    print("  breakdown is fitted over all batch sizes, contacts is the difference with contacts disabled.")
+    print()
+    results = [run_model(args, name, path) for name, path in selected_models(args.model)]
+
+    flagged = [result["model"] for result in results if result["superlinear"]]
+    if flagged:
+        print(f"Super-linear memory growth: {', '.join(flagged)}")
+    if args.json is not None:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps({"benchmark": "memory", "steps": args.steps, "results": results}, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Rotation kernel benchmark comparing legged_gym.utils.rotation and scipy.
+
+Times the per-step quantities of the locomotion envs, the projected gravity and the up-axis
+dot product, on batches of xyzw quaternions, and the one-off import cost of scipy's rotations.
+"""
+
+import importlib.util
+import subprocess
+import sys
+import time
+
+import numpy as np
+from absl import app, flags
+
+from legged_gym.utils.rotation import projected_gravity, up_axis_z
+
+_HAS_SCIPY = importlib.util.find_spec("scipy") is not None
+
+_BatchSizes = flags.DEFINE_list("batch_sizes", ["1", "64", "4096"], "numbers of quaternions per call")
+_NumCalls = flags.DEFINE_integer("calls", 2000, "number of calls timed per batch size", lower_bound=1)
+
+
+def _random_quats(num: int) -> np.ndarray:
+    quat = np.random.default_rng(0).standard_normal((num, 4)).astype(np.float32)
+    return quat / np.linalg.norm(quat, axis=-1, keepdims=True)
+
+
+def _time_calls(fn, num_calls: int) -> float:
+    """Average time of one call in microseconds."""
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(num_calls):
+        fn()
+    return (time.perf_counter() - t0) / num_calls * 1e6
+
+
+def _kernel_step(quat: np.ndarray, gravity: np.ndarray):
+    def step():
+        projected_gravity(quat, out=gravity)
+        return up_axis_z(quat) < 0.3
+
+    return step
+
+
+def _scipy_step(quat: np.ndarray):
+    from scipy.spatial.transform import Rotation
+
+    def step():
+        rotation = Rotation.from_quat(quat)
+        rotation.apply(np.array([0.0, 0.0, -1.0]), inverse=True)
+        return rotation.apply(np.array([0.0, 0.0, 1.0]))[:, 2] < 0.3
+
+    return step
+
+
+def _scipy_import_time() -> float:
+    """Import time of scipy's rotations in a fresh interpreter, in milliseconds."""
+    code = "import time; t0 = time.perf_counter(); import scipy.spatial.transform; print(time.perf_counter() - t0)"
+    return float(subprocess.check_output([sys.executable, "-c", code], text=True)) * 1e3
+
+
+def main(argv):
+    num_calls = _NumCalls.value
+    batch_sizes = [int(size) for size in _BatchSizes.value]
+
+    print("=" * 60)
+    print("Rotation Benchmark (projected gravity + up-axis dot product)")
+    print(f"  Calls:   {num_calls}")
+    print(f"  Batches: {', '.join(str(size) for size in batch_sizes)}")
+    print("=" * 60)
+    print()
+    if not _HAS_SCIPY:
+        print("Warning: scipy is not installed, timing the kernels only.")
+        print()
+
+    header = f"{'Batch':<10}{'kernel (us)':<16}" + (f"{'scipy (us)':<16}{'Speedup':<12}" if _HAS_SCIPY else "")
+    print(header)
+    print("-" * len(header))
+    for size in batch_sizes:
+        quat = _random_quats(size)
+        gravity = np.empty((size, 3), dtype=np.float32)
+        kernel_us = _time_calls(_kernel_step(quat, gravity), num_calls)
+        row = f"{size:<10}{kernel_us:<16.2f}"
+        if _HAS_SCIPY:
+            scipy_us = _time_calls(_scipy_step(quat), num_calls)
+            row += f"{scipy_us:<16.2f}{scipy_us / kernel_us:<12.2f}"
+        print(row)
+    print()
+
+    if _HAS_SCIPY:
+        print(f"scipy.spatial.transform import: {_scipy_import_time():.1f} ms (no longer paid at env startup)")
+
+
+if __name__ == "__main__":
+    app.run(main)
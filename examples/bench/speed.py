@@ -17,18 +17,39 @@
 
 Supports single-env mode (default) and batch mode (--num_envs).
 In batch mode, multiple environments are stepped in parallel per step call.
+
+Results can be saved with --json (per-round samples, statistics and host metadata) or --csv (one row
+per round). A JSON file saved by a previous run can be passed as --baseline: the run then exits with a
+non-zero status when the median motrixsim throughput of a model dropped by more than --max_regression,
+or when a motrixsim result has no counterpart in the baseline.
+
+--sweep_envs and --sweep_threads run the motrixsim batch benchmark over a grid of env counts and
+worker thread counts, each cell in a subprocess with RAYON_NUM_THREADS set, and print the throughput,
+step latency and parallel efficiency tables of every model.
+
+--phases breaks the motrixsim step time of every model down into forward kinematics, collision and
+contacts, solver iterations and sensors. The engine has no per-phase timers, so the cost of a phase
+is measured as the step time difference between the model and a copy with that phase toggled off.
 """
 
+import csv
+import datetime
+import importlib.metadata
 import importlib.util
+import json
 import os
+import platform
+import subprocess
+import sys
+import tempfile
 import time
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional
 
 import numpy as np
 from absl import app, flags
 
-from motrixsim import SceneData, load_model, step
+from motrixsim import SceneData, load_model, msd, step
 
 _HAS_MUJOCO = importlib.util.find_spec("mujoco") is not None
 
@@ -44,6 +65,33 @@ _MaxIterations = flags.DEFINE_integer(
     "override each engine's main constraint solver iteration limit; omit to use the model default",
     lower_bound=1,
 )
+_Json = flags.DEFINE_string("json", None, "write the per-round samples, statistics and host metadata to this JSON file")
+_Csv = flags.DEFINE_string("csv", None, "write one row per round to this CSV file")
+_Baseline = flags.DEFINE_string(
+    "baseline",
+    None,
+    "JSON file written by --json; exit with a non-zero status when the motrixsim throughput regressed against it",
+)
+_MaxRegression = flags.DEFINE_float(
+    "max_regression",
+    0.05,
+    "allowed drop of the median motrixsim throughput against --baseline, as a fraction",
+    lower_bound=0.0,
+    upper_bound=1.0,
+)
+_SweepEnvs = flags.DEFINE_list(
+    "sweep_envs", [], "env counts of the scaling sweep, e.g. 1,64,1024,16384 (default: --num_envs or 1024)"
+)
+_SweepThreads = flags.DEFINE_list(
+    "sweep_threads", [], "worker thread counts of the scaling sweep (default: powers of two up to the CPU count)"
+)
+_Phases = flags.DEFINE_bool(
+    "phases", False, "break the motrixsim step time of every model down into phases with A/B toggles"
+)
+
+_ROUND_FIELDS = ("elapsed_s", "throughput", "avg_step_ms")
+_RECORD_FIELDS = ("model", "mode", "engine", "num_envs", "max_iterations", "threads")
+_CSV_FIELDS = (*_RECORD_FIELDS, "round", *_ROUND_FIELDS)
 
 _DEFAULT_MODELS = [
     ("go1", "go1/scene.xml"),
@@ -157,6 +205,404 @@ def _resolve_engines(engine_choice: str, batch: bool = False) -> list[tuple[str,
     return engines
 
 
+def _stats(values: list[float]) -> dict[str, float]:
+    """Summary statistics of the samples of one quantity across rounds."""
+    values = np.asarray(values, dtype=np.float64)
+    p5, median, p95 = np.percentile(values, [5, 50, 95])
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "min": float(values.min()),
+        "p5": float(p5),
+        "median": float(median),
+        "p95": float(p95),
+        "max": float(values.max()),
+    }
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _host_metadata() -> dict:
+    return {
+        "cpu_model": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "rayon_num_threads": os.environ.get("RAYON_NUM_THREADS"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "versions": {name: _package_version(name) for name in ("motrixsim", "mujoco", "numpy")},
+    }
+
+
+def _result_key(record: dict) -> tuple:
+    # threads is the explicit thread count of a sweep cell, None otherwise: an ambient RAYON_NUM_THREADS
+    # is recorded in the host metadata only, so it never keeps a run from matching its baseline.
+    # mode keeps the full step of a phase breakdown from matching a plain run, results written before
+    # the field existed are plain runs
+    return (
+        record["model"],
+        record.get("mode", "plain"),
+        record["engine"],
+        record["num_envs"],
+        record["max_iterations"],
+        record.get("threads"),
+    )
+
+
+def _write_json(path: str, config: dict, records: list[dict]) -> None:
+    payload = {
+        "benchmark": "speed",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "host": _host_metadata(),
+        "config": config,
+        "results": records,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+
+def _write_csv(path: str, records: list[dict]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_CSV_FIELDS)
+        writer.writeheader()
+        for record in records:
+            for i, sample in enumerate(record["rounds"]):
+                writer.writerow({**{name: record.get(name) for name in _RECORD_FIELDS}, "round": i, **sample})
+
+
+def _compare_to_baseline(records: list[dict], baseline: dict, max_regression: float) -> list[str]:
+    """
+    Compare the median motrixsim throughput of every model with the baseline results.
+
+    Results are matched by model, mode, engine, number of envs, iteration limit and thread count. A result
+    missing from the baseline fails the comparison, as does a run without any motrixsim result: a gate
+    that compared nothing must not pass.
+
+    Returns:
+        list[str]: One message per result whose throughput dropped by more than `max_regression` or
+        that has no baseline result.
+    """
+    reference = {_result_key(record): record for record in baseline["results"]}
+    regressions = []
+    compared = 0
+    for record in records:
+        if record["engine"] != "motrixsim":
+            continue
+        previous = reference.get(_result_key(record))
+        if previous is None:
+            print(f"  {record['model']:<12} no baseline result  MISSING")
+            regressions.append(
+                f"{record['model']}: no baseline result for num_envs={record['num_envs']}, "
+                f"max_iterations={record['max_iterations']}, threads={record.get('threads')}"
+            )
+            continue
+        compared += 1
+        current_t = record["stats"]["throughput"]["median"]
+        previous_t = previous["stats"]["throughput"]["median"]
+        change = current_t / previous_t - 1.0
+        regressed = change < -max_regression
+        print(
+            f"  {record['model']:<12} {previous_t:>14.3f} -> {current_t:>14.3f} ({change:+.1%})"
+            + ("  REGRESSION" if regressed else "")
+        )
+        if regressed:
+            regressions.append(
+                f"{record['model']}: motrixsim throughput {change:+.1%} "
+                f"({previous_t:.3f} -> {current_t:.3f}), allowed -{max_regression:.1%}"
+            )
+    if compared == 0 and not regressions:
+        regressions.append("no motrixsim result to compare with the baseline")
+    return regressions
+
+
+def _default_thread_counts() -> list[int]:
+    cpu_count = os.cpu_count() or 1
+    return [1 << i for i in range(cpu_count.bit_length()) if 1 << i < cpu_count] + [cpu_count]
+
+
+def _run_sweep_cell(
+    model_path: str, num_envs: int, threads: int, num_steps: int, warmup: int, rounds: int
+) -> Optional[dict]:
+    """
+    Benchmark one (num_envs, threads) cell of the sweep in a subprocess.
+
+    The worker pool of the engine is sized from RAYON_NUM_THREADS once per process, so every thread
+    count needs its own process. Returns the result record written by the subprocess, None on failure.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result_path = os.path.join(tmp_dir, "result.json")
+        command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            f"--file={model_path}",
+            "--engine=motrixsim",
+            f"--num_envs={num_envs}",
+            f"--steps={num_steps}",
+            f"--warmup={warmup}",
+            f"--rounds={rounds}",
+            f"--json={result_path}",
+        ]
+        if _MaxIterations.value is not None:
+            command.append(f"--max_iterations={_MaxIterations.value}")
+        env = {**os.environ, "RAYON_NUM_THREADS": str(threads)}
+        process = subprocess.run(command, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            error = process.stderr.strip().splitlines()
+            print(f"    failed: {error[-1] if error else f'exit status {process.returncode}'}")
+            return None
+        with open(result_path) as f:
+            (record,) = json.load(f)["results"]
+    return record
+
+
+def _print_grid(title: str, env_counts: list[int], thread_counts: list[int], values: dict, fmt: str) -> None:
+    print(f"  {title}")
+    header = f"    {'Envs':<10}" + "".join(f"{f'{t} thr':>14}" for t in thread_counts)
+    print(header)
+    print("    " + "-" * (len(header) - 4))
+    for num_envs in env_counts:
+        row = f"    {num_envs:<10}"
+        for threads in thread_counts:
+            value = values.get((num_envs, threads))
+            row += f"{'N/A':>14}" if value is None else f"{value:>14{fmt}}"
+        print(row)
+    print()
+
+
+def _run_sweep(
+    models: list[tuple[str, str]],
+    env_counts: list[int],
+    thread_counts: list[int],
+    num_steps: int,
+    warmup: int,
+    rounds: int,
+) -> list[dict]:
+    """Run the motrixsim batch benchmark over the env count x thread count grid of every model."""
+    print("=" * 60)
+    print("Speed Benchmark (scaling sweep)")
+    print(f"  Steps:   {num_steps}")
+    print(f"  Warmup:  {warmup}")
+    print(f"  Rounds:  {rounds}")
+    print(f"  Envs:    {', '.join(map(str, env_counts))}")
+    print(f"  Threads: {', '.join(map(str, thread_counts))}")
+    if _MaxIterations.value is not None:
+        print(f"  Max iters: {_MaxIterations.value}")
+    print(f"  Models:  {', '.join(name for name, _ in models)}")
+    print("=" * 60)
+    print()
+
+    records: list[dict] = []
+    for name, path in models:
+        print(f"[{name}] {path}")
+        throughput, latency = {}, {}
+        for num_envs in env_counts:
+            for threads in thread_counts:
+                print(f"  [{num_envs} envs, {threads} threads]")
+                record = _run_sweep_cell(path, num_envs, threads, num_steps, warmup, rounds)
+                if record is None:
+                    continue
+                record.update(model=name, path=path, threads=threads)
+                records.append(record)
+                throughput[num_envs, threads] = record["stats"]["throughput"]["median"]
+                latency[num_envs, threads] = record["stats"]["avg_step_ms"]["median"]
+                print(f"    {throughput[num_envs, threads]:.3f} env-steps/s, {latency[num_envs, threads]:.3f} ms/step")
+        print()
+
+        # speedup over the smallest thread count, divided by the ratio of thread counts
+        base_threads = thread_counts[0]
+        efficiency = {}
+        for (num_envs, threads), t in throughput.items():
+            base = throughput.get((num_envs, base_threads))
+            if base:
+                efficiency[num_envs, threads] = 100.0 * (t / base) / (threads / base_threads)
+
+        _print_grid("Throughput (median env-steps/s)", env_counts, thread_counts, throughput, ".1f")
+        _print_grid("Step latency (median ms/step)", env_counts, thread_counts, latency, ".3f")
+        _print_grid(
+            f"Parallel efficiency (% of linear scaling from {base_threads} thr)",
+            env_counts,
+            thread_counts,
+            efficiency,
+            ".1f",
+        )
+    return records
+
+
+def _report(records: list[dict], config: dict, baseline: Optional[dict], unit: str) -> int:
+    """Write the results sinks and gate on the baseline, returns the exit status of the run."""
+    if _Json.value is not None:
+        _write_json(_Json.value, config, records)
+        print(f"Results written to {_Json.value}")
+    if _Csv.value is not None:
+        _write_csv(_Csv.value, records)
+        print(f"Results written to {_Csv.value}")
+
+    if baseline is not None:
+        print("=" * 60)
+        print(f"Baseline comparison (median motrixsim throughput, {unit})")
+        print(f"  Baseline: {_Baseline.value}")
+        baseline_host = baseline.get("host", {})
+        if baseline_host.get("cpu_model") != _cpu_model() or baseline_host.get("cpu_count") != os.cpu_count():
+            cpu = f"{baseline_host.get('cpu_model')} ({baseline_host.get('cpu_count')} cores)"
+            print(f"  Note: the baseline was measured on {cpu}")
+        if baseline_host.get("rayon_num_threads") != os.environ.get("RAYON_NUM_THREADS"):
+            print(f"  Note: the baseline ran with RAYON_NUM_THREADS={baseline_host.get('rayon_num_threads')}")
+        if baseline.get("config", {}).get("steps") != config["steps"]:
+            print(f"  Note: the baseline ran {baseline.get('config', {}).get('steps')} steps per round")
+        print("=" * 60)
+        regressions = _compare_to_baseline(records, baseline, _MaxRegression.value)
+        print()
+        if regressions:
+            for message in regressions:
+                print(f"Baseline gate failed: {message}")
+            return 1
+        print(f"No regression beyond {_MaxRegression.value:.1%}")
+    return 0
+
+
+def _load_phase_variant(model_path: str, strip_sensors: Optional[str] = None):
+    """Load the model, optionally without its lidar sensors ("lidar") or without any sensor ("all")."""
+    if strip_sensors is None:
+        model = load_model(model_path)
+    else:
+        world = msd.from_file(model_path)
+        if strip_sensors == "lidar":
+            sensors = world.sensors
+            sensors.lidar = []
+            world.sensors = sensors
+        else:
+            world.sensors = msd.SensorSet()
+        model = world.build()
+    if _MaxIterations.value is not None:
+        model.options.max_iterations = _MaxIterations.value
+    return model
+
+
+def _phase_variants(model_path: str) -> dict:
+    """The model and its copies with one phase toggled off, by variant name."""
+    variants = {"full": _load_phase_variant(model_path)}
+    no_contacts = _load_phase_variant(model_path)
+    no_contacts.options.disable_contacts = True
+    variants["no_contacts"] = no_contacts
+    # the solver cost is measured by adding iterations: the model default may already be a single one
+    double_iterations = _load_phase_variant(model_path)
+    double_iterations.options.max_iterations = 2 * variants["full"].options.max_iterations
+    variants["double_iterations"] = double_iterations
+    if variants["full"].num_sensors > 0:
+        if msd.from_file(model_path).sensors.lidar:
+            variants["no_lidar"] = _load_phase_variant(model_path, strip_sensors="lidar")
+        variants["no_sensors"] = _load_phase_variant(model_path, strip_sensors="all")
+    return variants
+
+
+def _time_phase_variant(model, num_steps: int, warmup: int, num_envs: int) -> tuple[float, float]:
+    """One round of a variant, returns the ms per step and the ms per forward kinematics."""
+    data = SceneData(model, batch=(num_envs,)) if num_envs > 0 else SceneData(model)
+    for _ in range(warmup):
+        model.step(data)
+
+    t0 = time.perf_counter()
+    for _ in range(num_steps):
+        model.step(data)
+    step_ms = (time.perf_counter() - t0) / num_steps * 1000
+
+    t0 = time.perf_counter()
+    for _ in range(num_steps):
+        model.forward_kinematic(data)
+    kinematics_ms = (time.perf_counter() - t0) / num_steps * 1000
+    return step_ms, kinematics_ms
+
+
+def _phase_breakdown(step_ms: dict[str, float], kinematics_ms: float, max_iterations: int) -> dict[str, float]:
+    """
+    Per-phase ms per step from the step times of the variants.
+
+    The phases are differences of noisy timings and may overlap slightly, a phase cheaper than the
+    timing noise can come out slightly negative.
+    """
+    full = step_ms["full"]
+    phases = {
+        "forward kinematics": kinematics_ms,
+        "collision + contacts": full - step_ms["no_contacts"],
+        f"solver iterations ({max_iterations})": step_ms["double_iterations"] - full,
+    }
+    if "no_lidar" in step_ms:
+        phases["lidar sensors"] = full - step_ms["no_lidar"]
+        phases["other sensors"] = step_ms["no_lidar"] - step_ms["no_sensors"]
+    elif "no_sensors" in step_ms:
+        phases["sensors"] = full - step_ms["no_sensors"]
+    phases["remainder (dynamics, integration)"] = full - sum(phases.values())
+    return phases
+
+
+def _run_phases(name: str, model_path: str, num_steps: int, warmup: int, rounds: int, num_envs: int) -> dict:
+    """Time every phase variant of one model and print its breakdown, returns its result record."""
+    print(f"[{name}] {model_path}")
+    variants = _phase_variants(model_path)
+    max_iterations = variants["full"].options.max_iterations
+    print(f"  Variants: {', '.join(variants)}")
+
+    samples: dict[str, list[float]] = {variant: [] for variant in variants}
+    kinematics_samples: list[float] = []
+    # the variants are interleaved within every round, so a drift of the machine affects them alike
+    for _ in range(rounds):
+        for variant, model in variants.items():
+            step_ms, kinematics_ms = _time_phase_variant(model, num_steps, warmup, num_envs)
+            samples[variant].append(step_ms)
+            if variant == "full":
+                kinematics_samples.append(kinematics_ms)
+
+    step_ms = {variant: float(np.median(values)) for variant, values in samples.items()}
+    phases = _phase_breakdown(step_ms, float(np.median(kinematics_samples)), max_iterations)
+
+    full = step_ms["full"]
+    print()
+    header = f"  {'Phase':<38}{'ms/step':>12}{'share':>10}"
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    print(f"  {'full step':<38}{full:>12.4f}{100.0:>9.1f}%")
+    for phase, ms in phases.items():
+        print(f"  {phase:<38}{ms:>12.4f}{100.0 * ms / full:>9.1f}%")
+    print()
+
+    env_steps = max(num_envs, 1) * num_steps
+    full_rounds = [
+        dict(zip(_ROUND_FIELDS, (ms * num_steps / 1000, env_steps / (ms * num_steps / 1000), ms)))
+        for ms in samples["full"]
+    ]
+    return {
+        "model": name,
+        "mode": "phases",
+        "path": model_path,
+        "engine": "motrixsim",
+        "num_envs": num_envs,
+        "max_iterations": _MaxIterations.value,
+        "threads": None,
+        "rounds": full_rounds,
+        "stats": {field: _stats([r[field] for r in full_rounds]) for field in _ROUND_FIELDS},
+        "variants": {variant: _stats(values) for variant, values in samples.items()},
+        "phases": phases,
+    }
+
+
 def _run_benchmark(
     name: str,
     model_path: str,
@@ -165,11 +611,12 @@ def _run_benchmark(
     warmup: int,
     rounds: int,
     num_envs: int = 0,
-) -> dict[str, tuple[float, float, float]]:
+) -> list[dict]:
+    """Run every engine on one model, returns one result record per engine with its per-round samples."""
     print(f"[{name}] {model_path}")
     print()
 
-    results: dict[str, list[tuple[float, float, float]]] = {}
+    records: list[dict] = []
 
     for engine_name, bench_fn in engines:
         engine_results = []
@@ -191,26 +638,39 @@ def _run_benchmark(
             print(f"    Avg per step:  {avg_step:.3f} ms")
             print()
 
-        results[engine_name] = engine_results
+        stats = {field: _stats([r[i] for r in engine_results]) for i, field in enumerate(_ROUND_FIELDS)}
+        if rounds > 1:
+            t, a = stats["throughput"], stats["avg_step_ms"]
+            print(f"  [{engine_name}] median of {rounds} rounds")
+            print(f"    Throughput:    {t['median']:.3f} (p5 {t['p5']:.3f}, p95 {t['p95']:.3f})")
+            print(f"    Avg per step:  {a['median']:.3f} ms (p5 {a['p5']:.3f}, p95 {a['p95']:.3f})")
+            print()
+
+        records.append(
+            {
+                "model": name,
+                "mode": "plain",
+                "path": model_path,
+                "engine": engine_name,
+                "num_envs": num_envs,
+                "max_iterations": _MaxIterations.value,
+                "threads": None,
+                "rounds": [dict(zip(_ROUND_FIELDS, r)) for r in engine_results],
+                "stats": stats,
+            }
+        )
 
     # Per-model summary
-    avg: dict[str, tuple[float, float, float]] = {}
-    for ename, rounds_data in results.items():
-        n = len(rounds_data)
-        e = sum(r[0] for r in rounds_data) / n
-        t = sum(r[1] for r in rounds_data) / n
-        a = sum(r[2] for r in rounds_data) / n
-        avg[ename] = (e, t, a)
-
-    mj_t = avg.get("mujoco", (0, 0, 0))[1]
-    mx_t = avg.get("motrixsim", (0, 0, 0))[1]
+    median = {record["engine"]: record["stats"]["throughput"]["median"] for record in records}
+    mj_t = median.get("mujoco", 0)
+    mx_t = median.get("motrixsim", 0)
     if mj_t > 0 and mx_t > 0:
         ratio = mx_t / mj_t
         tag = "faster" if ratio > 1 else "slower"
         print(f"  motrixsim / mujoco: {ratio:.3f}x ({tag})")
         print()
 
-    return avg
+    return records
 
 
 def main(argv):
@@ -220,17 +680,68 @@ def main(argv):
     engine_choice = _Engine.value
     num_envs = _NumEnvs.value
 
-    batch_mode = num_envs > 0
-    engines = _resolve_engines(engine_choice, batch=batch_mode)
-    if not engines:
-        return
+    # read before running, a missing or malformed baseline fails fast
+    baseline = None
+    if _Baseline.value is not None:
+        with open(_Baseline.value) as f:
+            baseline = json.load(f)
 
     if _File.value is not None:
-        models = [("model", _File.value)]
+        models = [(Path(_File.value).stem, _File.value)]
     else:
         assets_dir = Path(__file__).parent.parent / "assets"
         models = [(name, str(assets_dir / path)) for name, path in _DEFAULT_MODELS]
 
+    if _SweepEnvs.value or _SweepThreads.value:
+        if engine_choice == "mujoco":
+            print("Warning: the scaling sweep only runs motrixsim.")
+        env_counts = sorted({int(n) for n in _SweepEnvs.value}) or [num_envs or 1024]
+        # ascending, the parallel efficiency is relative to the smallest thread count
+        thread_counts = sorted({int(t) for t in _SweepThreads.value}) or _default_thread_counts()
+        records = _run_sweep(models, env_counts, thread_counts, num_steps, warmup, rounds)
+        config = {
+            "steps": num_steps,
+            "warmup": warmup,
+            "rounds": rounds,
+            "sweep_envs": env_counts,
+            "sweep_threads": thread_counts,
+            "max_iterations": _MaxIterations.value,
+            "engines": ["motrixsim"],
+        }
+        return _report(records, config, baseline, "env-steps/s")
+
+    if _Phases.value:
+        if engine_choice == "mujoco":
+            print("Warning: the phase breakdown only runs motrixsim.")
+        print("=" * 60)
+        print("Speed Benchmark (phase breakdown)")
+        print(f"  Steps:   {num_steps}")
+        print(f"  Warmup:  {warmup}")
+        print(f"  Rounds:  {rounds}")
+        if num_envs > 0:
+            print(f"  Envs:    {num_envs}")
+        if _MaxIterations.value is not None:
+            print(f"  Max iters: {_MaxIterations.value}")
+        print(f"  Models:  {', '.join(name for name, _ in models)}")
+        print("=" * 60)
+        print()
+        records = [_run_phases(name, path, num_steps, warmup, rounds, num_envs) for name, path in models]
+        config = {
+            "steps": num_steps,
+            "warmup": warmup,
+            "rounds": rounds,
+            "num_envs": num_envs,
+            "max_iterations": _MaxIterations.value,
+            "engines": ["motrixsim"],
+            "phases": True,
+        }
+        return _report(records, config, baseline, "env-steps/s" if num_envs > 0 else "steps/s")
+
+    batch_mode = num_envs > 0
+    engines = _resolve_engines(engine_choice, batch=batch_mode)
+    if not engines:
+        return
+
     print("=" * 60)
     print("Speed Benchmark" + (" (batch mode)" if batch_mode else ""))
     print(f"  Steps:   {num_steps}")
@@ -245,15 +756,18 @@ def main(argv):
     print("=" * 60)
     print()
 
-    all_results: dict[str, dict[str, tuple[float, float, float]]] = {}
+    records: list[dict] = []
+    all_results: dict[str, dict[str, float]] = {}
     for name, path in models:
-        all_results[name] = _run_benchmark(name, path, engines, num_steps, warmup, rounds, num_envs)
+        model_records = _run_benchmark(name, path, engines, num_steps, warmup, rounds, num_envs)
+        records.extend(model_records)
+        all_results[name] = {record["engine"]: record["stats"]["throughput"]["median"] for record in model_records}
 
+    unit = "env-steps/s" if batch_mode else "steps/s"
     # Final summary table
     if len(all_results) > 1:
         print("=" * 60)
-        unit = "env-steps/s" if batch_mode else "steps/s"
-        print(f"Final Summary (avg throughput, {unit})")
+        print(f"Final Summary (median throughput, {unit})")
         print("=" * 60)
         print()
 
@@ -264,14 +778,14 @@ def main(argv):
         print(header)
         print("-" * len(header))
 
-        for model_name, avg in all_results.items():
+        for model_name, median in all_results.items():
             row = f"{model_name:<12}"
             for ename in engine_names:
-                t = avg.get(ename, (0, 0, 0))[1]
+                t = median.get(ename, 0)
                 row += f"{t:<18.3f}"
             if len(engine_names) == 2:
-                mj_t = avg.get("mujoco", (0, 0, 0))[1]
-                mx_t = avg.get("motrixsim", (0, 0, 0))[1]
+                mj_t = median.get("mujoco", 0)
+                mx_t = median.get("motrixsim", 0)
                 if mj_t > 0 and mx_t > 0:
                     row += f"{mx_t / mj_t:<12.3f}"
                 else:
@@ -279,6 +793,16 @@ def main(argv):
             print(row)
         print()
 
+    config = {
+        "steps": num_steps,
+        "warmup": warmup,
+        "rounds": rounds,
+        "num_envs": num_envs,
+        "max_iterations": _MaxIterations.value,
+        "engines": [name for name, _ in engines],
+    }
+    return _report(records, config, baseline, unit)
+
 
 if __name__ == "__main__":
     app.run(main)
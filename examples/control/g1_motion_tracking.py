@@ -21,6 +21,8 @@ import sys
 from pathlib import Path
 from typing import Sequence
 
+import numpy as np
+
 from motrixsim import SceneData, msd
 from motrixsim.render import RenderApp
 
@@ -28,12 +30,13 @@ EXAMPLES_DIR = Path(__file__).resolve().parent.parent
 CONTROL_DIR = Path(__file__).resolve().parent
 UTILS_DIR = EXAMPLES_DIR / "utils"
 
-for path in (CONTROL_DIR, UTILS_DIR):
+for path in (CONTROL_DIR, UTILS_DIR, EXAMPLES_DIR):
     if str(path) not in sys.path:
         sys.path.insert(0, str(path))
 
 from g1_motion_tracking_helpers import contract, initializer, reference, robot  # noqa: E402
 from g1_motion_tracking_helpers import policy as policy_module  # noqa: E402
+from utils.layout import grid_offsets  # noqa: E402
 
 CAMERA_POSITION = [2.0, 0.0, 0.7]
 CAMERA_TARGET = (0.0, 0.0, 0.0)
@@ -69,7 +72,13 @@ def _build_parser() -> argparse.ArgumentParser:
         "--motion",
         type=Path,
         default=contract.DEFAULT_MOTION_PATH,
-        help="Path to the reference motion .npz file.",
+        help="Path to the reference motion .npz file, or to a motion library directory.",
+    )
+    parser.add_argument(
+        "--clip",
+        type=int,
+        default=0,
+        help="Clip played from a motion library directory.",
     )
     parser.add_argument("--scene", type=Path, default=contract.DEFAULT_SCENE_PATH, help="Path to the base scene XML.")
     parser.add_argument(
@@ -96,6 +105,17 @@ def _build_parser() -> argparse.ArgumentParser:
         default=contract.DEFAULT_RENDER_FPS,
         help="Render synchronization rate.",
     )
+    parser.add_argument(
+        "--nearest-frame",
+        action="store_true",
+        help="Feed the nearest reference frame instead of interpolating the motion at the control time.",
+    )
+    parser.add_argument(
+        "--num-envs",
+        type=int,
+        default=1,
+        help="Number of robots simulated on one batched SceneData, tracking the motion at evenly spread time offsets.",
+    )
     return parser
 
 
@@ -126,18 +146,22 @@ def _load_model(scene_path: Path, g1_robot_cls):
 
 def main() -> None:
     args = _build_parser().parse_args()
+    num_envs = args.num_envs
 
     onnx_path = contract.ensure_file_exists(args.onnx, "ONNX")
-    motion_path = contract.ensure_file_exists(args.motion, "Motion")
+    motion_path = args.motion.expanduser().resolve()
+    if not motion_path.is_dir():
+        motion_path = contract.ensure_file_exists(motion_path, "Motion")
     scene_path = contract.ensure_file_exists(args.scene, "Scene")
 
     motion_reference = reference.MotionReference(
         str(motion_path),
         body_indices=contract.MOTION_BODY_INDICES,
+        clip_id=args.clip,
     )
     model, camera = _load_model(scene_path, robot.G1MotionTrackingRobot)
     model.options.timestep = contract.DEFAULT_SIM_DT
-    data = SceneData(model)
+    data = SceneData(model) if num_envs == 1 else SceneData(model, batch=(num_envs,))
     initializer.apply_motion_tracking_profile(model, data)
 
     contract.ensure_actuator_count(model)
@@ -155,16 +179,33 @@ def main() -> None:
         action_scale=args.action_scale,
         device=args.device,
     )
+    # every robot tracks the clip from its own frame offset
+    frame_offsets = np.arange(num_envs) * motion_reference.num_frames // num_envs
+    time_offsets = frame_offsets / motion_reference.fps
+    motion_frames = motion_reference.allocate(() if num_envs == 1 else (num_envs,))
+
+    def current_motion():
+        if args.nearest_frame:
+            if num_envs == 1:
+                return motion_reference.current()
+            return motion_reference.frames(motion_reference.current_frame + frame_offsets, out=motion_frames)
+        if num_envs == 1:
+            return motion_reference.sample(motion_reference.current_time, out=motion_frames)
+        return motion_reference.sample(motion_reference.current_time + time_offsets, out=motion_frames)
+
     initializer.initialize_motion_tracking_state(
         robot=tracking_robot,
         model=model,
         data=data,
-        motion_data=motion_reference.current(),
+        motion_data=current_motion(),
     )
 
     with RenderApp() as render:
         render.set_main_camera(camera)
-        render.launch(model)
+        if num_envs == 1:
+            render.launch(model)
+        else:
+            render.launch(model, batch=num_envs, render_offset=grid_offsets(num_envs))
 
         phys_dt = float(model.options.timestep)
         n_ctrl = max(1, round(args.ctrl_dt / phys_dt))
@@ -179,7 +220,7 @@ def main() -> None:
             step_index += 1
 
             if step_index % n_ctrl == 0:
-                policy.step(data, motion_reference.current())
+                policy.step(data, current_motion())
                 motion_reference.advance_by_dt(args.ctrl_dt)
 
             if render.input.is_key_just_pressed("escape"):
@@ -25,25 +25,34 @@ from .reference import MotionData
 
 def _wxyz_to_xyzw(quat_wxyz: np.ndarray) -> np.ndarray:
     quat_wxyz = np.asarray(quat_wxyz, dtype=np.float32)
-    return np.array([quat_wxyz[1], quat_wxyz[2], quat_wxyz[3], quat_wxyz[0]], dtype=np.float32)
+    # the setters of motrixsim expect C-contiguous arrays
+    return np.ascontiguousarray(quat_wxyz[..., [1, 2, 3, 0]])
 
 
 def initialize_motion_tracking_state(robot, model, data, motion_data: MotionData, root_body_index: int = 0) -> None:
-    """Initialize the robot to the first motion frame before playback starts."""
+    """Initialize the robot to the first motion frame before playback starts.
+
+    For batched data, the fields of `motion_data` may have a leading (*data.shape) dimension,
+    see :meth:`MotionReference.frames`, to start every robot from its own frame.
+    """
 
     body = robot.body
     floatingbase = body.floatingbase
     if floatingbase is None:
         raise ValueError("G1 motion tracking playback requires a floating-base robot body")
 
-    root_pos = np.asarray(motion_data.body_pos_w[root_body_index], dtype=np.float32)
-    root_quat_xyzw = _wxyz_to_xyzw(motion_data.body_quat_w[root_body_index])
-    root_lin_vel = np.asarray(motion_data.body_lin_vel_w[root_body_index], dtype=np.float32)
-    root_ang_vel = np.asarray(motion_data.body_ang_vel_w[root_body_index], dtype=np.float32)
+    root_pos = np.ascontiguousarray(np.asarray(motion_data.body_pos_w)[..., root_body_index, :], dtype=np.float32)
+    root_quat_xyzw = _wxyz_to_xyzw(np.asarray(motion_data.body_quat_w)[..., root_body_index, :])
+    root_lin_vel = np.ascontiguousarray(
+        np.asarray(motion_data.body_lin_vel_w)[..., root_body_index, :], dtype=np.float32
+    )
+    root_ang_vel = np.ascontiguousarray(
+        np.asarray(motion_data.body_ang_vel_w)[..., root_body_index, :], dtype=np.float32
+    )
     joint_pos = np.asarray(motion_data.joint_pos, dtype=np.float32)
     joint_vel = np.asarray(motion_data.joint_vel, dtype=np.float32)
-    dof_pos = np.concatenate([root_pos, root_quat_xyzw, joint_pos]).astype(np.float32, copy=False)
-    dof_vel = np.concatenate([root_lin_vel, root_ang_vel, joint_vel]).astype(np.float32, copy=False)
+    dof_pos = np.concatenate([root_pos, root_quat_xyzw, joint_pos], axis=-1).astype(np.float32, copy=False)
+    dof_vel = np.concatenate([root_lin_vel, root_ang_vel, joint_vel], axis=-1).astype(np.float32, copy=False)
 
     body.set_dof_pos(data, dof_pos)
     body.set_dof_vel(data, dof_vel)
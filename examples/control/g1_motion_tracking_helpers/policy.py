@@ -20,6 +20,8 @@ from typing import Sequence
 
 import numpy as np
 
+from legged_gym.utils.onnx_session import get_session
+
 from .contract import (
     ANCHOR_BODY_NAME,
     BODY_NAMES,
@@ -57,14 +59,38 @@ def _last_dim(shape) -> int | None:
     return int(last) if isinstance(last, int) else None
 
 
+def _observation_slices(*sizes: int) -> tuple[slice, ...]:
+    ends = np.cumsum(sizes)
+    return tuple(slice(int(end - size), int(end)) for size, end in zip(sizes, ends))
+
+
+# joint_pos, joint_vel, anchor_pos_b, anchor_ori_b, linvel, gyro, joint_pos_rel, dof_vel, last_actions
+(
+    _OBS_JOINT_POS,
+    _OBS_JOINT_VEL,
+    _OBS_ANCHOR_POS,
+    _OBS_ANCHOR_ORI,
+    _OBS_LINVEL,
+    _OBS_GYRO,
+    _OBS_JOINT_POS_REL,
+    _OBS_DOF_VEL,
+    _OBS_LAST_ACTIONS,
+) = _observation_slices(
+    EXPECTED_ACTION_DIM, EXPECTED_ACTION_DIM, 3, 6, 3, 3, EXPECTED_ACTION_DIM, EXPECTED_ACTION_DIM, EXPECTED_ACTION_DIM
+)
+
+
+# The quaternion kernels below take wxyz quaternions of shape (..., 4) and vectors of shape (..., 3),
+# single or batched, and broadcast their leading dimensions.
+
+
 def _xyzw_to_wxyz(quat_xyzw: np.ndarray) -> np.ndarray:
     quat_xyzw = np.asarray(quat_xyzw, dtype=np.float32)
-    return np.array([quat_xyzw[3], quat_xyzw[0], quat_xyzw[1], quat_xyzw[2]], dtype=np.float32)
+    return quat_xyzw[..., [3, 0, 1, 2]]
 
 
 def _quat_conjugate(quat: np.ndarray) -> np.ndarray:
-    quat = np.asarray(quat, dtype=np.float32)
-    return np.array([quat[0], -quat[1], -quat[2], -quat[3]], dtype=np.float32)
+    return np.asarray(quat, dtype=np.float32) * np.array([1.0, -1.0, -1.0, -1.0], dtype=np.float32)
 
 
 def _quat_inv(quat: np.ndarray) -> np.ndarray:
@@ -72,44 +98,24 @@ def _quat_inv(quat: np.ndarray) -> np.ndarray:
 
 
 def _quat_mul(q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
-    w1, x1, y1, z1 = np.asarray(q1, dtype=np.float32)
-    w2, x2, y2, z2 = np.asarray(q2, dtype=np.float32)
-    return np.array(
-        [
-            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
-            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
-            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
-            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
-        ],
-        dtype=np.float32,
-    )
+    q1 = np.asarray(q1, dtype=np.float32)
+    q2 = np.asarray(q2, dtype=np.float32)
+    w1, x1, y1, z1 = q1[..., 0], q1[..., 1], q1[..., 2], q1[..., 3]
+    w2, x2, y2, z2 = q2[..., 0], q2[..., 1], q2[..., 2], q2[..., 3]
+    out = np.empty((*np.broadcast_shapes(q1.shape, q2.shape)[:-1], 4), dtype=np.float32)
+    out[..., 0] = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+    out[..., 1] = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+    out[..., 2] = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+    out[..., 3] = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+    return out
 
 
 def _quat_apply(quat: np.ndarray, vector: np.ndarray) -> np.ndarray:
     quat = np.asarray(quat, dtype=np.float32)
     vector = np.asarray(vector, dtype=np.float32)
-
-    w, x, y, z = quat
-    vx, vy, vz = vector
-
-    t = 2.0 * np.array(
-        [
-            y * vz - z * vy,
-            z * vx - x * vz,
-            x * vy - y * vx,
-        ],
-        dtype=np.float32,
-    )
-    t += 2.0 * w * vector
-
-    return vector + np.array(
-        [
-            y * t[2] - z * t[1],
-            z * t[0] - x * t[2],
-            x * t[1] - y * t[0],
-        ],
-        dtype=np.float32,
-    )
+    xyz = quat[..., 1:]
+    t = 2.0 * np.cross(xyz, vector)
+    return vector + quat[..., :1] * t + np.cross(xyz, t)
 
 
 def _subtract_frame_transforms(
@@ -119,39 +125,42 @@ def _subtract_frame_transforms(
     target_quat_w: np.ndarray,
 ) -> tuple[np.ndarray, np.ndarray]:
     frame_pos_w = np.asarray(frame_pos_w, dtype=np.float32)
-    frame_quat_w = np.asarray(frame_quat_w, dtype=np.float32)
+    frame_quat_inv = _quat_inv(frame_quat_w)
     target_pos_w = np.asarray(target_pos_w, dtype=np.float32)
-    target_quat_w = np.asarray(target_quat_w, dtype=np.float32)
 
-    rel_pos = _quat_apply(_quat_inv(frame_quat_w), target_pos_w - frame_pos_w)
-    rel_quat = _quat_mul(_quat_inv(frame_quat_w), target_quat_w)
-    return rel_pos.astype(np.float32), rel_quat.astype(np.float32)
+    rel_pos = _quat_apply(frame_quat_inv, target_pos_w - frame_pos_w)
+    rel_quat = _quat_mul(frame_quat_inv, target_quat_w)
+    return rel_pos, rel_quat
 
 
 def _matrix_from_quat(quat: np.ndarray) -> np.ndarray:
-    w, x, y, z = np.asarray(quat, dtype=np.float32)
-    xx = x * x
-    yy = y * y
-    zz = z * z
-    xy = x * y
-    xz = x * z
-    yz = y * z
-    wx = w * x
-    wy = w * y
-    wz = w * z
-
-    return np.array(
-        [
-            [1.0 - 2.0 * (yy + zz), 2.0 * (xy - wz), 2.0 * (xz + wy)],
-            [2.0 * (xy + wz), 1.0 - 2.0 * (xx + zz), 2.0 * (yz - wx)],
-            [2.0 * (xz - wy), 2.0 * (yz + wx), 1.0 - 2.0 * (xx + yy)],
-        ],
-        dtype=np.float32,
-    )
+    quat = np.asarray(quat, dtype=np.float32)
+    w, x, y, z = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    matrix = np.empty((*quat.shape[:-1], 3, 3), dtype=np.float32)
+    matrix[..., 0, 0] = 1.0 - 2.0 * (yy + zz)
+    matrix[..., 0, 1] = 2.0 * (xy - wz)
+    matrix[..., 0, 2] = 2.0 * (xz + wy)
+    matrix[..., 1, 0] = 2.0 * (xy + wz)
+    matrix[..., 1, 1] = 1.0 - 2.0 * (xx + zz)
+    matrix[..., 1, 2] = 2.0 * (yz - wx)
+    matrix[..., 2, 0] = 2.0 * (xz - wy)
+    matrix[..., 2, 1] = 2.0 * (yz + wx)
+    matrix[..., 2, 2] = 1.0 - 2.0 * (xx + yy)
+    return matrix
 
 
 class G1MotionTrackingPolicy:
-    """Standalone ONNX playback policy for G1 motion tracking."""
+    """Standalone ONNX playback policy for G1 motion tracking.
+
+    The policy runs on single or batched SceneData: for data of shape (N,), each robot tracks its own
+    reference frame, given as a :class:`MotionData` whose fields have a leading (N,) dimension, e.g.
+    different clips or time offsets. The observations of all robots are filled into a persistent
+    (N, 160) buffer and evaluated with one ONNX call.
+    """
 
     def __init__(
         self,
@@ -166,6 +175,10 @@ class G1MotionTrackingPolicy:
         self._body_names = tuple(body_names)
         self._anchor_body_name = anchor_body_name
         self._anchor_body_index = self._body_names.index(anchor_body_name)
+        anchor_link = self._robot.model.get_link(anchor_body_name)
+        if anchor_link is None:
+            raise ValueError(f"Anchor link '{anchor_body_name}' not found in model")
+        self._anchor_link_indices = [anchor_link.index]
 
         self.default_angles = np.asarray(robot._DEFAULT_ANGLES, dtype=np.float32).copy()
         if self.default_angles.shape != (EXPECTED_ACTION_DIM,):
@@ -175,11 +188,12 @@ class G1MotionTrackingPolicy:
             )
 
         self.action_scale = float(action_scale)
-        self.last_actions = np.zeros(EXPECTED_ACTION_DIM, dtype=np.float32)
+        self._batch_shape = None
+        self._allocate(())
 
         ort = _import_onnxruntime()
         providers = resolve_onnx_providers(device, ort.get_available_providers())
-        self._policy_session = ort.InferenceSession(onnx_path, providers=providers)
+        self._policy_session = get_session(onnx_path, providers=providers)
 
         inputs = self._policy_session.get_inputs()
         outputs = self._policy_session.get_outputs()
@@ -198,18 +212,41 @@ class G1MotionTrackingPolicy:
             raise ValueError(f"Expected ONNX input dim {EXPECTED_OBS_DIM}, got {inputs[0].shape}")
         if output_dim != EXPECTED_ACTION_DIM:
             raise ValueError(f"Expected ONNX output dim {EXPECTED_ACTION_DIM}, got {outputs[0].shape}")
+        # models exported with a fixed batch of 1 are evaluated robot by robot
+        self._fixed_batch = inputs[0].shape[0] == 1
+
+    def _allocate(self, batch_shape: tuple) -> None:
+        self._batch_shape = batch_shape
+        self._observation = np.zeros((*batch_shape, EXPECTED_OBS_DIM), dtype=np.float32)
+        self._anchor_pose = np.zeros((*batch_shape, 1, 7), dtype=np.float32)
+        self.last_actions = np.zeros((*batch_shape, EXPECTED_ACTION_DIM), dtype=np.float32)
+
+    def _ensure_batch(self, data) -> None:
+        if data.shape != self._batch_shape:
+            self._allocate(data.shape)
+
+    def reset(self, env_mask: np.ndarray | None = None) -> None:
+        """Clear the last actions of every robot, or of the robots selected by the boolean `env_mask`."""
+        if env_mask is None:
+            self.last_actions[...] = 0.0
+        else:
+            self.last_actions[env_mask] = 0.0
 
     def build_actor_observation(self, data, motion_data: MotionData) -> np.ndarray:
-        anchor_link = self._robot.model.get_link(self._anchor_body_name)
-        if anchor_link is None:
-            raise ValueError(f"Anchor link '{self._anchor_body_name}' not found in model")
+        """Fill the observations of every robot.
 
-        robot_anchor_pose = np.asarray(anchor_link.get_pose(data), dtype=np.float32)
-        robot_anchor_pos_w = robot_anchor_pose[:3]
-        robot_anchor_quat_w = _xyzw_to_wxyz(robot_anchor_pose[3:7])
+        Returns:
+            The (*data.shape, 160) observation buffer, overwritten by the next call.
+        """
+        self._ensure_batch(data)
+        observation = self._observation
+        state = self._robot.state(data)
+        anchor_pose = self._robot.model.get_link_poses(data, self._anchor_link_indices, out=self._anchor_pose)
+        robot_anchor_pos_w = anchor_pose[..., 0, :3]
+        robot_anchor_quat_w = _xyzw_to_wxyz(anchor_pose[..., 0, 3:7])
 
-        motion_anchor_pos_w = np.asarray(motion_data.body_pos_w[self._anchor_body_index], dtype=np.float32)
-        motion_anchor_quat_w = np.asarray(motion_data.body_quat_w[self._anchor_body_index], dtype=np.float32)
+        motion_anchor_pos_w = np.asarray(motion_data.body_pos_w, dtype=np.float32)[..., self._anchor_body_index, :]
+        motion_anchor_quat_w = np.asarray(motion_data.body_quat_w, dtype=np.float32)[..., self._anchor_body_index, :]
 
         motion_anchor_pos_b, motion_anchor_ori_rel = _subtract_frame_transforms(
             robot_anchor_pos_w,
@@ -217,54 +254,45 @@ class G1MotionTrackingPolicy:
             motion_anchor_pos_w,
             motion_anchor_quat_w,
         )
-        motion_anchor_ori_b = _matrix_from_quat(motion_anchor_ori_rel)[:, :2].reshape(6)
-
-        linvel = np.asarray(self._robot.local_linear_vel(data), dtype=np.float32)
-        gyro = np.asarray(self._robot.gyro(data), dtype=np.float32)
-        dof_pos = np.asarray(self._robot.dof_pos(data), dtype=np.float32)
-        dof_vel = np.asarray(self._robot.dof_vel(data), dtype=np.float32)
-        joint_pos_rel = dof_pos - self.default_angles
-
-        observation = np.concatenate(
-            [
-                np.asarray(motion_data.joint_pos, dtype=np.float32),
-                np.asarray(motion_data.joint_vel, dtype=np.float32),
-                motion_anchor_pos_b,
-                motion_anchor_ori_b,
-                linvel,
-                gyro,
-                joint_pos_rel,
-                dof_vel,
-                self.last_actions,
-            ]
-        ).astype(np.float32, copy=False)
-
-        if observation.shape != (EXPECTED_OBS_DIM,):
-            raise ValueError(f"Expected actor observation shape {(EXPECTED_OBS_DIM,)}, got {observation.shape}")
+        motion_anchor_ori_b = _matrix_from_quat(motion_anchor_ori_rel)[..., :, :2]
+
+        observation[..., _OBS_JOINT_POS] = motion_data.joint_pos
+        observation[..., _OBS_JOINT_VEL] = motion_data.joint_vel
+        observation[..., _OBS_ANCHOR_POS] = motion_anchor_pos_b
+        observation[..., _OBS_ANCHOR_ORI] = motion_anchor_ori_b.reshape(*motion_anchor_ori_b.shape[:-2], 6)
+        observation[..., _OBS_LINVEL] = state.local_linear_vel
+        observation[..., _OBS_GYRO] = state.gyro
+        np.subtract(state.dof_pos, self.default_angles, out=observation[..., _OBS_JOINT_POS_REL])
+        observation[..., _OBS_DOF_VEL] = state.dof_vel
+        observation[..., _OBS_LAST_ACTIONS] = self.last_actions
         return observation
 
     def compute_action(self, observation: np.ndarray) -> np.ndarray:
+        """Evaluate observations of shape (160,) or (N, 160) in one ONNX call."""
         observation = np.asarray(observation, dtype=np.float32)
-        if observation.shape != (EXPECTED_OBS_DIM,):
-            raise ValueError(f"Expected actor observation shape {(EXPECTED_OBS_DIM,)}, got {observation.shape}")
+        if observation.shape[-1:] != (EXPECTED_OBS_DIM,):
+            raise ValueError(f"Expected actor observation shape (..., {EXPECTED_OBS_DIM}), got {observation.shape}")
 
-        outputs = self._policy_session.run(
-            [self._output_name],
-            {self._input_name: observation.reshape(1, -1)},
-        )
-        action = np.asarray(outputs[0][0], dtype=np.float32)
-        if action.shape != (EXPECTED_ACTION_DIM,):
-            raise ValueError(f"Expected action shape {(EXPECTED_ACTION_DIM,)}, got {action.shape}")
-        return action
+        batch = observation.reshape(-1, EXPECTED_OBS_DIM)
+        if self._fixed_batch and len(batch) > 1:
+            action = np.concatenate(
+                [self._policy_session.run([self._output_name], {self._input_name: row[None]})[0] for row in batch]
+            )
+        else:
+            action = self._policy_session.run([self._output_name], {self._input_name: batch})[0]
+        if action.shape != (len(batch), EXPECTED_ACTION_DIM):
+            raise ValueError(f"Expected action shape {(len(batch), EXPECTED_ACTION_DIM)}, got {action.shape}")
+        return np.asarray(action, dtype=np.float32).reshape(*observation.shape[:-1], EXPECTED_ACTION_DIM)
 
     def apply_action(self, data, action: np.ndarray) -> None:
+        self._ensure_batch(data)
         action = np.asarray(action, dtype=np.float32)
-        if action.shape != (EXPECTED_ACTION_DIM,):
-            raise ValueError(f"Expected action shape {(EXPECTED_ACTION_DIM,)}, got {action.shape}")
+        if action.shape != self.last_actions.shape:
+            raise ValueError(f"Expected action shape {self.last_actions.shape}, got {action.shape}")
 
         ctrl = action * self.action_scale + self.default_angles
         self._robot.set_actuator_ctrls(data, ctrl)
-        self.last_actions = action.copy()
+        self.last_actions[...] = action
 
     def step(self, data, motion_data: MotionData) -> np.ndarray:
         observation = self.build_actor_observation(data, motion_data)
@@ -15,12 +15,21 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import zipfile
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Sequence
 
 import numpy as np
 
 from .contract import REQUIRED_MOTION_FIELDS
 
+# Per-frame fields of a motion, in the order of `MotionData`
+MOTION_FIELDS = ("joint_pos", "joint_vel", "body_pos_w", "body_quat_w", "body_lin_vel_w", "body_ang_vel_w")
+_BODY_FIELDS = ("body_pos_w", "body_quat_w", "body_lin_vel_w", "body_ang_vel_w")
+LIBRARY_META_FILE = "meta.json"
+
 
 @dataclass(frozen=True)
 class MotionData:
@@ -31,37 +40,303 @@ class MotionData:
     body_lin_vel_w: np.ndarray
     body_ang_vel_w: np.ndarray
 
+    @classmethod
+    def stack(cls, frames: Sequence[MotionData]) -> MotionData:
+        """Stack the frames of several robots, e.g. of different clips, along a new leading axis."""
+        return cls(**{field.name: np.stack([getattr(frame, field.name) for frame in frames]) for field in fields(cls)})
+
+
+def _load_npz(motion_file: str) -> tuple[int, dict[str, np.ndarray]]:
+    data = np.load(motion_file)
+    missing = [field_name for field_name in REQUIRED_MOTION_FIELDS if field_name not in data]
+    if missing:
+        raise ValueError("Motion reference is missing required fields: " + ", ".join(sorted(missing)))
+
+    fps = int(np.asarray(data["fps"]).reshape(-1)[0])
+    if fps <= 0:
+        raise ValueError(f"Motion reference fps must be positive, got {fps}")
+    return fps, {name: data[name] for name in MOTION_FIELDS}
+
+
+def _npz_shapes(motion_file: str) -> dict[str, tuple]:
+    """Shapes of the motion fields of a `.npz` file, read from the array headers only."""
+    shapes = {}
+    with zipfile.ZipFile(motion_file) as archive:
+        for name in MOTION_FIELDS:
+            with archive.open(f"{name}.npy") as member:
+                version = np.lib.format.read_magic(member)
+                read_header = (
+                    np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+                )
+                shapes[name] = read_header(member)[0]
+    return shapes
+
+
+def _select_bodies(arrays: dict[str, np.ndarray], body_indices: np.ndarray | None) -> dict[str, np.ndarray]:
+    if body_indices is None:
+        return arrays
+    return {name: array[:, body_indices] if name in _BODY_FIELDS else array for name, array in arrays.items()}
+
+
+def _allocate(arrays: dict[str, np.ndarray], batch_shape: tuple) -> MotionData:
+    return MotionData(
+        **{name: np.zeros((*batch_shape, *array.shape[1:]), dtype=np.float32) for name, array in arrays.items()}
+    )
+
+
+def _slerp(q0: np.ndarray, q1: np.ndarray, alpha: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Spherical interpolation of wxyz quaternions along the shortest arc, nearly equal ones are lerped."""
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0.0, -q1, q1)
+    dot = np.minimum(np.abs(dot), 1.0)
+    theta = np.arccos(dot)
+    sin_theta = np.sin(theta)
+    linear = sin_theta < 1e-6
+    sin_theta = np.where(linear, 1.0, sin_theta)
+    w0 = np.where(linear, 1.0 - alpha, np.sin((1.0 - alpha) * theta) / sin_theta)
+    w1 = np.where(linear, alpha, np.sin(alpha * theta) / sin_theta)
+    np.multiply(w0, q0, out=out)
+    out += w1 * q1
+    out /= np.linalg.norm(out, axis=-1, keepdims=True)
+    return out
+
+
+def _sample(
+    arrays: dict[str, np.ndarray],
+    times,
+    fps,
+    clip_starts,
+    clip_num_frames,
+    out: MotionData | None,
+    scratch: dict[tuple, MotionData],
+) -> MotionData:
+    """Interpolate the frames of clips packed in `arrays` at the given times, see :meth:`MotionReference.sample`.
+
+    The frames after the query times are gathered into the buffers of `scratch` for the batch shape,
+    allocated on first use, so sampling into `out` does not allocate the frames.
+    """
+    position = np.asarray(times, dtype=np.float64) * fps
+    clip_num_frames = np.asarray(clip_num_frames)
+    position = np.mod(position, clip_num_frames)
+    frame0 = np.minimum(np.floor(position).astype(np.int64), clip_num_frames - 1)
+    # the last frame is held instead of blending into the first one, clips do not have to loop
+    frame1 = np.minimum(frame0 + 1, clip_num_frames - 1)
+    alpha = (position - frame0).astype(np.float32)
+    rows0 = clip_starts + frame0
+    rows1 = clip_starts + frame1
+    if out is None:
+        out = _allocate(arrays, np.shape(rows0))
+    next_frames = scratch.get(np.shape(rows0))
+    if next_frames is None:
+        next_frames = scratch[np.shape(rows0)] = _allocate(arrays, np.shape(rows0))
+
+    for name, array in arrays.items():
+        target = getattr(out, name)
+        weight = alpha.reshape(alpha.shape + (1,) * (target.ndim - alpha.ndim))
+        next_frame = np.take(array, rows1, axis=0, out=getattr(next_frames, name))
+        np.take(array, rows0, axis=0, out=target)
+        if name == "body_quat_w":
+            _slerp(target, next_frame, weight, out=target)
+        else:
+            next_frame -= target
+            next_frame *= weight
+            target += next_frame
+    return out
+
+
+class MotionLibrary:
+    """Memory-mapped library of G1 motion-tracking clips.
+
+    The clips are packed frame after frame in one uncompressed `<field>.npy` file per motion field,
+    next to a `meta.json` holding the fps, name, first frame and frame count of every clip, see
+    :meth:`build`. The files are opened with `mmap_mode="r"`: only the pages of the frames that are
+    read are loaded, so a library of thousands of clips does not have to fit in RAM.
+
+    :meth:`frame` returns views of the mapped files, :meth:`frames` gathers one frame per robot for
+    batched data, by `(clip_id, frame)`.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        meta = json.loads((self.path / LIBRARY_META_FILE).read_text())
+        self.clip_names = list(meta["clip_names"])
+        self.fps = np.asarray(meta["fps"], dtype=np.int64)
+        self.clip_starts = np.asarray(meta["clip_starts"], dtype=np.int64)
+        self.clip_num_frames = np.asarray(meta["clip_num_frames"], dtype=np.int64)
+        self.body_indices = None if meta["body_indices"] is None else tuple(meta["body_indices"])
+        self.arrays = {name: np.load(self.path / f"{name}.npy", mmap_mode="r") for name in MOTION_FIELDS}
+        # next frames of :meth:`sample`, per batch shape
+        self._sample_scratch: dict[tuple, MotionData] = {}
+
+    @staticmethod
+    def build(
+        path: str | Path, motion_files: Sequence[str | Path], body_indices: Sequence[int] | None = None
+    ) -> MotionLibrary:
+        """Pack `.npz` motion files into a library at `path`.
+
+        The clips are converted one at a time to float32 and written into the mapped output files,
+        keeping only the bodies of `body_indices`, so the frames handed out by the library are views.
+
+        Args:
+            path: Output directory, created if needed.
+            motion_files: `.npz` files with the fields of :data:`REQUIRED_MOTION_FIELDS`, one per clip.
+            body_indices: Bodies of the motion files to keep, e.g. `contract.MOTION_BODY_INDICES`.
+
+        Returns:
+            The library, opened from `path`.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        selected = None if body_indices is None else np.asarray(body_indices, dtype=np.int64)
+
+        if not motion_files:
+            raise ValueError("Motion library needs at least one motion file")
+        # first pass: fps and clip lengths, without decompressing the motion fields
+        fps, clip_num_frames = [], []
+        for motion_file in motion_files:
+            with np.load(motion_file) as data:
+                missing = [field_name for field_name in REQUIRED_MOTION_FIELDS if field_name not in data]
+                if missing:
+                    raise ValueError(
+                        f"Motion file {motion_file} is missing required fields: {', '.join(sorted(missing))}"
+                    )
+                fps.append(int(np.asarray(data["fps"]).reshape(-1)[0]))
+            clip_num_frames.append(int(_npz_shapes(str(motion_file))["joint_pos"][0]))
+        frame_shapes = _npz_shapes(str(motion_files[0]))
+        frame_shapes = {name: shape[1:] for name, shape in frame_shapes.items()}
+        if selected is not None:
+            for name in _BODY_FIELDS:
+                frame_shapes[name] = (len(selected), *frame_shapes[name][1:])
+        if min(clip_num_frames) == 0:
+            raise ValueError("Motion reference must contain at least one frame")
+        clip_starts = np.concatenate([[0], np.cumsum(clip_num_frames)[:-1]])
+
+        outputs = {
+            name: np.lib.format.open_memmap(
+                path / f"{name}.npy", mode="w+", dtype=np.float32, shape=(sum(clip_num_frames), *frame_shapes[name])
+            )
+            for name in MOTION_FIELDS
+        }
+        for motion_file, start, num_frames in zip(motion_files, clip_starts, clip_num_frames):
+            _, arrays = _load_npz(str(motion_file))
+            for name, array in _select_bodies(arrays, selected).items():
+                outputs[name][start : start + num_frames] = array
+        for output in outputs.values():
+            output.flush()
+        del outputs
+
+        meta = {
+            "clip_names": [Path(motion_file).stem for motion_file in motion_files],
+            "fps": fps,
+            "clip_starts": clip_starts.tolist(),
+            "clip_num_frames": clip_num_frames,
+            "body_indices": None if selected is None else selected.tolist(),
+        }
+        (path / LIBRARY_META_FILE).write_text(json.dumps(meta, indent=2))
+        return MotionLibrary(path)
+
+    @property
+    def num_clips(self) -> int:
+        return len(self.clip_names)
+
+    def _frame_rows(self, clip_ids, frame_indices) -> np.ndarray:
+        clip_ids = np.asarray(clip_ids, dtype=np.int64)
+        return self.clip_starts[clip_ids] + np.asarray(frame_indices, dtype=np.int64) % self.clip_num_frames[clip_ids]
+
+    def frame(self, clip_id: int, frame_index: int) -> MotionData:
+        """One frame of a clip, wrapped around its length, as read-only views of the mapped files."""
+        row = int(self._frame_rows(clip_id, frame_index))
+        return MotionData(**{name: array[row] for name, array in self.arrays.items()})
+
+    def allocate(self, batch_shape: tuple) -> MotionData:
+        """Zeroed frame buffers of shape (*batch_shape, ...), to be filled by :meth:`frames`."""
+        return _allocate(self.arrays, batch_shape)
+
+    def frames(self, clip_ids, frame_indices, out: MotionData | None = None) -> MotionData:
+        """Gather one frame per robot.
+
+        Args:
+            clip_ids: Clip of every robot, broadcast against `frame_indices`.
+            frame_indices: Frame of every robot, wrapped around the length of its clip.
+            out: Buffers returned by :meth:`allocate`, filled in place. Allocated when None.
+
+        Returns:
+            The frames, every field has a leading dimension of the broadcast shape of the indices.
+        """
+        rows = self._frame_rows(clip_ids, frame_indices)
+        if out is None:
+            out = self.allocate(rows.shape)
+        for name, array in self.arrays.items():
+            np.take(array, rows, axis=0, out=getattr(out, name))
+        return out
+
+    def sample(self, clip_ids, times, out: MotionData | None = None) -> MotionData:
+        """Interpolate one frame per robot at `times` seconds into its clip, see :meth:`MotionReference.sample`.
+
+        Args:
+            clip_ids: Clip of every robot, broadcast against `times`.
+            times: Time of every robot in seconds, wrapped around the duration of its clip.
+            out: Buffers returned by :meth:`allocate`, filled in place. Allocated when None.
+        """
+        clip_ids = np.asarray(clip_ids, dtype=np.int64)
+        return _sample(
+            self.arrays,
+            times,
+            self.fps[clip_ids],
+            self.clip_starts[clip_ids],
+            self.clip_num_frames[clip_ids],
+            out,
+            self._sample_scratch,
+        )
+
+    def reference(self, clip_id: int) -> MotionReference:
+        """Playback cursor over one clip, backed by views of the library."""
+        start = int(self.clip_starts[clip_id])
+        stop = start + int(self.clip_num_frames[clip_id])
+        return MotionReference._from_arrays(
+            int(self.fps[clip_id]), {name: array[start:stop] for name, array in self.arrays.items()}
+        )
+
 
 class MotionReference:
-    """Load and advance G1 motion-tracking reference data from a `.npz` file."""
-
-    def __init__(self, motion_file: str, body_indices: np.ndarray | None = None):
-        data = np.load(motion_file)
-        missing = [field_name for field_name in REQUIRED_MOTION_FIELDS if field_name not in data]
-        if missing:
-            raise ValueError("Motion reference is missing required fields: " + ", ".join(sorted(missing)))
-
-        self.fps = int(np.asarray(data["fps"]).reshape(-1)[0])
-        if self.fps <= 0:
-            raise ValueError(f"Motion reference fps must be positive, got {self.fps}")
-
-        self.joint_pos = np.asarray(data["joint_pos"], dtype=np.float32)
-        self.joint_vel = np.asarray(data["joint_vel"], dtype=np.float32)
-        body_pos_w = np.asarray(data["body_pos_w"], dtype=np.float32)
-        body_quat_w = np.asarray(data["body_quat_w"], dtype=np.float32)
-        body_lin_vel_w = np.asarray(data["body_lin_vel_w"], dtype=np.float32)
-        body_ang_vel_w = np.asarray(data["body_ang_vel_w"], dtype=np.float32)
+    """Load and advance G1 motion-tracking reference data.
+
+    The motion is read from a `.npz` file, or from one clip of a :class:`MotionLibrary` directory, in
+    which case the frames stay memory mapped. :meth:`frame` returns read-only views, not copies.
+    """
+
+    def __init__(self, motion_file: str, body_indices: np.ndarray | None = None, clip_id: int = 0):
+        if Path(motion_file).is_dir():
+            library = MotionLibrary(motion_file)
+            if body_indices is not None and library.body_indices is not None:
+                if tuple(int(index) for index in body_indices) != library.body_indices:
+                    raise ValueError(
+                        f"Motion library keeps the bodies {library.body_indices}, "
+                        f"got body_indices {tuple(body_indices)}"
+                    )
+                body_indices = None
+            clip = library.reference(clip_id)
+            fps, arrays = clip.fps, {name: getattr(clip, name) for name in MOTION_FIELDS}
+        else:
+            fps, arrays = _load_npz(motion_file)
+            arrays = {name: np.asarray(array, dtype=np.float32) for name, array in arrays.items()}
         if body_indices is not None:
-            body_indices = np.asarray(body_indices, dtype=np.int32)
-            body_pos_w = body_pos_w[:, body_indices]
-            body_quat_w = body_quat_w[:, body_indices]
-            body_lin_vel_w = body_lin_vel_w[:, body_indices]
-            body_ang_vel_w = body_ang_vel_w[:, body_indices]
+            arrays = _select_bodies(arrays, np.asarray(body_indices, dtype=np.int32))
+        self._init(fps, arrays)
 
-        self.body_pos_w = body_pos_w
-        self.body_quat_w = body_quat_w
-        self.body_lin_vel_w = body_lin_vel_w
-        self.body_ang_vel_w = body_ang_vel_w
+    @classmethod
+    def _from_arrays(cls, fps: int, arrays: dict[str, np.ndarray]) -> MotionReference:
+        reference = cls.__new__(cls)
+        reference._init(fps, arrays)
+        return reference
+
+    def _init(self, fps: int, arrays: dict[str, np.ndarray]) -> None:
+        self.fps = fps
+        for name, array in arrays.items():
+            if array.flags.writeable:
+                # the frames are handed out as views
+                array.setflags(write=False)
+            setattr(self, name, array)
 
         self.num_frames = int(self.joint_pos.shape[0])
         if self.num_frames == 0:
@@ -69,18 +344,61 @@ class MotionReference:
 
         self.current_frame = 0
         self._frame_accumulator = 0.0
+        # next frames of :meth:`sample`, per batch shape
+        self._sample_scratch: dict[tuple, MotionData] = {}
 
     def frame(self, frame_index: int | None = None) -> MotionData:
         index = self.current_frame if frame_index is None else int(frame_index) % self.num_frames
         return MotionData(
-            joint_pos=self.joint_pos[index].copy(),
-            joint_vel=self.joint_vel[index].copy(),
-            body_pos_w=self.body_pos_w[index].copy(),
-            body_quat_w=self.body_quat_w[index].copy(),
-            body_lin_vel_w=self.body_lin_vel_w[index].copy(),
-            body_ang_vel_w=self.body_ang_vel_w[index].copy(),
+            joint_pos=self.joint_pos[index],
+            joint_vel=self.joint_vel[index],
+            body_pos_w=self.body_pos_w[index],
+            body_quat_w=self.body_quat_w[index],
+            body_lin_vel_w=self.body_lin_vel_w[index],
+            body_ang_vel_w=self.body_ang_vel_w[index],
         )
 
+    def allocate(self, batch_shape: tuple) -> MotionData:
+        """Zeroed frame buffers of shape (*batch_shape, ...), to be filled by :meth:`frames`."""
+        return _allocate({name: getattr(self, name) for name in MOTION_FIELDS}, batch_shape)
+
+    def frames(self, frame_indices: np.ndarray, out: MotionData | None = None) -> MotionData:
+        """Gather one frame per robot, each field gets a leading dimension of the shape of `frame_indices`.
+
+        Args:
+            frame_indices: Frame of every robot, wrapped around the length of the motion.
+            out: Buffers returned by :meth:`allocate`, filled in place. Allocated when None.
+        """
+        indices = np.asarray(frame_indices, dtype=np.int64) % self.num_frames
+        if out is None:
+            return MotionData(**{name: getattr(self, name)[indices] for name in MOTION_FIELDS})
+        for name in MOTION_FIELDS:
+            np.take(getattr(self, name), indices, axis=0, out=getattr(out, name))
+        return out
+
+    @property
+    def current_time(self) -> float:
+        """Playback time in seconds, including the fraction of frame accumulated by :meth:`advance_by_dt`."""
+        return (self.current_frame + self._frame_accumulator) / self.fps
+
+    def sample(self, times, out: MotionData | None = None) -> MotionData:
+        """Interpolate the motion at arbitrary times, in one vectorized call.
+
+        Joint positions and velocities, body positions and velocities are interpolated linearly
+        between the two frames around every time, body quaternions are slerped. Control can then
+        run at any rate, e.g. a `--ctrl-dt` that does not divide the motion fps.
+
+        Args:
+            times: Query times in seconds, scalar or of any shape, wrapped around the duration of the motion.
+            out: Buffers returned by :meth:`allocate` for the shape of `times`, filled in place.
+                Allocated when None.
+
+        Returns:
+            The interpolated frames, every field has a leading dimension of the shape of `times`.
+        """
+        arrays = {name: getattr(self, name) for name in MOTION_FIELDS}
+        return _sample(arrays, times, self.fps, 0, self.num_frames, out, self._sample_scratch)
+
     def current(self) -> MotionData:
         return self.frame(self.current_frame)
 
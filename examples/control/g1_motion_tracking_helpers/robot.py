@@ -27,10 +27,7 @@ class G1MotionTrackingRobot(RobotBase):
     mjcf_path = str(contract.DEFAULT_ROBOT_PATH)
     base_link_name = "pelvis"
 
-    _DEFAULT_ANGLES = np.zeros(29, dtype=np.float32)
-
-    def local_linear_vel(self, data) -> np.ndarray:
-        return self._model.get_sensor_value(contract.LOCAL_LINEAR_VELOCITY_SENSOR, data)
+    local_linvel_sensor = contract.LOCAL_LINEAR_VELOCITY_SENSOR
+    gyro_sensor = contract.GYRO_SENSOR
 
-    def gyro(self, data) -> np.ndarray:
-        return self._model.get_sensor_value(contract.GYRO_SENSOR, data)
+    _DEFAULT_ANGLES = np.zeros(29, dtype=np.float32)
@@ -17,9 +17,9 @@ import random
 from collections import deque
 
 import numpy as np
-import onnxruntime as ort
 from scipy.spatial.transform import Rotation
 
+from legged_gym.utils.onnx_session import get_session
 from motrixsim import SceneData, SceneModel, load_model, step
 from motrixsim.render import CaptureTask, Layout, RenderApp
 
@@ -126,9 +126,8 @@ def main():
         # Create the physics data of the model
         data = SceneData(model)
 
-        session = ort.InferenceSession(
-            "examples/assets/go1/policies/go1_policy.onnx",
-            providers=["CPUExecutionProvider"],
+        session = get_session(
+            "examples/assets/go1/policies/go1_policy.onnx", intra_op_num_threads=1, inter_op_num_threads=1
         )
         input_name = session.get_inputs()[0].name
         output_name = session.get_outputs()[0].name
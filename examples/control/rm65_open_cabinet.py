@@ -16,8 +16,8 @@
 from pathlib import Path
 
 import numpy as np
-import onnxruntime as ort
 
+from legged_gym.utils.onnx_session import get_session
 from motrixsim import SceneData, SceneModel, load_model
 from motrixsim.render import RenderApp
 
@@ -120,7 +120,7 @@ class Rm65OpenCabinetPolicy:
         self.gripper_site = self._require(model.get_site(GRIPPER_SITE), f"site {GRIPPER_SITE}")
         self.handle_site = self._require(model.get_site(DRAWER_HANDLE_SITE), f"site {DRAWER_HANDLE_SITE}")
 
-        self.session = ort.InferenceSession(str(ONNX_FILE), providers=["CPUExecutionProvider"])
+        self.session = get_session(ONNX_FILE, intra_op_num_threads=1, inter_op_num_threads=1)
         self.input_name = self.session.get_inputs()[0].name
         self.output_name = self.session.get_outputs()[0].name
         self.reset_cache()
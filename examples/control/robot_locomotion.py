@@ -23,7 +23,8 @@ import numpy as np
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from utils.controller import KeyboardCommandAdapter
-from utils.policy import G1LocomotionPolicy, G1Policy12Dof, Go1LocomotionPolicy, Go2LocomotionPolicy
+from utils.layout import grid_offsets
+from utils.policy import G1LocomotionPolicy, G1Policy12Dof, Go1LocomotionPolicy, Go2LocomotionPolicy, PipelinedPolicy
 from utils.robot import G1Robot, G1Robot12Dof, Go1Robot, Go2Robot
 from utils.terrain_scan_visualizer import TerrainScanVisualizer
 
@@ -242,6 +243,8 @@ def run_locomotion(
     camera_fovy: float | None = None,
     head_camera: dict | None = None,
     lidar_profile: str | None = None,
+    num_envs: int = 1,
+    action_latency: int = 0,
 ):
     # Stairs scene only supports G1 robot
     if scene == "stairs" and robot != "g1":
@@ -269,6 +272,8 @@ def run_locomotion(
     if camera_fovy is None:
         camera_fovy = camera_config.get("camera_fovy", 45)
     show_terrain_scan = scene_name in DEFAULT_TERRAIN_SCAN_SCENES
+    if show_terrain_scan and num_envs > 1:
+        raise ValueError(f"{scene_name} scene shows a terrain scan and only supports --num-envs 1")
     terrain_scan_offsets = DEFAULT_TERRAIN_SCAN_OFFSETS
     extra_worlds = []
     if show_terrain_scan:
@@ -293,6 +298,9 @@ def run_locomotion(
     policy = PolicyClass(
         robot=robot,
     )
+    if action_latency > 0:
+        # Run the inference on a worker thread while the physics substeps integrate
+        policy = PipelinedPolicy(policy, latency=action_latency)
     terrain_scan_visualizer = None
     if show_terrain_scan:
         terrain = model.get_geom("floor")
@@ -315,8 +323,9 @@ def run_locomotion(
     # Create keyboard adapter
     keyboard_adapter = KeyboardCommandAdapter()
 
-    # Initialize simulation data
-    data = SceneData(model)
+    # Initialize simulation data, the policy drives all the instances with one inference per control step
+    batched = num_envs > 1
+    data = SceneData(model, batch=(num_envs,)) if batched else SceneData(model)
     step = 0
     print(f"Controlling {robot_name.upper()} robot in {scene_name} scene")
     print("Keyboard Controls:")
@@ -334,7 +343,10 @@ def run_locomotion(
         render.set_main_camera(camera)
 
         # Launch the render instance of the model
-        render.launch(model, render_settings=render_settings)
+        if batched:
+            render.launch(model, batch=num_envs, render_offset=grid_offsets(num_envs), render_settings=render_settings)
+        else:
+            render.launch(model, render_settings=render_settings)
         if lidar_profile is not None:
             render.opt.set_lidar_point_vis(True)
 
@@ -369,7 +381,13 @@ def run_locomotion(
             if step % n_ctrl == 0:
                 # control update
                 need_reset = policy.step(data, keyboard_adapter.command)
-                if need_reset:
+                if batched:
+                    # Reset the fallen instances only, the others keep walking
+                    if np.any(need_reset):
+                        data[need_reset].reset(model, forward_kinematic=True)
+                        if hasattr(policy, "reset"):
+                            policy.reset(need_reset)
+                elif need_reset:
                     data = SceneData(model)
                     if hasattr(policy, "reset"):
                         policy.reset()
@@ -389,6 +407,9 @@ def run_locomotion(
                 # Sync rendering (also processes input events)
                 render.sync(data)
 
+    if action_latency > 0:
+        policy.close()
+
 
 def create_argument_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Keyboard control for robots")
@@ -413,6 +434,20 @@ def create_argument_parser() -> argparse.ArgumentParser:
         metavar="PROFILE",
         help="Lidar profile to attach to the selected robot; see --list-lidars (default: no lidar)",
     )
+    parser.add_argument(
+        "--num-envs",
+        type=int,
+        default=1,
+        help="Number of robots simulated on one batched SceneData and driven by one policy (default: 1)",
+    )
+    parser.add_argument(
+        "--action-latency",
+        type=int,
+        default=0,
+        metavar="TICKS",
+        help="Run the policy inference on a worker thread overlapping the physics, applying each action "
+        "this many control ticks later (default: 0, synchronous inference)",
+    )
     parser.add_argument(
         "--list-lidars",
         action="store_true",
@@ -429,7 +464,9 @@ def main():
         return
 
     try:
-        run_locomotion(args.robot, args.scene, lidar_profile=args.lidar)
+        run_locomotion(
+            args.robot, args.scene, lidar_profile=args.lidar, num_envs=args.num_envs, action_latency=args.action_latency
+        )
     except ValueError as exc:
         parser.error(str(exc))
 
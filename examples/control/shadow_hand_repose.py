@@ -13,11 +13,18 @@
 # limitations under the License.
 # ==============================================================================
 
+import argparse
+import sys
 from pathlib import Path
 
 import numpy as np
-import onnxruntime as ort
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.layout import grid_offsets
+
+from legged_gym.utils.onnx_session import get_session
+from legged_gym.utils.rotation import quat_conjugate, quat_mul
 from motrixsim import SceneData, SceneModel, load_model
 from motrixsim.render import RenderApp
 
@@ -207,38 +214,25 @@ ACTUATOR_UPPER = np.array(
 )
 
 
-def quat_conjugate(q: np.ndarray) -> np.ndarray:
-    return np.array([-q[0], -q[1], -q[2], q[3]], dtype=np.float32)
-
-
-def quat_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
-    ax, ay, az, aw = a
-    bx, by, bz, bw = b
-    q = np.array(
-        [
-            aw * bx + ax * bw + ay * bz - az * by,
-            aw * by - ax * bz + ay * bw + az * bx,
-            aw * bz + ax * by - ay * bx + az * bw,
-            aw * bw - ax * bx - ay * by - az * bz,
-        ],
-        dtype=np.float32,
-    )
-    norm = np.linalg.norm(q)
-    return q / norm if norm > 1e-6 else CUBE_INITIAL_ROT.copy()
+def normalize_quat(q: np.ndarray) -> np.ndarray:
+    """Normalize quaternions of shape (..., 4), degenerate ones become the identity."""
+    norm = np.linalg.norm(q, axis=-1, keepdims=True)
+    return np.where(norm > 1e-6, q / np.maximum(norm, 1e-6), CUBE_INITIAL_ROT).astype(np.float32)
 
 
-def random_unit_quat(rng: np.random.Generator) -> np.ndarray:
-    u1, u2, u3 = rng.random(3)
-    q = np.array(
+def random_unit_quat(rng: np.random.Generator, shape: tuple = ()) -> np.ndarray:
+    """Uniformly distributed xyzw quaternions of shape (*shape, 4)."""
+    u1, u2, u3 = np.moveaxis(rng.random((*shape, 3)), -1, 0)
+    q = np.stack(
         [
             np.sqrt(1.0 - u1) * np.sin(2.0 * np.pi * u2),
             np.sqrt(1.0 - u1) * np.cos(2.0 * np.pi * u2),
             np.sqrt(u1) * np.sin(2.0 * np.pi * u3),
             np.sqrt(u1) * np.cos(2.0 * np.pi * u3),
         ],
-        dtype=np.float32,
-    )
-    return q / np.linalg.norm(q)
+        axis=-1,
+    ).astype(np.float32)
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
 
 
 def unscale(value: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
@@ -252,23 +246,42 @@ def scale_actions(actions: np.ndarray) -> np.ndarray:
 
 
 class ShadowHandReposePolicy:
+    """
+    Repose policy of the shadow hand, evaluated on single or batched SceneData.
+
+    The dof, link and actuator indices are resolved once, so a control step reads the hand and cube
+    state from `data.dof_pos` / `data.dof_vel` and the fingertips from one `get_link_poses` and one
+    `get_link_velocities` call, runs the policy once on the (*data.shape, OBS_DIM) observations and
+    writes every ctrl with one `actuator_ctrls` assignment. Each instance has its own goal rotation.
+    """
+
     def __init__(self, model: SceneModel):
         self.model = model
-        self.hand_joints = [self._require(model.get_joint(name), f"joint {name}") for name in HAND_JOINTS]
-        self.fingertip_links = [self._require(model.get_link(name), f"link {name}") for name in FINGERTIP_LINKS]
-        self.actuators = [self._require(model.get_actuator(name), f"actuator {name}") for name in ACTUATORS]
+        hand_joints = [self._require(model.get_joint(name), f"joint {name}") for name in HAND_JOINTS]
+        fingertip_links = [self._require(model.get_link(name), f"link {name}") for name in FINGERTIP_LINKS]
+        actuators = [self._require(model.get_actuator(name), f"actuator {name}") for name in ACTUATORS]
         self.cube_body = self._require(model.get_body("cube"), "body cube")
         self.target_body = self._require(model.get_body("target"), "body target")
         self.target_mocap = self._require(self.target_body.mocap, "target mocap")
 
-        self.session = ort.InferenceSession(str(ONNX_FILE), providers=["CPUExecutionProvider"])
+        # hinge joints: one dof each
+        self.hand_dof_pos_indices = np.array([joint.dof_pos_index for joint in hand_joints])
+        self.hand_dof_vel_indices = np.array([joint.dof_vel_index for joint in hand_joints])
+        self.fingertip_link_indices = [link.index for link in fingertip_links]
+        self.actuator_indices = np.array([actuator.index for actuator in actuators])
+        # [tx, ty, tz, qx, qy, qz, qw] and [vx, vy, vz, wx, wy, wz] of the cube
+        self.cube_dof_pos_indices = np.asarray(self.cube_body.get_dof_pos_indices(True))
+        self.cube_dof_vel_indices = np.asarray(self.cube_body.get_dof_vel_indices(True))
+        self.cube_initial_dof_pos = np.concatenate([CUBE_INITIAL_POS, CUBE_INITIAL_ROT])
+
+        self.session = get_session(ONNX_FILE)
         self.input_name = self.session.get_inputs()[0].name
         self.output_name = self.session.get_outputs()[0].name
+        # models exported with a fixed batch of 1 are evaluated instance by instance
+        self._fixed_batch = self.session.get_inputs()[0].shape[0] == 1
 
         self.rng = np.random.default_rng()
-        self.goal_pos = GOAL_POS.copy()
-        self.goal_rot = GOAL_ROT.copy()
-        self.prev_actions = np.zeros(ACTION_DIM, dtype=np.float32)
+        self._allocate(())
 
     @staticmethod
     def _require(value, description: str):
@@ -276,82 +289,122 @@ class ShadowHandReposePolicy:
             raise RuntimeError(f"missing {description}")
         return value
 
-    def reset_data(self, data: SceneData) -> None:
-        for joint in self.hand_joints:
-            joint.set_dof_pos(data, [0.0])
-        self.cube_body.floatingbase.set_translation(data, CUBE_INITIAL_POS)
-        self.cube_body.floatingbase.set_rotation(data, CUBE_INITIAL_ROT)
-        data.set_dof_vel(np.zeros_like(data.dof_vel))
-        for actuator in self.actuators:
-            actuator.set_ctrl(data, 0.0)
-        self.goal_pos = GOAL_POS.copy()
-        self.goal_rot = random_unit_quat(self.rng)
-        self.prev_actions = np.zeros(ACTION_DIM, dtype=np.float32)
+    def _allocate(self, batch_shape: tuple) -> None:
+        """(Re)allocate the per-instance goals and buffers for data of the given batch shape."""
+        self._batch_shape = batch_shape
+        self.goal_pos = np.broadcast_to(GOAL_POS, (*batch_shape, 3)).copy()
+        self.goal_rot = np.broadcast_to(GOAL_ROT, (*batch_shape, 4)).copy()
+        self.prev_actions = np.zeros((*batch_shape, ACTION_DIM), dtype=np.float32)
+        self._obs = np.zeros((*batch_shape, OBS_DIM), dtype=np.float32)
+        self._fingertip_poses = np.zeros((*batch_shape, NUM_FINGERTIPS, 7), dtype=np.float32)
+        self._fingertip_vels = np.zeros((*batch_shape, NUM_FINGERTIPS, 6), dtype=np.float32)
+        self._ctrls = np.zeros((*batch_shape, self.model.num_actuators), dtype=np.float32)
+
+    def reset_data(self, data: SceneData, env_mask: np.ndarray = None) -> None:
+        """
+        Reset the hand, the cube and the goal of every instance, or only of the instances selected
+        by the boolean `env_mask` of shape data.shape.
+        """
+        if data.shape != self._batch_shape:
+            self._allocate(data.shape)
+        if env_mask is None:
+            env_mask = np.ones(data.shape, dtype=bool)
+        env_data = data[env_mask] if data.shape else data
+        num_reset = int(np.count_nonzero(env_mask))
+
+        dof_pos = np.array(env_data.dof_pos, dtype=np.float32)
+        dof_pos[..., self.hand_dof_pos_indices] = 0.0
+        dof_pos[..., self.cube_dof_pos_indices] = self.cube_initial_dof_pos
+        env_data.set_dof_pos(dof_pos, self.model)
+        env_data.set_dof_vel(np.zeros_like(env_data.dof_vel))
+        self._ctrls[env_mask] = 0.0
+        data.actuator_ctrls = self._ctrls
+
+        self.goal_pos[env_mask] = GOAL_POS
+        self.goal_rot[env_mask] = random_unit_quat(self.rng, (num_reset,) if data.shape else ())
+        self.prev_actions[env_mask] = 0.0
         self.update_target_visual(data)
         self.model.forward_kinematic(data)
 
     def update_target_visual(self, data: SceneData) -> None:
-        target_pos = self.goal_pos + TARGET_VIZ_OFFSET
-        self.target_mocap.set_pose(data, np.concatenate([target_pos, self.goal_rot]).astype(np.float32))
+        target_pose = np.concatenate([self.goal_pos + TARGET_VIZ_OFFSET, self.goal_rot], axis=-1)
+        self.target_mocap.set_pose(data, target_pose.astype(np.float32))
 
     def compute_observation(self, data: SceneData) -> np.ndarray:
-        hand_pos = np.array([joint.get_dof_pos(data)[0] for joint in self.hand_joints], dtype=np.float32)
-        hand_vel = np.array([joint.get_dof_vel(data)[0] for joint in self.hand_joints], dtype=np.float32)
-        cube_pose = np.asarray(self.cube_body.get_pose(data), dtype=np.float32)
-        cube_vel = np.asarray(data.dof_vel[self.cube_body.get_dof_vel_indices(True)], dtype=np.float32)
-
-        fingertip_pos = []
-        fingertip_quat = []
-        fingertip_vel = []
-        for link in self.fingertip_links:
-            pose = np.asarray(link.get_pose(data), dtype=np.float32)
-            fingertip_pos.append(pose[:3])
-            fingertip_quat.append(pose[3:7])
-            fingertip_vel.append(
-                np.concatenate(
-                    [
-                        np.asarray(link.get_linear_velocity(data), dtype=np.float32),
-                        np.asarray(link.get_angular_velocity(data), dtype=np.float32),
-                    ]
-                )
-            )
-
-        relative_quat = quat_mul(cube_pose[3:7], quat_conjugate(self.goal_rot))
-        obs = np.concatenate(
+        """
+        Returns:
+            np.ndarray: Observations of shape (*data.shape, OBS_DIM), the buffer is overwritten by
+            the next call.
+        """
+        if data.shape != self._batch_shape:
+            self._allocate(data.shape)
+        dof_pos = data.dof_pos
+        dof_vel = data.dof_vel
+        hand_pos = dof_pos[..., self.hand_dof_pos_indices]
+        hand_vel = dof_vel[..., self.hand_dof_vel_indices]
+        cube_pose = dof_pos[..., self.cube_dof_pos_indices]
+        cube_vel = dof_vel[..., self.cube_dof_vel_indices]
+        fingertip_poses = self.model.get_link_poses(data, self.fingertip_link_indices, out=self._fingertip_poses)
+        fingertip_vels = self.model.get_link_velocities(data, self.fingertip_link_indices, out=self._fingertip_vels)
+        relative_quat = normalize_quat(quat_mul(cube_pose[..., 3:7], quat_conjugate(self.goal_rot)))
+
+        batch_shape = self._batch_shape
+        np.concatenate(
             [
                 unscale(hand_pos, HAND_DOF_LOWER, HAND_DOF_UPPER),
                 VEL_OBS_SCALE * hand_vel,
-                cube_pose[:3],
-                cube_pose[3:7],
-                cube_vel[:3],
-                VEL_OBS_SCALE * cube_vel[3:6],
+                cube_pose[..., :3],
+                cube_pose[..., 3:7],
+                cube_vel[..., :3],
+                VEL_OBS_SCALE * cube_vel[..., 3:6],
                 self.goal_pos,
                 self.goal_rot,
                 relative_quat,
-                np.concatenate(fingertip_pos),
-                np.concatenate(fingertip_quat),
-                np.concatenate(fingertip_vel),
+                fingertip_poses[..., :3].reshape(*batch_shape, 3 * NUM_FINGERTIPS),
+                fingertip_poses[..., 3:7].reshape(*batch_shape, 4 * NUM_FINGERTIPS),
+                fingertip_vels.reshape(*batch_shape, 6 * NUM_FINGERTIPS),
                 self.prev_actions,
-            ]
-        ).astype(np.float32)
-        assert obs.shape == (OBS_DIM,)
-        return obs
+            ],
+            axis=-1,
+            out=self._obs,
+            casting="unsafe",
+        )
+        return self._obs
 
     def apply_action(self, data: SceneData, action: np.ndarray) -> None:
-        targets = scale_actions(np.asarray(action, dtype=np.float32).reshape(ACTION_DIM))
-        for actuator, ctrl in zip(self.actuators, targets):
-            actuator.set_ctrl(data, float(ctrl))
-        self.prev_actions = targets.copy()
+        targets = scale_actions(np.asarray(action, dtype=np.float32).reshape(*self._batch_shape, ACTION_DIM))
+        self._ctrls[..., self.actuator_indices] = targets
+        data.actuator_ctrls = self._ctrls
+        self.prev_actions[...] = targets
+
+    def compute_action(self, obs: np.ndarray) -> np.ndarray:
+        """Evaluate observations of shape (*batch_shape, OBS_DIM) in one policy call."""
+        batch = obs.reshape(-1, OBS_DIM)
+        if self._fixed_batch and len(batch) > 1:
+            actions = np.concatenate(
+                [self.session.run([self.output_name], {self.input_name: row[None]})[0] for row in batch]
+            )
+        else:
+            actions = self.session.run([self.output_name], {self.input_name: batch})[0]
+        return actions.reshape(*obs.shape[:-1], ACTION_DIM)
 
     def step(self, data: SceneData) -> None:
-        obs = self.compute_observation(data).reshape(1, -1).astype(np.float32)
-        actions = self.session.run([self.output_name], {self.input_name: obs})[0][0]
-        self.apply_action(data, actions)
+        self.apply_action(data, self.compute_action(self.compute_observation(data)))
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Shadow hand in-hand cube repose")
+    parser.add_argument(
+        "--num-envs",
+        type=int,
+        default=1,
+        help="Number of hands simulated on one batched SceneData, each with its own random goal",
+    )
+    args = parser.parse_args()
+    num_envs = args.num_envs
+
     model = load_model(str(MODEL_FILE))
-    data = SceneData(model)
+    data = SceneData(model) if num_envs == 1 else SceneData(model, batch=(num_envs,))
     policy = ShadowHandReposePolicy(model)
     policy.reset_data(data)
 
@@ -361,7 +414,10 @@ def main() -> None:
 
     print("Running shadow_hand_repose. Press R to reset, ESC to exit.")
     with RenderApp() as render:
-        render.launch(model)
+        if num_envs == 1:
+            render.launch(model)
+        else:
+            render.launch(model, batch=num_envs, render_offset=grid_offsets(num_envs, spacing=0.6))
         step_index = 0
         while not render.is_closed:
             model.step(data)
@@ -371,7 +427,7 @@ def main() -> None:
                 policy.step(data)
 
             if render.input.is_key_just_pressed("r"):
-                data = SceneData(model)
+                data = SceneData(model) if num_envs == 1 else SceneData(model, batch=(num_envs,))
                 policy.reset_data(data)
                 step_index = 0
             if render.input.is_key_just_pressed("esc"):
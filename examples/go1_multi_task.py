@@ -15,12 +15,16 @@
 
 from __future__ import annotations
 
+import argparse
 from enum import Enum
 from pathlib import Path
 
 import numpy as np
-import onnxruntime as ort
+from utils.layout import grid_offsets
+from utils.robot import Go1Robot
 
+from legged_gym.utils.onnx_session import get_session
+from legged_gym.utils.rotation import up_axis_z
 from motrixsim import SceneData, load_model
 from motrixsim.render import RenderApp
 
@@ -65,265 +69,259 @@ class Mode(Enum):
 
 class OnnxPolicy:
     def __init__(self, path: str):
-        self._session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self._session = get_session(path)
         self._input_name = self._session.get_inputs()[0].name
         self._output_name = self._session.get_outputs()[0].name
+        # models exported with a fixed batch of 1 are evaluated row by row
+        self._fixed_batch = self._session.get_inputs()[0].shape[0] == 1
 
     def run(self, observation: np.ndarray) -> np.ndarray:
-        outputs = self._session.run([self._output_name], {self._input_name: observation.reshape(1, -1)})
-        return np.asarray(outputs[0][0], dtype=np.float32)
-
-
-class Go1Robot:
-    base_link_name = "trunk"
-
-    def __init__(self, body):
-        self.body = body
-        self.model = body.model
-
-    def dof_pos(self, data: SceneData) -> np.ndarray:
-        return self.body.get_joint_dof_pos(data)
-
-    def dof_vel(self, data: SceneData) -> np.ndarray:
-        return self.body.get_joint_dof_vel(data)
-
-    def set_actuator_ctrls(self, data: SceneData, ctrls: np.ndarray) -> None:
-        self.body.set_actuator_ctrls(data, ctrls)
-
-    def gravity(self, data: SceneData) -> np.ndarray:
-        rotation = self.body.get_rotation_mat(data)
-        return rotation.T @ np.array([0.0, 0.0, -1.0], dtype=np.float32)
-
-    def local_linear_vel(self, data: SceneData) -> np.ndarray:
-        return self.model.get_sensor_value("local_linvel", data)
-
-    def gyro(self, data: SceneData) -> np.ndarray:
-        return self.model.get_sensor_value("gyro", data)
+        """Evaluate observations of shape (obs_dim,) or (num_envs, obs_dim) in one call."""
+        batch = observation.reshape(-1, observation.shape[-1])
+        if self._fixed_batch and len(batch) > 1:
+            actions = np.concatenate(
+                [self._session.run([self._output_name], {self._input_name: row[None]})[0] for row in batch]
+            )
+        else:
+            actions = self._session.run([self._output_name], {self._input_name: batch})[0]
+        return np.asarray(actions, dtype=np.float32).reshape(*observation.shape[:-1], -1)
+
+
+# Mode codes of the per-env mode arrays, the index of the mode in `Mode`
+MODES = tuple(Mode)
+JOYSTICK, HANDSTAND, GETUP, FOOTSTAND = (MODES.index(mode) for mode in MODES)
+NO_MODE = -1
+COMMAND_SCALE = np.array([COMMAND_LIN_VEL_SCALE, COMMAND_LIN_VEL_SCALE, COMMAND_ANG_VEL_SCALE], dtype=np.float32)
+# Every policy observes a contiguous slice of the full observation:
+# [local_linvel(3), gyro(3), gravity(3), joint_offset(12), joint_vel(12), last_action(12), command(3)]
+NUM_OBS = 48
+OBS_SLICES = {
+    JOYSTICK: slice(0, 48),
+    HANDSTAND: slice(0, 45),
+    GETUP: slice(3, 45),
+    FOOTSTAND: slice(0, 45),
+}
+CAMERA_NAMES = np.array([None, "back", "side"], dtype=object)
 
 
 class Go1MultiTaskPolicy:
+    """Mode-switching Go1 controller over a single or a batched SceneData.
+
+    Every instance has its own mode and transition counters, stored in arrays of shape
+    (num_envs,). Per control step the transitions are evaluated for the whole batch, the
+    instances are grouped by active policy, and each ONNX session runs once on the observations
+    of its group, sliced from one (num_envs, 48) buffer. The actions are then scattered back
+    into one (num_envs, 12) ctrl array.
+    """
+
+    robot_class = Go1Robot
+    first_actuator = "FR_hip"
+    policy_paths = {
+        JOYSTICK: JOYSTICK_POLICY_PATH,
+        HANDSTAND: HANDSTAND_POLICY_PATH,
+        GETUP: GETUP_POLICY_PATH,
+        FOOTSTAND: FOOTSTAND_POLICY_PATH,
+    }
+
     def __init__(self, model):
-        body = model.get_body("trunk")
+        body = model.get_body(self.robot_class.base_link_name)
         if body is None:
-            raise RuntimeError("Missing Go1 body 'trunk' in the scene model.")
+            raise RuntimeError(f"Missing Go1 body '{self.robot_class.base_link_name}' in the scene model.")
 
-        actuator_start = model.get_actuator_index("FR_hip")
+        actuator_start = model.get_actuator_index(self.first_actuator)
         if actuator_start is None:
-            raise RuntimeError("Missing Go1 actuator 'FR_hip' in the scene model.")
+            raise RuntimeError(f"Missing Go1 actuator '{self.first_actuator}' in the scene model.")
 
         self._model = model
-        self._robot = Go1Robot(body)
-        self._actuator_start = actuator_start
-        self._policies = {
-            "joystick": OnnxPolicy(JOYSTICK_POLICY_PATH),
-            "handstand": OnnxPolicy(HANDSTAND_POLICY_PATH),
-            "getup": OnnxPolicy(GETUP_POLICY_PATH),
-            "footstand": OnnxPolicy(FOOTSTAND_POLICY_PATH),
-        }
-
-        self.mode = Mode.JOYSTICK
-        self.wait_to_stand: Mode | None = None
-        self.wait_steps_left = 0
-        self.mode_to_getup: Mode | None = None
-        self.mode_to_getup_wait_steps = 0
-        self.last_action = np.zeros_like(DEFAULT_JOINT_VALUES)
+        self._robot = self.robot_class(body)
+        self._actuator_slice = slice(actuator_start, actuator_start + DEFAULT_JOINT_VALUES.size)
+        self._policies = {mode: OnnxPolicy(path) for mode, path in self.policy_paths.items()}
+        self._allocate(1)
+
+    def _allocate(self, num_envs: int) -> None:
+        self.num_envs = num_envs
+        self.modes = np.full(num_envs, JOYSTICK, dtype=np.int8)
+        self.wait_to_stand = np.full(num_envs, NO_MODE, dtype=np.int8)
+        self.wait_steps_left = np.zeros(num_envs, dtype=np.int32)
+        self.mode_to_getup = np.full(num_envs, NO_MODE, dtype=np.int8)
+        self.mode_to_getup_wait_steps = np.zeros(num_envs, dtype=np.int32)
+        self.last_action = np.zeros((num_envs, DEFAULT_JOINT_VALUES.size), dtype=np.float32)
+        self._obs = np.zeros((num_envs, NUM_OBS), dtype=np.float32)
+        self._actions = np.zeros_like(self.last_action)
+        self._ctrl = np.zeros_like(self.last_action)
 
     @property
     def status_text(self) -> str:
-        if self.wait_to_stand is not None:
-            return f"{self.mode.value} -> {self.wait_to_stand.value} ({self.wait_steps_left})"
-        return self.mode.value
-
-    def reset(self) -> SceneData:
-        data = SceneData(self._model)
-        self.mode = Mode.JOYSTICK
-        self.wait_to_stand = None
-        self.wait_steps_left = 0
-        self.mode_to_getup = None
-        self.mode_to_getup_wait_steps = 0
-        self.last_action.fill(0.0)
-
-        self._robot.body.set_dof_pos(data, DEFAULT_JOINT_VALUES, False)
-        self._robot.set_actuator_ctrls(data, DEFAULT_JOINT_VALUES)
+        if self.num_envs > 1:
+            counts = np.bincount(self.modes, minlength=len(MODES))
+            return ", ".join(f"{mode.value}: {count}" for mode, count in zip(MODES, counts) if count)
+        mode = MODES[self.modes[0]]
+        if self.wait_to_stand[0] != NO_MODE:
+            return f"{mode.value} -> {MODES[self.wait_to_stand[0]].value} ({self.wait_steps_left[0]})"
+        return mode.value
+
+    def reset(self, num_envs: int | None = None) -> SceneData:
+        """Create scene data in the initial pose, batched when `num_envs` is given."""
+        data = SceneData(self._model) if num_envs is None else SceneData(self._model, batch=(num_envs,))
+        self._allocate(1 if num_envs is None else num_envs)
+        self._init_data(data)
+        return data
+
+    def reset_envs(self, data: SceneData, env_mask: np.ndarray) -> None:
+        """Reset the instances of batched data selected by the boolean `env_mask`, the others keep running."""
+        env_data = data[env_mask]
+        env_data.reset(self._model)
+        self._init_data(env_data)
+        self._enter_joystick(env_mask)
+        self.last_action[env_mask] = 0.0
+
+    def _init_data(self, data: SceneData) -> None:
+        default_joint_values = np.tile(DEFAULT_JOINT_VALUES, (*data.shape, 1))
+        self._robot.body.set_dof_pos(data, default_joint_values, False)
+        self._robot.set_actuator_ctrls(data, default_joint_values)
 
         seesaw_joint = self._model.get_joint("seesaw_joint")
         if seesaw_joint is not None:
-            seesaw_joint.set_dof_pos(data, [0.1645])
+            seesaw_joint.set_dof_pos(data, np.full((*data.shape, 1), 0.1645, dtype=np.float32))
 
         for actuator_name, ctrl in DISTURBING_DEVICE_CTRLS.items():
             actuator = self._model.get_actuator(actuator_name)
             if actuator is not None:
-                actuator.set_ctrl(data, ctrl)
+                actuator.set_ctrl(data, np.full(data.shape, ctrl, dtype=np.float32))
 
-        return data
-
-    def handle_mode_request(self, request: str) -> None:
+    def handle_mode_request(self, request: str, env_mask: np.ndarray | None = None) -> None:
+        """Apply a keyboard mode request to every instance, or to the instances of `env_mask`."""
         old_status = self.status_text
-
-        if request == "handstand":
-            if self.wait_to_stand is None:
-                if self.mode is Mode.JOYSTICK:
-                    self._begin_wait_to_stand(Mode.HANDSTAND)
-                elif self.mode in (Mode.HANDSTAND, Mode.FOOTSTAND):
-                    self._enter_getup(origin_mode=self.mode, manual=True)
-                elif self.mode is Mode.GETUP:
-                    self._enter_joystick()
-        elif request == "footstand":
-            if self.wait_to_stand is None:
-                if self.mode is Mode.JOYSTICK:
-                    self._begin_wait_to_stand(Mode.FOOTSTAND)
-                elif self.mode in (Mode.HANDSTAND, Mode.FOOTSTAND):
-                    self._enter_getup(origin_mode=self.mode, manual=True)
-                elif self.mode is Mode.GETUP:
-                    self._enter_joystick()
+        selected = np.ones(self.num_envs, dtype=bool) if env_mask is None else np.asarray(env_mask).reshape(-1)
+        modes = self.modes.copy()
+        standing = (modes == HANDSTAND) | (modes == FOOTSTAND)
+
+        if request in ("handstand", "footstand"):
+            idle = selected & (self.wait_to_stand == NO_MODE)
+            self._begin_wait_to_stand(idle & (modes == JOYSTICK), HANDSTAND if request == "handstand" else FOOTSTAND)
+            self._enter_getup(idle & standing, origin=modes, manual=True)
+            self._enter_joystick(idle & (modes == GETUP))
         elif request == "recovery":
-            if self.mode is Mode.GETUP:
-                self._enter_joystick()
-            else:
-                origin_mode = self.mode if self.mode in (Mode.HANDSTAND, Mode.FOOTSTAND) else None
-                self._enter_getup(origin_mode=origin_mode, manual=origin_mode is not None)
+            getup = selected & (modes == GETUP)
+            self._enter_joystick(getup)
+            self._enter_getup(selected & ~getup, origin=np.where(standing, modes, NO_MODE), manual=standing)
 
         if self.status_text != old_status:
             print(f"Mode: {self.status_text}")
 
     def step(self, data: SceneData, command: np.ndarray) -> str | None:
-        old_status = self.status_text
-        camera_name = self._update_transitions(data)
-        if self.status_text != old_status:
-            print(f"Mode: {self.status_text}")
-
-        observation = self._compute_observation(data, command)
-        action = self._policies[self._active_policy_name()].run(observation)
-        self._apply_action(data, action)
-        return camera_name
-
-    def _begin_wait_to_stand(self, target_mode: Mode) -> None:
-        self.wait_to_stand = target_mode
-        self.wait_steps_left = WAITING_TIME
-        self.mode_to_getup = None
-        self.mode_to_getup_wait_steps = 0
-
-    def _enter_joystick(self) -> None:
-        self.mode = Mode.JOYSTICK
-        self.wait_to_stand = None
-        self.wait_steps_left = 0
-        self.mode_to_getup = None
-        self.mode_to_getup_wait_steps = 0
-
-    def _enter_getup(self, origin_mode: Mode | None, manual: bool) -> None:
-        self.mode = Mode.GETUP
-        self.wait_to_stand = None
-        self.wait_steps_left = 0
-
-        if manual and origin_mode in (Mode.HANDSTAND, Mode.FOOTSTAND):
-            self.mode_to_getup = origin_mode
-            self.mode_to_getup_wait_steps = MANUAL_GETUP_PRE_ROLL
-        else:
-            self.mode_to_getup = None
-            self.mode_to_getup_wait_steps = 0
-
-    def _active_policy_name(self) -> str:
-        if self.mode is Mode.HANDSTAND:
-            return "handstand"
-        if self.mode is Mode.GETUP:
-            return "getup"
-        if self.mode is Mode.FOOTSTAND:
-            return "footstand"
-        return "joystick"
-
-    def _update_transitions(self, data: SceneData) -> str | None:
-        if self.mode is Mode.GETUP and self._can_exit_getup(data):
-            self._enter_joystick()
-            return "back"
-
-        if self.mode is not Mode.GETUP and self._should_enter_getup(data):
-            self._enter_getup(origin_mode=None, manual=False)
-            return None
-
-        if self.wait_to_stand is not None:
-            self.wait_steps_left = max(self.wait_steps_left - 1, 0)
-            if self._can_switch_to_stand(data) or self.wait_steps_left == 0:
-                self.mode = self.wait_to_stand
-                self.wait_to_stand = None
-                self.wait_steps_left = 0
-            return "side"
-
-        return None
-
-    def _compute_observation(self, data: SceneData, command: np.ndarray) -> np.ndarray:
-        joint_pos = self._robot.dof_pos(data)
-        joint_vel = self._robot.dof_vel(data)
-        joint_offset = joint_pos - DEFAULT_JOINT_VALUES
-
-        if self.mode is Mode.GETUP:
-            obs = np.concatenate(
-                [
-                    self._robot.gyro(data),
-                    self._robot.gravity(data),
-                    joint_offset,
-                    joint_vel,
-                    self.last_action,
-                ]
-            )
-            return obs.astype(np.float32)
-
-        obs_parts = [
-            self._robot.local_linear_vel(data),
-            self._robot.gyro(data),
-            self._robot.gravity(data),
-            joint_offset,
-            joint_vel,
-            self.last_action,
-        ]
-
-        if self.mode is Mode.JOYSTICK:
-            cmd = np.zeros(3, dtype=np.float32) if self.wait_to_stand is not None else self._scale_command(command)
-            obs_parts.append(cmd)
-
-        return np.concatenate(obs_parts).astype(np.float32)
-
-    def _scale_command(self, command: np.ndarray) -> np.ndarray:
-        scaled = np.asarray(command, dtype=np.float32).copy()
-        scaled[:2] *= COMMAND_LIN_VEL_SCALE
-        scaled[2] *= COMMAND_ANG_VEL_SCALE
-        return scaled
-
-    def _apply_action(self, data: SceneData, action: np.ndarray) -> None:
-        self.last_action = np.asarray(action, dtype=np.float32).copy()
-
-        if self.mode is Mode.GETUP:
-            if self.mode_to_getup is not None and self.mode_to_getup_wait_steps > 0:
-                ctrl = HANDSTAND_TO_GETUP if self.mode_to_getup is Mode.HANDSTAND else FOOTSTAND_TO_GETUP
-                self.mode_to_getup_wait_steps -= 1
-                if self.mode_to_getup_wait_steps == 0:
-                    self.mode_to_getup = None
-            else:
-                ctrl = self.last_action * ACTION_SCALE + self._robot.dof_pos(data)
-        elif self.mode in (Mode.HANDSTAND, Mode.FOOTSTAND):
-            current_ctrl = self._model.get_actuator_ctrls(data)[
-                self._actuator_start : self._actuator_start + len(self.last_action)
-            ]
-            ctrl = self.last_action * ACTION_SCALE + current_ctrl
-        else:
-            ctrl = self.last_action * ACTION_SCALE + DEFAULT_JOINT_VALUES
+        """Run one control step of every instance.
 
-        self._robot.set_actuator_ctrls(data, np.asarray(ctrl, dtype=np.float32))
+        Args:
+            data: Scene simulation data, single or batched
+            command: Raw command [x, y, yaw], shape (3,) or (num_envs, 3)
 
-    def _upright_alignment(self, data: SceneData) -> float:
-        rotation = np.asarray(self._robot.body.get_rotation_mat(data), dtype=np.float32)
-        return float(np.dot(rotation[:, 2], np.array([0.0, 0.0, 1.0], dtype=np.float32)))
+        Returns:
+            The camera to switch to for single-instance data, None for batched data.
+        """
+        num_envs = int(np.prod(data.shape))
+        if num_envs != self.num_envs:
+            self._allocate(num_envs)
 
-    def _can_exit_getup(self, data: SceneData) -> bool:
-        diff_sum = float(np.abs(self._robot.dof_pos(data) - DEFAULT_JOINT_VALUES).sum())
-        return diff_sum < 2.0 and self._upright_alignment(data) > 0.85
+        # one query reads the whole robot state, flattened to (num_envs, dim)
+        state = self._robot.state(data)
+        dof_pos = state.dof_pos.reshape(num_envs, -1)
+        dof_vel = state.dof_vel.reshape(num_envs, -1)
+        up_z = up_axis_z(state.base_quat).reshape(num_envs)
 
-    def _should_enter_getup(self, data: SceneData) -> bool:
-        threshold = -0.6 if self.mode in (Mode.HANDSTAND, Mode.FOOTSTAND) else 0.3
-        return self._upright_alignment(data) < threshold
+        old_status = self.status_text
+        cameras = self._update_transitions(dof_pos, dof_vel, up_z)
+        if num_envs == 1 and self.status_text != old_status:
+            print(f"Mode: {self.status_text}")
 
-    def _can_switch_to_stand(self, data: SceneData) -> bool:
-        dof_vel = self._robot.dof_vel(data)
-        return float(np.dot(dof_vel, dof_vel)) < CAN_SWITCH_TO_STAND_THRESHOLD
+        self._fill_observation(state, dof_pos, dof_vel, command)
+        for mode, policy in self._policies.items():
+            env_ids = np.flatnonzero(self.modes == mode)
+            if len(env_ids) > 0:
+                self._actions[env_ids] = policy.run(self._obs[env_ids, OBS_SLICES[mode]])
+        self._apply_action(data, dof_pos, self._actions)
+        return CAMERA_NAMES[cameras[0]] if data.shape == () else None
+
+    def _begin_wait_to_stand(self, mask: np.ndarray, target_mode: int) -> None:
+        self.wait_to_stand[mask] = target_mode
+        self.wait_steps_left[mask] = WAITING_TIME
+        self.mode_to_getup[mask] = NO_MODE
+        self.mode_to_getup_wait_steps[mask] = 0
+
+    def _enter_joystick(self, mask: np.ndarray) -> None:
+        self.modes[mask] = JOYSTICK
+        self.wait_to_stand[mask] = NO_MODE
+        self.wait_steps_left[mask] = 0
+        self.mode_to_getup[mask] = NO_MODE
+        self.mode_to_getup_wait_steps[mask] = 0
+
+    def _enter_getup(self, mask: np.ndarray, origin, manual) -> None:
+        self.modes[mask] = GETUP
+        self.wait_to_stand[mask] = NO_MODE
+        self.wait_steps_left[mask] = 0
+
+        # a manual exit from a stand replays a fixed pre-roll pose before the getup policy
+        pre_roll = mask & manual & ((origin == HANDSTAND) | (origin == FOOTSTAND))
+        self.mode_to_getup[mask] = np.where(pre_roll, origin, NO_MODE)[mask]
+        self.mode_to_getup_wait_steps[mask] = np.where(pre_roll, MANUAL_GETUP_PRE_ROLL, 0)[mask]
+
+    def _update_transitions(self, dof_pos: np.ndarray, dof_vel: np.ndarray, up_z: np.ndarray) -> np.ndarray:
+        """Update the modes of all instances, returning the camera code of each (0: keep, 1: back, 2: side)."""
+        getup = self.modes == GETUP
+        standing = (self.modes == HANDSTAND) | (self.modes == FOOTSTAND)
+        exit_getup = getup & (np.abs(dof_pos - DEFAULT_JOINT_VALUES).sum(axis=-1) < 2.0) & (up_z > 0.85)
+        enter_getup = ~getup & (up_z < np.where(standing, -0.6, 0.3))
+        waiting = ~exit_getup & ~enter_getup & (self.wait_to_stand != NO_MODE)
+
+        self._enter_joystick(exit_getup)
+        self._enter_getup(enter_getup, origin=NO_MODE, manual=False)
+
+        self.wait_steps_left[waiting] = np.maximum(self.wait_steps_left[waiting] - 1, 0)
+        can_switch = np.einsum("ij,ij->i", dof_vel, dof_vel) < CAN_SWITCH_TO_STAND_THRESHOLD
+        switch = waiting & (can_switch | (self.wait_steps_left == 0))
+        self.modes[switch] = self.wait_to_stand[switch]
+        self.wait_to_stand[switch] = NO_MODE
+        self.wait_steps_left[switch] = 0
+
+        cameras = np.zeros(self.num_envs, dtype=np.int8)
+        cameras[exit_getup] = 1
+        cameras[waiting] = 2
+        return cameras
+
+    def _fill_observation(self, state, dof_pos: np.ndarray, dof_vel: np.ndarray, command: np.ndarray) -> None:
+        obs = self._obs
+        obs[:, 0:3] = state.local_linear_vel.reshape(self.num_envs, 3)
+        obs[:, 3:6] = state.gyro.reshape(self.num_envs, 3)
+        obs[:, 6:9] = state.gravity.reshape(self.num_envs, 3)
+        np.subtract(dof_pos, DEFAULT_JOINT_VALUES, out=obs[:, 9:21])
+        obs[:, 21:33] = dof_vel
+        obs[:, 33:45] = self.last_action
+        np.multiply(np.reshape(command, (-1, 3)), COMMAND_SCALE, out=obs[:, 45:48])
+        # the joystick policy stands still while waiting to switch to a stand
+        obs[self.wait_to_stand != NO_MODE, 45:48] = 0.0
+
+    def _apply_action(self, data: SceneData, dof_pos: np.ndarray, actions: np.ndarray) -> None:
+        self.last_action[...] = actions
+        ctrl = self._ctrl
+        np.multiply(actions, ACTION_SCALE, out=ctrl)
+
+        joystick = self.modes == JOYSTICK
+        ctrl[joystick] += DEFAULT_JOINT_VALUES
+        standing = (self.modes == HANDSTAND) | (self.modes == FOOTSTAND)
+        if np.any(standing):
+            current_ctrl = self._model.get_actuator_ctrls(data).reshape(self.num_envs, -1)[:, self._actuator_slice]
+            ctrl[standing] += current_ctrl[standing]
+
+        getup = self.modes == GETUP
+        pre_roll = getup & (self.mode_to_getup != NO_MODE) & (self.mode_to_getup_wait_steps > 0)
+        ctrl[getup & ~pre_roll] += dof_pos[getup & ~pre_roll]
+        if np.any(pre_roll):
+            from_handstand = (self.mode_to_getup == HANDSTAND)[pre_roll, None]
+            ctrl[pre_roll] = np.where(from_handstand, HANDSTAND_TO_GETUP, FOOTSTAND_TO_GETUP)
+            self.mode_to_getup_wait_steps[pre_roll] -= 1
+            self.mode_to_getup[pre_roll & (self.mode_to_getup_wait_steps == 0)] = NO_MODE
+
+        self._robot.set_actuator_ctrls(data, ctrl.reshape(*data.shape, -1))
 
 
 def read_keyboard_command(input_state) -> np.ndarray:
@@ -353,16 +351,29 @@ def print_controls() -> None:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Go1 multi-task demo")
+    parser.add_argument(
+        "--num-envs",
+        type=int,
+        default=1,
+        help="Number of robots simulated on one batched SceneData, mode requests apply to all (default: 1)",
+    )
+    args = parser.parse_args()
+    num_envs = args.num_envs if args.num_envs > 1 else None
+
     model = load_model(MODEL_PATH)
     policy = Go1MultiTaskPolicy(model)
-    data = policy.reset()
+    data = policy.reset(num_envs)
 
     phys_dt = model.options.timestep
     n_ctrl = max(1, round(CONTROL_DT / phys_dt))
     n_render = max(1, round((1.0 / RENDER_FPS) / phys_dt))
 
     with RenderApp() as render:
-        render.launch(model)
+        if num_envs is None:
+            render.launch(model)
+        else:
+            render.launch(model, batch=num_envs, render_offset=grid_offsets(num_envs, spacing=4.0))
 
         camera_cycle = [
             None,
@@ -416,7 +427,7 @@ def main() -> None:
             command = read_keyboard_command(render.input)
 
             if queued_reset:
-                data = policy.reset()
+                data = policy.reset(num_envs)
                 step_count = 0
                 queued_mode_request = None
                 queued_camera_delta = 0
@@ -14,8 +14,9 @@
 # ==============================================================================
 
 from .controller import BaseController, KeyboardCommandAdapter, OnnxController
-from .policy import G1LocomotionPolicy, G1Policy12Dof, Go1LocomotionPolicy, Go2LocomotionPolicy
-from .robot import G1Robot, G1Robot12Dof, Go1Robot, Go2Robot
+from .layout import grid_offsets
+from .policy import G1LocomotionPolicy, G1Policy12Dof, Go1LocomotionPolicy, Go2LocomotionPolicy, LocomotionPolicy
+from .robot import G1Robot, G1Robot12Dof, Go1Robot, Go2Robot, RobotState
 from .terrain_scan_visualizer import TerrainScanVisualizer
 
 __all__ = [
@@ -27,8 +28,11 @@ __all__ = [
     "Go1LocomotionPolicy",
     "Go2Robot",
     "Go2LocomotionPolicy",  # Now includes integrated ONNX inference
+    "LocomotionPolicy",
+    "RobotState",
     "BaseController",
     "OnnxController",  # Kept for backward compatibility
     "KeyboardCommandAdapter",
     "TerrainScanVisualizer",
+    "grid_offsets",
 ]
@@ -16,7 +16,8 @@
 from abc import ABC, abstractmethod
 
 import numpy as np
-import onnxruntime as ort
+
+from legged_gym.utils.onnx_session import get_session
 
 
 class BaseController(ABC):
@@ -33,7 +34,8 @@ class OnnxController(BaseController):
 
     Note:
         This controller loads an ONNX model and uses it to compute actions
-        from observations. It uses CPU execution provider by default.
+        from observations. It uses CPU execution provider by default, the session
+        is shared with the other controllers loading the same model.
     """
 
     def __init__(self, onnx_model_path: str):
@@ -42,7 +44,7 @@ class OnnxController(BaseController):
         Args:
             onnx_model_path: Path to the ONNX model file
         """
-        self._policy = ort.InferenceSession(onnx_model_path, providers=["CPUExecutionProvider"])
+        self._policy = get_session(onnx_model_path, intra_op_num_threads=1, inter_op_num_threads=1)
         self._input_name = self._policy.get_inputs()[0].name
         self._output_name = self._policy.get_outputs()[0].name
 
@@ -0,0 +1,22 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+
+
+def grid_offsets(num_envs: int, spacing: float = 2.0) -> list[list[float]]:
+    """Lay the rendered instances of a batched SceneData out on a square grid, `spacing` meters apart."""
+    num_cols = math.ceil(math.sqrt(num_envs))
+    return [[-(i // num_cols) * spacing, (i % num_cols) * spacing, 0.0] for i in range(num_envs)]
@@ -13,369 +13,266 @@
 # limitations under the License.
 # ==============================================================================
 
-from typing import TYPE_CHECKING
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Union
 
 import numpy as np
-import onnxruntime as ort
-from scipy.spatial.transform import Rotation
 
+from legged_gym.utils.onnx_session import get_session
+from legged_gym.utils.rotation import up_axis_z
 from motrixsim import SceneData
 
 if TYPE_CHECKING:
-    from utils.robot import G1Robot, G1Robot12Dof, Go1Robot, Go2Robot
+    from utils.robot import G1Robot, G1Robot12Dof, Go1Robot, Go2Robot, RobotBase, RobotState
 
 
-class Go2LocomotionPolicy:
-    """Go2 robot locomotion control policy (with integrated ONNX inference).
+class LocomotionPolicy:
+    """Batched locomotion policy core (with integrated ONNX inference).
 
     Note:
-        Integrates observation computation, ONNX model inference, action application,
-        and fall detection. Initialized directly via ONNX model file path.
+        Shared by the robot policies below. It works on a ``SceneData`` of any batch shape:
+        single-instance data gives 1D observations / actions and a bool fall flag, batched
+        data of shape ``(N,)`` gives ``(N, dim)`` arrays and an ``(N,)`` fall mask.
 
-        Policy-specific configuration:
-        - default_angles: Default joint positions
-        - action_scale: Action scaling factor
-        - last_action: Last applied action
+        Per step, the observations of all N instances are written into a persistent float32
+        ``(N, obs_dim)`` buffer, evaluated with one ONNX call, and the ``(N, num_actuators)``
+        ctrls are written with one ``set_actuator_ctrls``.
+
+        Subclasses define ``onnx_path``, ``obs_dim`` and implement ``fill_observation``.
     """
 
-    # Default joint positions (12D: FL, FR, RL, RR legs, 3 joints per leg)
-    _DEFAULT_ANGLES = np.array([0.1, 0.9, -1.8, -0.1, 0.9, -1.8, 0.1, 0.9, -1.8, -0.1, 0.9, -1.8])
-    onnx_path = "examples/assets/go2/go2_policy.onnx"
+    onnx_path: str
+    obs_dim: int
+    # the robot is fallen when the z component of its base up-axis is below this threshold
+    fall_threshold = 0.3
 
-    def __init__(
-        self,
-        robot: "Go2Robot",
-        action_scale: float = 0.5,
-        lin_vel_scale: float = 1.0,
-        ang_vel_scale: float = 1.5,
-    ):
-        """Initialize locomotion control policy (with ONNX inference).
+    def __init__(self, robot: "RobotBase", default_angles: np.ndarray, action_scale: float, command_scale: np.ndarray):
+        """Initialize the policy core.
 
         Args:
-            robot: Go2 robot state accessor
-            default_angles: Default joint positions (12D), uses built-in defaults if None
-            action_scale: Action scaling factor, default 0.5
-            lin_vel_scale: Linear velocity scaling factor, default 2.0
-            ang_vel_scale: Angular velocity scaling factor, default 3.0
+            robot: Robot state accessor
+            default_angles: Default joint positions, one per actuator
+            action_scale: Action scaling factor
+            command_scale: Scaling of the raw command [x, y, yaw]
         """
         self._robot = robot
-
-        # Use provided default_angles or built-in defaults
-        self.default_angles = self._DEFAULT_ANGLES.copy()
+        self.default_angles = np.asarray(default_angles, dtype=np.float32).copy()
         self.action_scale = action_scale
-        self.lin_vel_scale = lin_vel_scale
-        self.ang_vel_scale = ang_vel_scale
-        self.last_action = np.zeros_like(self.default_angles, dtype=np.float32)
+        self._command_scale = np.asarray(command_scale, dtype=np.float32)
+        self._batch_shape = None
+        self._allocate(())
 
-        # Initialize ONNX inference session
-        self._policy_session = ort.InferenceSession(Go2LocomotionPolicy.onnx_path, providers=["CPUExecutionProvider"])
+        self._policy_session = get_session(type(self).onnx_path)
         self._input_name = self._policy_session.get_inputs()[0].name
         self._output_name = self._policy_session.get_outputs()[0].name
+        # models exported with a fixed batch of 1 are evaluated instance by instance
+        self._fixed_batch = self._policy_session.get_inputs()[0].shape[0] == 1
+
+    def _allocate(self, batch_shape: tuple) -> None:
+        """(Re)allocate the per-instance buffers for data of the given batch shape."""
+        self._batch_shape = batch_shape
+        num_actions = self.default_angles.size
+        self._obs = np.zeros((*batch_shape, self.obs_dim), dtype=np.float32)
+        self._ctrl = np.zeros((*batch_shape, num_actions), dtype=np.float32)
+        self.last_action = np.zeros((*batch_shape, num_actions), dtype=np.float32)
+
+    def _ensure_batch(self, data: SceneData) -> None:
+        if data.shape != self._batch_shape:
+            self._allocate(data.shape)
 
     def scale_command(self, raw_command: np.ndarray) -> np.ndarray:
-        """Apply velocity scaling to raw keyboard commands.
+        """Apply velocity scaling to raw commands.
 
         Args:
-            raw_command: Raw command vector [x, y, yaw], value range [-1, 1]
+            raw_command: Raw command vector [x, y, yaw], shape (3,) or (N, 3)
 
         Returns:
             Scaled command vector [x_vel, y_vel, yaw_vel]
         """
-        scales = np.array([self.lin_vel_scale, self.lin_vel_scale, self.ang_vel_scale])
-        return raw_command * scales
+        return raw_command * self._command_scale
 
-    def get_observation(self, data: SceneData, command: np.ndarray) -> np.ndarray:
-        """Compute the observation vector.
+    def fill_observation(self, obs: np.ndarray, state: "RobotState", command: np.ndarray) -> None:
+        """Write the observations of all instances into ``obs`` of shape (*data.shape, obs_dim)."""
+        raise NotImplementedError
 
-        Note:
-            Observation vector composition (48D):
-            - [0:3] local_linear_vel
-            - [3:6] gyro
-            - [6:9] gravity
-            - [9:21] dof_pos - default_angles
-            - [21:33] dof_vel
-            - [33:45] last_action
-            - [45:48] command
+    def get_observation(self, data: SceneData, command: np.ndarray) -> np.ndarray:
+        """Compute the observation vectors.
 
         Args:
             data: Scene simulation data
-            command: Command vector [x_vel, y_vel, yaw_vel]
+            command: Scaled command vector [x_vel, y_vel, yaw_vel], shape (3,) or (N, 3)
 
         Returns:
-            48D observation vector
+            Observations of shape (*data.shape, obs_dim). The buffer is reused by the next call.
         """
-        # Get state from robot
-        lin_vel = self._robot.local_linear_vel(data)
-        gyro = self._robot.gyro(data)
-        gravity = self._robot.gravity(data)
-        dof_pos = self._robot.dof_pos(data)
-        dof_vel = self._robot.dof_vel(data)
-
-        # Combine observation vector
-        obs = np.hstack(
-            [
-                lin_vel,
-                gyro,
-                gravity,
-                dof_pos - self.default_angles,
-                dof_vel,
-                self.last_action,
-                command,
-            ]
-        )
-        return obs.astype(np.float32)
+        self._ensure_batch(data)
+        # One query reads the whole robot state, also used by the fall check of `step`
+        self._state = self._robot.state(data)
+        self.fill_observation(self._obs, self._state, command)
+        return self._obs
 
     def compute_action(self, observation: np.ndarray) -> np.ndarray:
-        """Compute action from observation vector (ONNX inference).
+        """Compute actions from observations (one ONNX inference for the whole batch).
 
         Args:
-            observation: Observation vector (48D)
+            observation: Observations of shape (obs_dim,) or (N, obs_dim)
 
         Returns:
-            12D action vector
+            Actions of shape (num_actuators,) or (N, num_actuators)
         """
-        outputs = self._policy_session.run([self._output_name], {self._input_name: observation.reshape(1, -1)})
-        return outputs[0][0]
-
-    def step(self, data: SceneData, command: np.ndarray) -> bool:
+        batch = observation.reshape(-1, observation.shape[-1])
+        if self._fixed_batch and batch.shape[0] > 1:
+            actions = np.concatenate(
+                [self._policy_session.run([self._output_name], {self._input_name: row[None]})[0] for row in batch]
+            )
+        else:
+            actions = self._policy_session.run([self._output_name], {self._input_name: batch})[0]
+        return actions.reshape(*observation.shape[:-1], actions.shape[-1])
+
+    def step(self, data: SceneData, command: np.ndarray) -> Union[bool, np.ndarray]:
         """Execute one control step: observe -> infer -> apply.
 
-        Note:
-            Convenience method that encapsulates the complete control flow:
-            1. Compute observation vector
-            2. ONNX model inference to get action
-            3. Apply action to actuators
-
         Args:
             data: Scene simulation data
-            command: Command vector [x_vel, y_vel, yaw_vel]
+            command: Raw command vector [x, y, yaw], shape (3,) or (N, 3)
 
         Returns:
-            True if robot has fallen, False otherwise
+            Whether the robot has fallen, an (N,) mask for batched data
         """
-        command = self.scale_command(command)
-        obs = self.get_observation(data, command)
-        action = self.compute_action(obs)
+        obs = self.get_observation(data, self.scale_command(command))
+        self.act(data, self.compute_action(obs))
+        self.advance()
+        return self._is_fallen(self._state.base_quat)
+
+    def act(self, data: SceneData, action: np.ndarray) -> None:
+        """Use a freshly inferred action, by default applied to the actuators right away."""
         self.apply_action(data, action)
-        return self.is_fallen(data)
+
+    def advance(self) -> None:
+        """Advance the policy clock (e.g. the gait phase) by one control tick."""
 
     def apply_action(self, data: SceneData, action: np.ndarray) -> None:
-        """Apply action to actuators.
+        """Apply actions to actuators.
 
         Note:
             Control signal calculation: action * action_scale + default_angle
 
         Args:
             data: Scene simulation data
-            action: 12D action vector
+            action: Actions of shape (*data.shape, num_actuators)
         """
+        self._ensure_batch(data)
+        np.multiply(action, self.action_scale, out=self._ctrl)
+        self._ctrl += self.default_angles
+        self._robot.set_actuator_ctrls(data, self._ctrl)
+        self.last_action[...] = action
 
-        ctrl = action * self.action_scale + self.default_angles
-        self._robot.set_actuator_ctrls(data, ctrl)
-        self.last_action = action.copy()
-
-    def is_fallen(self, data: SceneData) -> bool:
+    def is_fallen(self, data: SceneData) -> Union[bool, np.ndarray]:
         """Detect whether the robot has fallen.
 
         Note:
-            Determined by base pose: when the dot product of the base z-axis
-            and world z-axis is less than threshold (0.3), the robot is
-            considered fallen.
+            Determined by base pose: when the z component of the base z-axis in world frame
+            (the dot product with the world z-axis) is less than ``fall_threshold``, the robot
+            is considered fallen.
 
         Args:
             data: Scene simulation data
 
         Returns:
-            True if fallen, False otherwise
+            True if fallen, an (N,) mask for batched data
         """
-        pose = self._robot.base_pose(data)
-        rotation = Rotation.from_quat(pose[3:7])
-        rotated_z_axis = rotation.apply(np.array([0.0, 0.0, 1.0]))
+        return self._is_fallen(self._robot.base_pose(data)[..., 3:7])
 
-        thr = 0.3
-        dot = np.dot(rotated_z_axis, np.array([0.0, 0.0, 1.0]))
-        return dot < thr
+    def _is_fallen(self, quat: np.ndarray) -> Union[bool, np.ndarray]:
+        return up_axis_z(quat) < self.fall_threshold
 
 
-class Go1LocomotionPolicy:
-    """Go1 robot locomotion control policy (with integrated ONNX inference).
+class Go2LocomotionPolicy(LocomotionPolicy):
+    """Go2 robot locomotion control policy (with integrated ONNX inference).
 
     Note:
-        Integrates observation computation, ONNX model inference, action application,
-        and fall detection. Initialized directly via ONNX model file path.
-
         Policy-specific configuration:
-        - default_angles: Default joint positions (same as Go2)
-        - action_scale: Action scaling factor (0.5)
-        - onnx_model_path: ONNX model file path
+        - default_angles: Default joint positions
+        - action_scale: Action scaling factor
         - last_action: Last applied action
 
-        Key differences from Go2:
-        - lin_vel_scale: 0.7 (vs 2.0 for Go2)
-        - ang_vel_scale: 1.5 (vs 3.0 for Go2)
+        Observation vector composition (48D):
+        - [0:3] local_linear_vel
+        - [3:6] gyro
+        - [6:9] gravity
+        - [9:21] dof_pos - default_angles
+        - [21:33] dof_vel
+        - [33:45] last_action
+        - [45:48] command
     """
 
     # Default joint positions (12D: FL, FR, RL, RR legs, 3 joints per leg)
     _DEFAULT_ANGLES = np.array([0.1, 0.9, -1.8, -0.1, 0.9, -1.8, 0.1, 0.9, -1.8, -0.1, 0.9, -1.8])
-    onnx_path = "examples/assets/go1/policies/go1_policy.onnx"
+    onnx_path = "examples/assets/go2/go2_policy.onnx"
+    obs_dim = 48
 
     def __init__(
         self,
-        robot: "Go1Robot",
+        robot: "Go2Robot",
         action_scale: float = 0.5,
-        lin_vel_scale: float = 0.7,
+        lin_vel_scale: float = 1.0,
         ang_vel_scale: float = 1.5,
     ):
         """Initialize locomotion control policy (with ONNX inference).
 
         Args:
-            robot: Go1 robot state accessor
-            onnx_model_path: ONNX model file path
-            default_angles: Default joint positions (12D), uses built-in defaults if None
+            robot: Go2 robot state accessor
             action_scale: Action scaling factor, default 0.5
-            lin_vel_scale: Linear velocity scaling factor, default 0.7
+            lin_vel_scale: Linear velocity scaling factor, default 1.0
             ang_vel_scale: Angular velocity scaling factor, default 1.5
         """
-        self._robot = robot
-
-        self.default_angles = self._DEFAULT_ANGLES.copy()
-
-        self.action_scale = action_scale
         self.lin_vel_scale = lin_vel_scale
         self.ang_vel_scale = ang_vel_scale
-        self.last_action = np.zeros_like(self.default_angles, dtype=np.float32)
-
-        # Initialize ONNX inference session
-        self._policy_session = ort.InferenceSession(Go1LocomotionPolicy.onnx_path, providers=["CPUExecutionProvider"])
-        self._input_name = self._policy_session.get_inputs()[0].name
-        self._output_name = self._policy_session.get_outputs()[0].name
-
-    def scale_command(self, raw_command: np.ndarray) -> np.ndarray:
-        """Apply velocity scaling to raw commands.
+        super().__init__(robot, self._DEFAULT_ANGLES, action_scale, [lin_vel_scale, lin_vel_scale, ang_vel_scale])
 
-        Args:
-            raw_command: Raw command vector [x, y, yaw], value range [-1, 1]
+    def fill_observation(self, obs: np.ndarray, state: "RobotState", command: np.ndarray) -> None:
+        obs[..., 0:3] = state.local_linear_vel
+        obs[..., 3:6] = state.gyro
+        obs[..., 6:9] = state.gravity
+        np.subtract(state.dof_pos, self.default_angles, out=obs[..., 9:21])
+        obs[..., 21:33] = state.dof_vel
+        obs[..., 33:45] = self.last_action
+        obs[..., 45:48] = command
 
-        Returns:
-            Scaled command vector [x_vel, y_vel, yaw_vel]
-        """
-        scales = np.array([self.lin_vel_scale, self.lin_vel_scale, self.ang_vel_scale])
-        return raw_command * scales
 
-    def get_observation(self, data: SceneData, command: np.ndarray) -> np.ndarray:
-        """Compute the observation vector.
-
-        Note:
-            Observation vector composition (48D):
-            - [0:3] local_linear_vel
-            - [3:6] gyro
-            - [6:9] gravity
-            - [9:21] dof_pos - default_angles
-            - [21:33] dof_vel
-            - [33:45] last_action
-            - [45:48] command
-
-        Args:
-            data: Scene simulation data
-            command: Command vector [x_vel, y_vel, yaw_vel]
-
-        Returns:
-            48D observation vector
-        """
-        # Get state from robot
-        lin_vel = self._robot.local_linear_vel(data)
-        gyro = self._robot.gyro(data)
-        gravity = self._robot.gravity(data)
-        dof_pos = self._robot.dof_pos(data)
-        dof_vel = self._robot.dof_vel(data)
-
-        # Combine observation vector
-        obs = np.hstack(
-            [
-                lin_vel,
-                gyro,
-                gravity,
-                dof_pos - self.default_angles,
-                dof_vel,
-                self.last_action,
-                command,
-            ]
-        )
-        return obs.astype(np.float32)
-
-    def compute_action(self, observation: np.ndarray) -> np.ndarray:
-        """Compute action from observation vector (ONNX inference).
-
-        Args:
-            observation: Observation vector (48D)
-
-        Returns:
-            12D action vector
-        """
-        outputs = self._policy_session.run([self._output_name], {self._input_name: observation.reshape(1, -1)})
-        return outputs[0][0]
-
-    def step(self, data: SceneData, command: np.ndarray) -> bool:
-        """Execute one control step: observe -> infer -> apply.
-
-        Note:
-            Convenience method that encapsulates the complete control flow:
-            1. Compute observation vector
-            2. ONNX model inference to get action
-            3. Apply action to actuators
-
-        Args:
-            data: Scene simulation data
-            command: Command vector [x_vel, y_vel, yaw_vel]
-
-        Returns:
-            True if robot has fallen, False otherwise
-        """
-        command = self.scale_command(command)
-        obs = self.get_observation(data, command)
-        action = self.compute_action(obs)
-        self.apply_action(data, action)
-        return self.is_fallen(data)
-
-    def apply_action(self, data: SceneData, action: np.ndarray) -> None:
-        """Apply action to actuators.
-
-        Note:
-            Control signal calculation: action * action_scale + default_angle
+class Go1LocomotionPolicy(Go2LocomotionPolicy):
+    """Go1 robot locomotion control policy (with integrated ONNX inference).
 
-        Args:
-            data: Scene simulation data
-            action: 12D action vector
-        """
+    Note:
+        Same observation layout and default joint positions as Go2.
 
-        ctrl = action * self.action_scale + self.default_angles
-        self._robot.set_actuator_ctrls(data, ctrl)
-        self.last_action = action.copy()
+        Key differences from Go2:
+        - lin_vel_scale: 0.7 (vs 1.0 for Go2)
+        - ang_vel_scale: 1.5
+    """
 
-    def is_fallen(self, data: SceneData) -> bool:
-        """Detect whether the robot has fallen.
+    onnx_path = "examples/assets/go1/policies/go1_policy.onnx"
 
-        Note:
-            Determined by base pose: when the dot product of the base z-axis
-            and world z-axis is less than threshold (0.3), the robot is
-            considered fallen.
+    def __init__(
+        self,
+        robot: "Go1Robot",
+        action_scale: float = 0.5,
+        lin_vel_scale: float = 0.7,
+        ang_vel_scale: float = 1.5,
+    ):
+        """Initialize locomotion control policy (with ONNX inference).
 
         Args:
-            data: Scene simulation data
-
-        Returns:
-            True if fallen, False otherwise
+            robot: Go1 robot state accessor
+            action_scale: Action scaling factor, default 0.5
+            lin_vel_scale: Linear velocity scaling factor, default 0.7
+            ang_vel_scale: Angular velocity scaling factor, default 1.5
         """
-        pose = self._robot.base_pose(data)
-        rotation = Rotation.from_quat(pose[3:7])
-        rotated_z_axis = rotation.apply(np.array([0.0, 0.0, 1.0]))
-
-        thr = 0.3
-        dot = np.dot(rotated_z_axis, np.array([0.0, 0.0, 1.0]))
-        return dot < thr
+        super().__init__(robot, action_scale, lin_vel_scale, ang_vel_scale)
 
 
-class G1Policy12Dof:
+class G1Policy12Dof(LocomotionPolicy):
     """12DoF G1 policy with ONNX inference and torque-level PD control."""
 
     _DEFAULT_ANGLES = np.array(
@@ -400,6 +297,7 @@ class G1Policy12Dof:
     _COMMAND_SCALE = np.array([2.0, 2.0, 0.25], dtype=np.float32)
 
     onnx_path = "examples/assets/g1/g1_12dof_policy.onnx"
+    obs_dim = 47
 
     def __init__(
         self,
@@ -410,139 +308,97 @@ class G1Policy12Dof:
         ctrl_dt: float = 0.02,
     ):
         """Initialize the 12DoF G1 playback policy."""
-        self._robot = robot
-        self.default_angles = self._DEFAULT_ANGLES.copy()
+        if robot.num_actuators != self._DEFAULT_ANGLES.size:
+            raise ValueError(f"legged-gym G1 expects 12 actuators, got {robot.num_actuators}")
         self.kps = self._KP.copy()
         self.kds = self._KD.copy()
-        self.action_scale = action_scale
         self.dof_vel_scale = dof_vel_scale
         self.torque_limit = torque_limit
         self.ctrl_dt = ctrl_dt
         self._period = 0.8
-        self._episode_step = 0
-        self.last_action = np.zeros_like(self.default_angles, dtype=np.float32)
+        super().__init__(robot, self._DEFAULT_ANGLES, action_scale, self._COMMAND_SCALE)
 
-        if robot.num_actuators != self.default_angles.size:
-            raise ValueError(f"legged-gym G1 expects 12 actuators, got {robot.num_actuators}")
+    def _allocate(self, batch_shape: tuple) -> None:
+        super()._allocate(batch_shape)
+        self._episode_step = np.zeros(batch_shape, dtype=np.int64)
+        self._torques = np.zeros_like(self._ctrl)
 
-        self._policy_session = ort.InferenceSession(G1Policy12Dof.onnx_path, providers=["CPUExecutionProvider"])
-        self._input_name = self._policy_session.get_inputs()[0].name
-        self._output_name = self._policy_session.get_outputs()[0].name
-
-    def reset(self) -> None:
-        """Reset policy-side recurrent state after an environment reset."""
-        self._episode_step = 0
-        self.last_action.fill(0.0)
-
-    def scale_command(self, raw_command: np.ndarray) -> np.ndarray:
-        """Apply the legged-gym G1 command scaling."""
-        return raw_command * self._COMMAND_SCALE
+    def reset(self, env_mask: np.ndarray = None) -> None:
+        """Reset policy-side recurrent state after an environment reset.
 
-    def get_phase(self) -> tuple[float, float]:
+        Args:
+            env_mask: Instances to reset for batched data, all of them when None
+        """
+        if env_mask is None:
+            self._episode_step[...] = 0
+            self.last_action.fill(0.0)
+        else:
+            self._episode_step[env_mask] = 0
+            self.last_action[env_mask] = 0.0
+
+    def get_phase(self) -> tuple[np.ndarray, np.ndarray]:
         """Get the legged-gym gait phase features."""
         phase = (self._episode_step * self.ctrl_dt) % self._period / self._period
         phase_angle = 2.0 * np.pi * phase
         return np.sin(phase_angle), np.cos(phase_angle)
 
-    def get_observation(self, data: SceneData, command: np.ndarray) -> np.ndarray:
-        """Compute the 47D observation vector used by the legged-gym G1 policy."""
-        dof_pos = self._robot.dof_pos(data)
-        dof_vel = self._robot.dof_vel(data)
+    def fill_observation(self, obs: np.ndarray, state: "RobotState", command: np.ndarray) -> None:
         sin_phase, cos_phase = self.get_phase()
-        obs = np.zeros(47, dtype=np.float32)
-        obs[0:3] = self._robot.gyro(data) * 0.25
-        obs[3:6] = self._robot.gravity(data)
-        obs[6:9] = command
-        obs[9:21] = dof_pos - self.default_angles
-        obs[21:33] = dof_vel * self.dof_vel_scale
-        obs[33:45] = self.last_action
-        obs[45] = sin_phase
-        obs[46] = cos_phase
-        return obs
-
-    def compute_action(self, observation: np.ndarray) -> np.ndarray:
-        """Compute a 12D action from the legged-gym ONNX policy."""
-        outputs = self._policy_session.run([self._output_name], {self._input_name: observation.reshape(1, -1)})
-        return outputs[0][0]
-
-    def step(self, data: SceneData, command: np.ndarray) -> bool:
-        """Update the policy action at the control rate."""
-        scaled_command = self.scale_command(command)
-        obs = self.get_observation(data, scaled_command)
-        self.last_action = self.compute_action(obs).astype(np.float32)
+        obs[..., 0:3] = state.gyro * 0.25
+        obs[..., 3:6] = state.gravity
+        obs[..., 6:9] = command
+        np.subtract(state.dof_pos, self.default_angles, out=obs[..., 9:21])
+        np.multiply(state.dof_vel, self.dof_vel_scale, out=obs[..., 21:33])
+        obs[..., 33:45] = self.last_action
+        obs[..., 45] = sin_phase
+        obs[..., 46] = cos_phase
+
+    def act(self, data: SceneData, action: np.ndarray) -> None:
+        """Store the action, applied through PD torques by ``pre_physics_step``."""
+        self.last_action[...] = action
+
+    def advance(self) -> None:
         self._episode_step += 1
-        return self.is_fallen(data)
 
     def pre_physics_step(self, data: SceneData) -> None:
         """Refresh PD torques before each physics step."""
-        dof_pos = self._robot.dof_pos(data)
-        dof_vel = self._robot.dof_vel(data)
-        target_pos = self.last_action * self.action_scale + self.default_angles
-        torques = self.kps * (target_pos - dof_pos) - self.kds * dof_vel
-        torques = np.clip(torques, -self.torque_limit, self.torque_limit)
-        self._robot.set_actuator_ctrls(data, torques.astype(np.float32))
-
-    def is_fallen(self, data: SceneData) -> bool:
-        """Detect whether the robot has fallen using the base up-vector."""
-        pose = self._robot.base_pose(data)
-        rotation = Rotation.from_quat(pose[3:7])
-        rotated_z_axis = rotation.apply(np.array([0.0, 0.0, 1.0]))
-        dot = np.dot(rotated_z_axis, np.array([0.0, 0.0, 1.0]))
-        return dot < 0.3
-
-
-class G1LocomotionPolicy:
+        self._ensure_batch(data)
+        state = self._robot.state(data)
+        torques = self._torques
+        np.multiply(self.last_action, self.action_scale, out=torques)
+        torques += self.default_angles
+        torques -= state.dof_pos
+        torques *= self.kps
+        torques -= self.kds * state.dof_vel
+        np.clip(torques, -self.torque_limit, self.torque_limit, out=torques)
+        self._robot.set_actuator_ctrls(data, torques)
+
+
+class G1LocomotionPolicy(LocomotionPolicy):
     """G1 robot locomotion control policy (with integrated ONNX inference).
 
     Note:
-        Integrates observation computation, ONNX model inference, action application,
-        and fall detection. Initialized directly via ONNX model file path.
-
         Policy-specific configuration:
-        - default_angles: Default joint positions (27D for G1)
+        - default_angles: Default joint positions (29D for G1)
         - action_scale: Action scaling factor (0.5)
-        - onnx_model_path: ONNX model file path
         - last_action: Last applied action
 
+        Observation vector composition (G1-specific):
+        - [0:3] local_linear_vel
+        - [3:6] gyro
+        - [6:9] gravity
+        - [9:12] command
+        - [12:41] dof_pos - default_angles (29D)
+        - [41:70] dof_vel (29D)
+        - [70:99] last_action (29D)
+        - [99:103] phase (4D: cos, sin of the two feet)
+
         Key differences from Go1/Go2:
-        - DoF: 27 (vs 12)
-        - lin_vel_scale: 1.0 (vs 0.7 for Go1, 2.0 for Go2)
-        - ang_vel_scale: 1.0 (vs 1.5 for Go1, 3.0 for Go2)
+        - DoF: 29 (vs 12)
+        - lin_vel_scale: 1.0 (vs 0.7 for Go1)
+        - ang_vel_scale: 1.0 (vs 1.5 for Go1/Go2)
     """
 
-    _DEFAULT_ANGLES = np.array(
-        [
-            -0.312,
-            0,
-            0,
-            0.669,
-            -0.363,
-            0,  # left leg
-            -0.312,
-            0,
-            0,
-            0.669,
-            -0.363,
-            0,  # right leg
-            0,
-            0,
-            0.073,  # waist
-            0.2,
-            0.2,
-            0,
-            0.6,
-            0,
-            0,
-            0,  # left arm
-            0.2,
-            -0.2,
-            0,
-            0.6,
-            0,
-            0,
-            0,  # right arm
-        ]
-    )
     onnx_path = "examples/assets/g1/g1_policy.onnx"
 
     def __init__(
@@ -557,153 +413,45 @@ class G1LocomotionPolicy:
 
         Args:
             robot: G1 robot state accessor
-            onnx_model_path: ONNX model file path
-            default_angles: Default joint positions (27D), uses built-in defaults if None
             action_scale: Action scaling factor, default 0.5
             lin_vel_scale: Linear velocity scaling factor, default 1.0
             ang_vel_scale: Angular velocity scaling factor, default 1.0
             ctrl_dt: Control timestep for phase updates, default 0.02
         """
-        self._robot = robot
-        self.default_angles = robot._DEFAULT_ANGLES.copy()
-        self.action_scale = action_scale
+        self.obs_dim = 12 + 3 * robot._DEFAULT_ANGLES.size + 4
         self.lin_vel_scale = lin_vel_scale
         self.ang_vel_scale = ang_vel_scale
-        self.last_action = np.zeros_like(self.default_angles, dtype=np.float32)
         self.ctrl_dt = ctrl_dt
-
-        # Initialize gait phase
-        self._phase = np.array([0.0, np.pi])
         self._gait_freq = 1.5
-
-        # Initialize ONNX inference session
-        self._policy_session = ort.InferenceSession(G1LocomotionPolicy.onnx_path, providers=["CPUExecutionProvider"])
-        self._input_name = self._policy_session.get_inputs()[0].name
-        self._output_name = self._policy_session.get_outputs()[0].name
-
-    def scale_command(self, raw_command: np.ndarray) -> np.ndarray:
-        """Apply velocity scaling to raw commands.
-
-        Args:
-            raw_command: Raw command vector [x, y, yaw], value range [-1, 1]
-
-        Returns:
-            Scaled command vector [x_vel, y_vel, yaw_vel]
-        """
-        scales = np.array([self.lin_vel_scale, self.lin_vel_scale, self.ang_vel_scale])
-        return raw_command * scales
-
-    def get_observation(self, data: SceneData, command: np.ndarray) -> np.ndarray:
-        """Compute the observation vector.
-
-        Note:
-            Observation vector composition (G1-specific):
-            - [0:3] local_linear_vel
-            - [3:6] gyro
-            - [6:9] gravity
-            - [9:12] command
-            - [12:39] dof_pos - default_angles (27D)
-            - [39:66] dof_vel (27D)
-            - [66:93] last_action (27D)
-            - [93:95] phase (2D: cos, sin)
-
-        Args:
-            data: Scene simulation data
-            command: Command vector [x_vel, y_vel, yaw_vel]
-
-        Returns:
-            Observation vector for policy input
-        """
-        # Get state from robot
-        lin_vel = self._robot.local_linear_vel(data)
-        gyro = self._robot.gyro(data)
-        gravity = self._robot.gravity(data)
-        dof_pos = self._robot.dof_pos(data)
-        dof_vel = self._robot.dof_vel(data)
-        phase = self.get_phase()
-
-        # Combine observation vector (structure matches G1 policy)
-        obs = np.hstack(
-            [
-                lin_vel,
-                gyro,
-                gravity,
-                command,
-                dof_pos - self.default_angles,
-                dof_vel,
-                self.last_action,
-                phase,
-            ]
-        )
-        return obs.astype(np.float32)
-
-    def compute_action(self, observation: np.ndarray) -> np.ndarray:
-        """Compute action from observation vector (ONNX inference).
-
-        Args:
-            observation: Observation vector
-
-        Returns:
-            Action vector (27D for G1)
-        """
-        outputs = self._policy_session.run([self._output_name], {self._input_name: observation.reshape(1, -1)})
-        return outputs[0][0]
-
-    def step(self, data: SceneData, command: np.ndarray) -> bool:
-        """Execute one control step: observe -> infer -> apply.
-
-        Note:
-            Convenience method that encapsulates the complete control flow:
-            1. Compute observation vector
-            2. ONNX model inference to get action
-            3. Apply action to actuators
-            4. Update gait phase
-
-        Args:
-            data: Scene simulation data
-            command: Command vector [x_vel, y_vel, yaw_vel]
-
-        Returns:
-            True if robot has fallen, False otherwise
-        """
-        # Scale command
-        scaled_command = self.scale_command(command)
-
-        # Get observation and compute action
-        obs = self.get_observation(data, scaled_command)
-        action = self.compute_action(obs)
-
-        # Apply action
-        self.apply_action(data, action)
-
-        # Update phase
+        super().__init__(robot, robot._DEFAULT_ANGLES, action_scale, [lin_vel_scale, lin_vel_scale, ang_vel_scale])
+
+    def _allocate(self, batch_shape: tuple) -> None:
+        super()._allocate(batch_shape)
+        # Initialize gait phase, one pair of feet per instance
+        self._phase = np.zeros((*batch_shape, 2))
+        self._phase[..., 1] = np.pi
+
+    def fill_observation(self, obs: np.ndarray, state: "RobotState", command: np.ndarray) -> None:
+        n = self.default_angles.size
+        obs[..., 0:3] = state.local_linear_vel
+        obs[..., 3:6] = state.gyro
+        obs[..., 6:9] = state.gravity
+        obs[..., 9:12] = command
+        np.subtract(state.dof_pos, self.default_angles, out=obs[..., 12 : 12 + n])
+        obs[..., 12 + n : 12 + 2 * n] = state.dof_vel
+        obs[..., 12 + 2 * n : 12 + 3 * n] = self.last_action
+        obs[..., 12 + 3 * n :] = self.get_phase()
+
+    def advance(self) -> None:
         self.update_phase(self.ctrl_dt)
 
-        # Check if fallen
-        return self.is_fallen(data)
-
-    def apply_action(self, data: SceneData, action: np.ndarray) -> None:
-        """Apply action to actuators.
-
-        Note:
-            Control signal calculation: action * action_scale + default_angle
-
-        Args:
-            data: Scene simulation data
-            action: Action vector (27D for G1)
-        """
-
-        ctrl = action * self.action_scale + self.default_angles
-        self._robot.set_actuator_ctrls(data, ctrl)
-        self.last_action = action.copy()
-
     def get_phase(self) -> np.ndarray:
         """Get the current gait phase.
 
         Returns:
-            2D phase vector [cos(phase), sin(phase)]
+            Phase vector [cos(phase), sin(phase)], shape (*batch, 4)
         """
-        return np.concatenate([np.cos(self._phase), np.sin(self._phase)])
+        return np.concatenate([np.cos(self._phase), np.sin(self._phase)], axis=-1)
 
     def update_phase(self, dt: float) -> None:
         """Update the gait phase.
@@ -715,24 +463,87 @@ class G1LocomotionPolicy:
         phase_tp1 = self._phase + phase_dt
         self._phase = np.fmod(phase_tp1 + np.pi, 2 * np.pi) - np.pi
 
-    def is_fallen(self, data: SceneData) -> bool:
-        """Detect whether the robot has fallen.
 
-        Note:
-            Determined by base pose: when the dot product of the base z-axis
-            and world z-axis is less than threshold (0.3), the robot is
-            considered fallen.
+class PipelinedPolicy:
+    """Locomotion policy whose ONNX inference overlaps the physics substeps.
+
+    Note:
+        At control tick k the observation is copied into one of ``latency + 1`` rotating
+        buffers and its inference is submitted to a worker thread. ONNX Runtime releases the
+        GIL while it runs, so the engine integrates the substeps before tick k + 1 meanwhile.
+        The action is applied at tick k + latency, which mirrors a deployment where the
+        inference runs asynchronously from the control loop; until the first action arrives
+        the previous actuator controls are kept.
+
+        Other attributes (e.g. ``pre_physics_step``) are forwarded to the wrapped policy.
+
+    Args:
+        policy: The wrapped locomotion policy
+        latency: Action latency in control ticks, at least 1
+    """
+
+    def __init__(self, policy: LocomotionPolicy, latency: int = 1):
+        if latency < 1:
+            raise ValueError(f"pipelined inference needs a latency of at least one tick, got {latency}")
+        self.policy = policy
+        self.latency = latency
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="policy-inference")
+        self._obs_buffers = None
+        self._slot = 0
+        self._pending = deque()
+
+    def __getattr__(self, name):
+        if name == "policy":
+            raise AttributeError(name)
+        return getattr(self.policy, name)
+
+    def step(self, data: SceneData, command: np.ndarray) -> Union[bool, np.ndarray]:
+        """Execute one control tick: apply the action now due, observe, and submit the next inference.
 
         Args:
             data: Scene simulation data
+            command: Raw command vector [x, y, yaw], shape (3,) or (N, 3)
 
         Returns:
-            True if fallen, False otherwise
+            Whether the robot has fallen, an (N,) mask for batched data
         """
-        pose = self._robot.base_pose(data)
-        rotation = Rotation.from_quat(pose[3:7])
-        rotated_z_axis = rotation.apply(np.array([0.0, 0.0, 1.0]))
+        policy = self.policy
+        if len(self._pending) == self.latency:
+            policy.act(data, self._pending.popleft().result())
+
+        obs = policy.get_observation(data, policy.scale_command(command))
+        if self._obs_buffers is None or self._obs_buffers.shape[1:] != obs.shape:
+            self._obs_buffers = np.zeros((self.latency + 1, *obs.shape), dtype=np.float32)
+        # the worker reads its own buffer while the next observations are written
+        buffer = self._obs_buffers[self._slot]
+        buffer[...] = obs
+        self._slot = (self._slot + 1) % len(self._obs_buffers)
+        self._pending.append(self._executor.submit(policy.compute_action, buffer))
+
+        policy.advance()
+        return policy._is_fallen(policy._state.base_quat)
 
-        thr = 0.3
-        dot = np.dot(rotated_z_axis, np.array([0.0, 0.0, 1.0]))
-        return dot < thr
+    def reset(self, env_mask: np.ndarray = None) -> None:
+        """Drop the in-flight actions of reset instances, and reset the policy state.
+
+        Args:
+            env_mask: Instances to reset for batched data, all of them when None
+        """
+        if env_mask is None:
+            for future in self._pending:
+                future.result()
+            self._pending.clear()
+        else:
+            # the in-flight actions of the reset instances drive them to the default pose
+            for future in self._pending:
+                future.result()[env_mask] = 0.0
+        if hasattr(self.policy, "reset"):
+            if env_mask is None:
+                self.policy.reset()
+            else:
+                self.policy.reset(env_mask)
+
+    def close(self) -> None:
+        """Wait for the in-flight inferences and stop the worker thread."""
+        self._executor.shutdown(wait=True)
+        self._pending.clear()
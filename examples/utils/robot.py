@@ -13,14 +13,48 @@
 # limitations under the License.
 # ==============================================================================
 
+from dataclasses import dataclass
 
 import numpy as np
 
 import motrixsim as mx
+from legged_gym.utils.rotation import projected_gravity
 from motrixsim import Body, SceneData
+from motrixsim.query import BodyDofPosition, BodyDofVelocity, LinkPosition, LinkRotation, SensorValues
+
+
+@dataclass
+class RobotState:
+    """Struct-of-arrays snapshot of the robot state, as read by :meth:`RobotBase.state`.
+
+    Note:
+        Every field has shape (*data.shape, dim). The arrays are views of a buffer reused by the
+        next ``state`` call on data of the same batch shape: copy them to keep them.
+
+    Attributes:
+        local_linear_vel: Linear velocity in the local coordinate system [vx, vy, vz]
+        gyro: Gyroscope angular velocity [wx, wy, wz]
+        dof_pos: Joint positions
+        dof_vel: Joint velocities
+        base_pos: World position of the base link [x, y, z]
+        base_quat: World orientation of the base link [qx, qy, qz, qw]
+        gravity: Gravity vector in the body coordinate system [gx, gy, gz]
+    """
+
+    local_linear_vel: np.ndarray
+    gyro: np.ndarray
+    dof_pos: np.ndarray
+    dof_vel: np.ndarray
+    base_pos: np.ndarray
+    base_quat: np.ndarray
+    gravity: np.ndarray
 
 
 class RobotBase:
+    # Names of the local linear velocity and gyroscope sensors of the robot
+    local_linvel_sensor = "local_linvel"
+    gyro_sensor = "gyro"
+
     def __init__(self, body: Body):
         """Init the robot
 
@@ -30,6 +64,19 @@ class RobotBase:
         self._body = body
         self._model = body.model
         self._base_link = body.base_link
+        # Sensor names, dof ranges and the base link are resolved once: a state read is then one
+        # gather of all the fields into a contiguous buffer, see `state`
+        self._state_plan = self._model.compile_query(
+            {
+                "local_linear_vel": SensorValues([self.local_linvel_sensor]),
+                "gyro": SensorValues([self.gyro_sensor]),
+                "dof_pos": BodyDofPosition(body.index, include_base=False),
+                "dof_vel": BodyDofVelocity(body.index, include_base=False),
+                "base_pos": LinkPosition([self._base_link.index]),
+                "base_quat": LinkRotation([self._base_link.index]),
+            }
+        )
+        self._state_programs = {}
 
     @property
     def body(self) -> Body:
@@ -51,6 +98,55 @@ class RobotBase:
         """The number of actuators of the robot."""
         return self._body.num_actuators
 
+    def state(self, data: SceneData) -> RobotState:
+        """Read the sensors, joint state and base pose of the robot in one query.
+
+        Args:
+            data: The SceneData of the simulation
+
+        Returns:
+            The state snapshot, see :class:`RobotState`
+        """
+        cached = self._state_programs.get(data.shape)
+        if cached is None:
+            program = self._state_plan.allocate(data)
+            state = RobotState(
+                local_linear_vel=program["local_linear_vel"],
+                gyro=program["gyro"],
+                dof_pos=program["dof_pos"],
+                dof_vel=program["dof_vel"],
+                base_pos=program["base_pos"][..., 0, :],
+                base_quat=program["base_quat"][..., 0, :],
+                gravity=np.zeros((*data.shape, 3), dtype=np.float32),
+            )
+            cached = self._state_programs[data.shape] = (program, state)
+        program, state = cached
+        program.execute(data)
+        projected_gravity(state.base_quat, out=state.gravity)
+        return state
+
+    def local_linear_vel(self, data: SceneData) -> np.ndarray:
+        """Get the linear velocity in the local coordinate system.
+
+        Args:
+            data: Scene simulation data
+
+        Returns:
+            3D linear velocity vector [vx, vy, vz]
+        """
+        return self._model.get_sensor_value(self.local_linvel_sensor, data)
+
+    def gyro(self, data: SceneData) -> np.ndarray:
+        """Get the gyroscope angular velocity.
+
+        Args:
+            data: Scene simulation data
+
+        Returns:
+            3D angular velocity vector [wx, wy, wz]
+        """
+        return self._model.get_sensor_value(self.gyro_sensor, data)
+
     def dof_pos(self, data: SceneData) -> np.ndarray:
         """Get the joint positions.
 
@@ -100,10 +196,9 @@ class RobotBase:
             data: Scene simulation data
 
         Returns:
-            3D gravity vector [gx, gy, gz]
+            3D gravity vector [gx, gy, gz], shape (3,) or (N, 3) for batched data
         """
-        rot = self._body.get_rotation_mat(data)
-        return rot.T @ np.array([0.0, 0.0, -1.0])
+        return projected_gravity(self.base_pose(data)[..., 3:7])
 
 
 class Go2Robot(RobotBase):
@@ -128,30 +223,6 @@ class Go2Robot(RobotBase):
         """
         super().__init__(body)
 
-    # === Sensor Data ===
-
-    def local_linear_vel(self, data: SceneData) -> np.ndarray:
-        """Get the linear velocity in the local coordinate system.
-
-        Args:
-            data: Scene simulation data
-
-        Returns:
-            3D linear velocity vector [vx, vy, vz]
-        """
-        return self._model.get_sensor_value("local_linvel", data)
-
-    def gyro(self, data: SceneData) -> np.ndarray:
-        """Get the gyroscope angular velocity.
-
-        Args:
-            data: Scene simulation data
-
-        Returns:
-            3D angular velocity vector [wx, wy, wz]
-        """
-        return self._model.get_sensor_value("gyro", data)
-
 
 class Go1Robot(RobotBase):
     """Go1 robot state accessor.
@@ -176,30 +247,6 @@ class Go1Robot(RobotBase):
         """
         super().__init__(body)
 
-    # === Sensor Data ===
-
-    def local_linear_vel(self, data: SceneData) -> np.ndarray:
-        """Get the linear velocity in the local coordinate system.
-
-        Args:
-            data: Scene simulation data
-
-        Returns:
-            3D linear velocity vector [vx, vy, vz]
-        """
-        return self._model.get_sensor_value("local_linvel", data)
-
-    def gyro(self, data: SceneData) -> np.ndarray:
-        """Get the gyroscope angular velocity.
-
-        Args:
-            data: Scene simulation data
-
-        Returns:
-            3D angular velocity vector [wx, wy, wz]
-        """
-        return self._model.get_sensor_value("gyro", data)
-
 
 class G1Robot(RobotBase):
     """G1 robot state accessor.
@@ -226,6 +273,8 @@ class G1Robot(RobotBase):
 
     mjcf_path = "examples/assets/g1/g1.xml"
     base_link_name = "pelvis"
+    local_linvel_sensor = "local_linvel_pelvis"
+    gyro_sensor = "gyro_pelvis"
 
     # Default joint positions (29D: legs(12) + waist(3) + arms(14))
     _DEFAULT_ANGLES = np.array(
@@ -275,30 +324,6 @@ class G1Robot(RobotBase):
         """
         super().__init__(body)
 
-    # === Sensor Data ===
-
-    def local_linear_vel(self, data: SceneData) -> np.ndarray:
-        """Get the linear velocity in the local coordinate system.
-
-        Args:
-            data: Scene simulation data
-
-        Returns:
-            3D linear velocity vector [vx, vy, vz]
-        """
-        return self._model.get_sensor_value("local_linvel_pelvis", data)
-
-    def gyro(self, data: SceneData) -> np.ndarray:
-        """Get the gyroscope angular velocity.
-
-        Args:
-            data: Scene simulation data
-
-        Returns:
-            3D angular velocity vector [wx, wy, wz]
-        """
-        return self._model.get_sensor_value("gyro_pelvis", data)
-
 
 class G1Robot12Dof(RobotBase):
     """12DoF G1 robot state accessor."""
@@ -309,11 +334,3 @@ class G1Robot12Dof(RobotBase):
     def __init__(self, body: Body):
         """Initialize the 12DoF G1 robot state accessor."""
         super().__init__(body)
-
-    def local_linear_vel(self, data: SceneData) -> np.ndarray:
-        """Get the linear velocity in the local coordinate system."""
-        return self._model.get_sensor_value("local_linvel", data)
-
-    def gyro(self, data: SceneData) -> np.ndarray:
-        """Get the gyroscope angular velocity."""
-        return self._model.get_sensor_value("gyro", data)
@@ -13,26 +13,34 @@
 # limitations under the License.
 # ==============================================================================
 
-import numpy as np
-from scipy.spatial.transform import Rotation
 
 from legged_gym.envs.base.legged_robot import Legged_Robot
+from legged_gym.utils.observation import ObsTerm
+from legged_gym.utils.rotation import projected_gravity
 
 
 class BH_env(Legged_Robot):
-    def compute_obs(self):
-        obs = np.zeros(self.config.env.num_observations, dtype=np.float16)
-        diff = self.dof_pos - self.default_angles
-        obs[:3] = self.commands
-        # obs[3:6] = self.linear_vel * self.config.normalization.obs_scales.lin_vel
-        obs[3:6] = self.gyro * self.config.normalization.obs_scales.ang_vel
-        obs[6:9] = self.gravity
-        obs[9:21] = diff
-        obs[21:33] = self.dof_vel
-        obs[33:45] = self.actions
+    def obs_terms(self):
+        num_actions = self.config.env.num_actions
+        return [
+            ObsTerm("commands", 3),
+            ObsTerm("gyro", 3, scale=self.config.normalization.obs_scales.ang_vel),
+            ObsTerm("gravity", 3),
+            ObsTerm("dof_pos", num_actions, offset=self.default_angles),
+            ObsTerm("dof_vel", num_actions),
+            ObsTerm("actions", num_actions),
+        ]
 
-        # self.last_actions = self.actions
-        return obs
+    def compute_obs(self):
+        return self.obs_layout.fill(
+            self.obs,
+            commands=self.commands,
+            gyro=self.gyro,
+            gravity=self.gravity,
+            dof_pos=self.dof_pos,
+            dof_vel=self.dof_vel,
+            actions=self.actions,
+        )
 
     def post_physics_step(self):
         """check terminations, compute observations and rewards
@@ -46,8 +54,7 @@ class BH_env(Legged_Robot):
         # self.linear_vel = self.get_sensor_value(self.config.sensor.local_linvel)
         self.gyro = self.get_sensor_value(self.config.sensor.gyro)
         self.pose = self.body.get_pose(self.data)
-        inv_rotation = Rotation.from_quat(self.pose[3:7]).inv()  ###xyzw
-        self.gravity = inv_rotation.apply(np.array([0.0, 0.0, -1.0]))
+        self.gravity = projected_gravity(self.pose[3:7])  ###xyzw
         self._sync_dof_data()
         self._post_physics_step_callback()
         self.check_termination()
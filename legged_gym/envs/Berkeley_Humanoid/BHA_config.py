@@ -56,6 +56,8 @@ class BHACfg(LeggedRobotCfg):  # policy_biped_50hz
         body_name = "base"
 
     class sensor(LeggedRobotCfg.sensor):
+        # the BHL model has no local linear velocity sensor
+        local_linvel = None
         gyro = "imu_gyro"
 
     class commands(LeggedRobotCfg.commands):
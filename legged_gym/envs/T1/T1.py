@@ -16,49 +16,59 @@
 import numpy as np
 
 from legged_gym.envs.base.legged_robot import Legged_Robot
-from motrixsim import step
+from legged_gym.envs.base.vec_legged_robot import VecLeggedRobot
+from legged_gym.utils.observation import ObsTerm
 
 
 class T1_env(Legged_Robot):
-    def __init__(self, Cfg):
-        super().__init__(Cfg)
-        self.command_scale = np.array(
-            (
-                self.config.normalization.obs_scales.lin_vel,
-                self.config.normalization.obs_scales.lin_vel,
-                self.config.normalization.obs_scales.ang_vel,
-            ),
-            dtype=np.float16,
-        )
-
-    def buffer_init(self):
-        super().buffer_init()
+    def reset_buffers(self):
+        super().reset_buffers()
         self.gait_frequency = 1.5
         self.gait_process = 0
 
     def step(self, actions):
-        # Apply actuations, simulate, call self.post_physics_step()
-        # Sync render objects from physic world
-        # print(self.dof_pos)
-        self.actions = actions
-        # print(self.actions)
-        for _ in range(self.config.control.decimation):
-            self.gait_process = np.fmod(self.gait_process + self.config.sim.dt * self.gait_frequency, 1.0)
-            self.torques = self._compute_torques(self.actions)
-            self.data.actuator_ctrls = self.torques
-            step(self.model, self.data)
-        self.post_physics_step()
-        self.obs = self.compute_obs()
+        # the gait clock advances by `decimation` sim dt per policy step
+        dt = self.config.sim.dt * self.config.control.decimation
+        self.gait_process = np.fmod(self.gait_process + dt * self.gait_frequency, 1.0)
+        super().step(actions)
+
+    def obs_terms(self):
+        obs_scales = self.config.normalization.obs_scales
+        command_scale = np.array((obs_scales.lin_vel, obs_scales.lin_vel, obs_scales.ang_vel), dtype=np.float32)
+        return [
+            ObsTerm("gravity", 3, scale=self.config.normalization.gravity),
+            ObsTerm("gyro", 3, scale=obs_scales.lin_vel),
+            ObsTerm("commands", 3, scale=command_scale),
+            ObsTerm("gait_cos", 1),
+            ObsTerm("gait_sin", 1),
+            ObsTerm("dof_pos", 12, scale=obs_scales.dof_pos, offset=self.default_angles),
+            ObsTerm("dof_vel", 12, scale=obs_scales.dof_vel),
+            ObsTerm("actions", 12),
+        ]
 
     def compute_obs(self):
-        obs = np.zeros(self.config.env.num_observations, dtype=np.float16)
-        diff = self.dof_pos - self.default_angles
-        obs[:3] = self.gravity * self.config.normalization.gravity
-        obs[3:6] = self.gyro * self.config.normalization.obs_scales.lin_vel
-        obs[6:9] = self.commands * self.command_scale
-        obs[9] = np.cos(2 * np.pi * self.gait_process) * (self.gait_frequency > 1.0e-8)
-        obs[10] = np.sin(2 * np.pi * self.gait_process) * (self.gait_frequency > 1.0e-8)
-        obs[11:23] = diff * self.config.normalization.obs_scales.dof_pos
-        obs[23:35] = self.dof_vel * self.config.normalization.obs_scales.dof_vel
-        obs[35:47] = self.actions
-        return obs
+        walking = self.gait_frequency > 1.0e-8
+        return self.obs_layout.fill(
+            self.obs,
+            gravity=self.gravity,
+            gyro=self.gyro,
+            commands=self.commands,
+            gait_cos=np.cos(2 * np.pi * self.gait_process) * walking,
+            gait_sin=np.sin(2 * np.pi * self.gait_process) * walking,
+            dof_pos=self.dof_pos,
+            dof_vel=self.dof_vel,
+            actions=self.actions,
+        )
+
+
+class T1_vec_env(VecLeggedRobot, T1_env):
+    """Batched T1_env, with one gait clock per env."""
+
+    def reset_buffers(self):
+        super().reset_buffers()
+        self.gait_frequency = 1.5
+        self.gait_process = np.zeros(self.num_envs, dtype=np.float32)
+
+    def reset_idx(self, env_mask):
+        super().reset_idx(env_mask)
+        self.gait_process[env_mask] = 0.0
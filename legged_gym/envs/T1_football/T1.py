@@ -14,9 +14,10 @@
 # ==============================================================================
 
 import numpy as np
-from scipy.spatial.transform import Rotation
 
 from legged_gym.envs.base.legged_robot import Legged_Robot
+from legged_gym.utils.observation import ObservationLayout, ObsTerm
+from legged_gym.utils.rotation import quat_rotate
 from motrixsim import step
 from motrixsim.render import Color
 
@@ -31,14 +32,6 @@ class T1_Football_env(Legged_Robot):
     def __init__(self, Cfg):
         self.T = 0
         super().__init__(Cfg)
-        self.command_scale = np.array(
-            (
-                self.config.normalization.obs_scales.lin_vel,
-                self.config.normalization.obs_scales.lin_vel,
-                self.config.normalization.obs_scales.ang_vel,
-            ),
-            dtype=np.float16,
-        )
 
         data = np.load(self.config.reference.ref)
         self.frame_id = self.start
@@ -50,15 +43,8 @@ class T1_Football_env(Legged_Robot):
         self.ref_root_rot_quat = data["root_rot_quat"]
         self.ref_angular_v = data["angular_v"]
 
-        # set gizmos by api
-        self._render.gizmos.joint_size = 1.5
-        self._render.gizmos.line_width = 5
-        self._render.gizmos.collider_color = Color.rgb(0.5, 1, 0.5)
-        self._render.gizmos.joint_color = Color.rgb(1, 1, 0.5)
-
-    def buffer_init(self):
-        super().buffer_init()
-        self.fb = self.body.floatingbase
+    def reset_buffers(self):
+        super().reset_buffers()
         self.gait_frequency = 0
         self.gait_process = 0
 
@@ -102,11 +88,10 @@ class T1_Football_env(Legged_Robot):
 
     def draw_predict_goal(self):
         start = self.fb.get_dof_pos(self.data)
-        R = Rotation.from_quat(start[3:7])
-        goal = R.apply(np.array([0.4666305, -0.10587938, 0.0409625]))
+        goal = quat_rotate(start[3:7], np.array([0.4666305, -0.10587938, 0.0409625]))
         goal = start[:3] + goal
         goal[2] = 0
-        self._render.gizmos.draw_sphere(0.1, goal, color=Color.rgb(1, 0, 0))
+        self.get_render().gizmos.draw_sphere(0.1, goal, color=Color.rgb(1, 0, 0))
 
     def compute_obs(self):
         if self.T > 0:
@@ -118,40 +103,82 @@ class T1_Football_env(Legged_Robot):
         else:
             return self._compute_walk_obs()
 
+    def obs_terms(self):
+        # walk policy, observes the 12 leg joints only
+        obs_scales = self.config.normalization.obs_scales
+        command_scale = np.array((obs_scales.lin_vel, obs_scales.lin_vel, obs_scales.ang_vel), dtype=np.float32)
+        return [
+            ObsTerm("gravity", 3, scale=self.config.normalization.gravity),
+            ObsTerm("gyro", 3, scale=obs_scales.lin_vel),
+            ObsTerm("commands", 3, scale=command_scale),
+            ObsTerm("gait_cos", 1),
+            ObsTerm("gait_sin", 1),
+            ObsTerm("dof_pos", 12, scale=obs_scales.dof_pos, offset=self.default_angles[11:]),
+            ObsTerm("dof_vel", 12, scale=obs_scales.dof_vel),
+            ObsTerm("actions", 12),
+        ]
+
+    def kick_obs_terms(self):
+        # kick policy, tracks the reference motion with all the joints
+        num_actions = self.config.env.num_actions
+        return [
+            ObsTerm("lin_vel", 3, scale=2.0),
+            ObsTerm("gyro", 3, scale=0.25),
+            ObsTerm("gravity", 3),
+            ObsTerm("phase", 1),
+            ObsTerm("ref_root_vel", 3, scale=2.0),
+            ObsTerm("ref_dof_vel", num_actions, scale=0.05),
+            ObsTerm("ref_link17_pos", 3),
+            ObsTerm("ref_link23_pos", 3),
+            ObsTerm("ref_dof_pos", num_actions, offset=self.default_angles),
+            ObsTerm("dof_pos", num_actions, offset=self.default_angles),
+            ObsTerm("dof_vel", num_actions, scale=0.05),
+            ObsTerm("actions", num_actions),
+        ]
+
+    def _init_obs_buffer(self):
+        super()._init_obs_buffer()
+        # one persistent buffer per policy, self.obs points to the one of the current state
+        self.walk_obs = self.obs
+        self.kick_obs_layout = ObservationLayout(self.kick_obs_terms())
+        self.kick_obs = self.kick_obs_layout.allocate(self.data.shape)
+
     def _compute_walk_obs(self):
-        obs = np.zeros(self.config.env.num_observations, dtype=np.float16)
-        diff = self.dof_pos - self.default_angles
-        obs[:3] = self.gravity * self.config.normalization.gravity
-        obs[3:6] = self.gyro * self.config.normalization.obs_scales.lin_vel
-        obs[6:9] = self.commands * self.command_scale
-        obs[9] = np.cos(2 * np.pi * self.gait_process) * (self.gait_frequency > 1.0e-8)
-        obs[10] = np.sin(2 * np.pi * self.gait_process) * (self.gait_frequency > 1.0e-8)
-        obs[11:23] = diff[11:] * self.config.normalization.obs_scales.dof_pos
-        obs[23:35] = self.dof_vel[11:] * self.config.normalization.obs_scales.dof_vel
-        obs[35:47] = self.actions
-        return obs
+        walking = self.gait_frequency > 1.0e-8
+        return self.obs_layout.fill(
+            self.walk_obs,
+            gravity=self.gravity,
+            gyro=self.gyro,
+            commands=self.commands,
+            gait_cos=np.cos(2 * np.pi * self.gait_process) * walking,
+            gait_sin=np.sin(2 * np.pi * self.gait_process) * walking,
+            dof_pos=self.dof_pos[11:],
+            dof_vel=self.dof_vel[11:],
+            actions=self.actions,
+        )
 
     def _compute_kick_obs(self):
         self.phase = np.float32(self.frame_id / self.num_frames)
-        obs = np.zeros(134, dtype=np.float16)
-        diff = self.dof_pos - self.default_angles
-        ref_diff = self.ref_joint_dof[self.frame_id] - self.default_angles
-        obs[:3] = self.linear_vel * 2
-        obs[3:6] = self.gyro * 0.25
-        obs[6:9] = self.gravity
-        obs[9] = self.phase
-        obs[10:13] = self.ref_root_vel[self.frame_id] * 2
-        obs[13:36] = self.ref_dof_vel[self.frame_id] * 0.05
-        obs[36:39] = self.ref_link_pos[self.frame_id, 17, :]
-        obs[39:42] = self.ref_link_pos[self.frame_id, 23, :]
-        obs[42:65] = ref_diff * 1
-        obs[65:88] = diff * 1
-        obs[88:111] = self.dof_vel * 0.05
-        obs[111:134] = self.actions
+        frame = self.frame_id
+        self.kick_obs_layout.fill(
+            self.kick_obs,
+            lin_vel=self.linear_vel,
+            gyro=self.gyro,
+            gravity=self.gravity,
+            phase=self.phase,
+            ref_root_vel=self.ref_root_vel[frame],
+            ref_dof_vel=self.ref_dof_vel[frame],
+            ref_link17_pos=self.ref_link_pos[frame, 17, :],
+            ref_link23_pos=self.ref_link_pos[frame, 23, :],
+            ref_dof_pos=self.ref_joint_dof[frame],
+            dof_pos=self.dof_pos,
+            dof_vel=self.dof_vel,
+            actions=self.actions,
+        )
         if self.frame_id < self.num_frames - 1:
             self.frame_id = self.frame_id + 1
 
-        return obs
+        return self.kick_obs
 
     def _compute_torques(self, actions):
         # Compute torques from actions.
@@ -162,7 +189,7 @@ class T1_Football_env(Legged_Robot):
             action = actions * action_scale
         else:
             action_scale = self.config.control.action_scale
-            action = np.zeros(self.config.env.num_actions, dtype=np.float16)
+            action = np.zeros(self.config.env.num_actions, dtype=np.float32)
             action[11:] = actions * action_scale
 
         control_type = self.config.control.control_type
@@ -15,11 +15,11 @@
 
 from legged_gym.envs.Berkeley_Humanoid.BH import BH_env
 from legged_gym.envs.Berkeley_Humanoid.BH_config import BHCfg
-from legged_gym.envs.Berkeley_Humanoid.BHA import BHA_env
+from legged_gym.envs.Berkeley_Humanoid.BHA import BHA_env, BHA_vec_env
 from legged_gym.envs.Berkeley_Humanoid.BHA_config import BHACfg
-from legged_gym.envs.go1.go1 import Go1_env
+from legged_gym.envs.go1.go1 import Go1_env, Go1_vec_env
 from legged_gym.envs.go1.go1_config import Go1Cfg
-from legged_gym.envs.T1.T1 import T1_env
+from legged_gym.envs.T1.T1 import T1_env, T1_vec_env
 from legged_gym.envs.T1.T1_config import T1Cfg
 from legged_gym.envs.T1_football.T1 import T1_Football_env
 from legged_gym.envs.T1_football.T1_config import T1FootballCfg
@@ -14,13 +14,17 @@
 # ==============================================================================
 
 import random
+from dataclasses import dataclass
+from typing import Union
 
 import numpy as np
-from scipy.spatial.transform import Rotation
 
 from legged_gym.addr import LEGGED_GYM_ENVS_DIR
 from legged_gym.envs.base.legged_robot_config import LeggedRobotCfg
-from motrixsim import SceneData, load_model, step
+from legged_gym.utils.observation import ObservationLayout, ObsTerm
+from legged_gym.utils.rotation import projected_gravity, up_axis_z, yaw_from_quat
+from legged_gym.utils.terrain import HeightMap, sample_hfield_heights
+from motrixsim import GeomHField, PositionActuator, SceneData, TerrainScanner, load_model, step
 from motrixsim.render import Color, RenderApp
 
 
@@ -28,60 +32,57 @@ def load_hfield_with_header(file_path):
     """
     读取包含行列头信息的高度场二进制文件
     :param file_path: 文件路径
-    :return: (nrows, ncols, height_data)
+    :return: (nrows, ncols, height_data)，height_data 为只读的内存映射，同一文件只映射一次
     """
-    with open(file_path, "rb") as f:
-        # 读取前8字节（nrows和ncols，每个占4字节）
-        nrows = np.fromfile(f, dtype=np.int32, count=1)[0]
-        ncols = np.fromfile(f, dtype=np.int32, count=1)[0]
+    heightmap = HeightMap.load(file_path)
+    return heightmap.nrows, heightmap.ncols, heightmap.height_data
 
-        # 读取剩余的高度数据（float32格式）
-        height_data = np.fromfile(f, dtype=np.float32).reshape(nrows, ncols)
 
-    return nrows, ncols, height_data
+def _as_index(indices):
+    """A slice when the indices are contiguous, so that indexing returns a view, else an index array."""
+    indices = np.asarray(indices, dtype=np.int64)
+    if len(indices) > 0 and np.array_equal(indices, np.arange(indices[0], indices[0] + len(indices))):
+        return slice(int(indices[0]), int(indices[0]) + len(indices))
+    return indices
+
+
+@dataclass(frozen=True)
+class ControlTable:
+    """
+    Per-actuator PD control table, compiled once per config and model.
+
+    Attributes:
+        dof_pos_index (slice | np.ndarray): Index of the target joint of every actuator into `data.dof_pos`.
+        dof_vel_index (slice | np.ndarray): Index of the target joint of every actuator into `data.dof_vel`.
+        kps (np.ndarray): Stiffness, float32 of shape (num_actions,).
+        kds (np.ndarray): Damping, float32 of shape (num_actions,).
+        default_angles (np.ndarray): Joint angles of the zero action, float32 of shape (num_actions,).
+        torque_limits (np.ndarray): Symmetric torque limits, float32 of shape (num_actions,).
+    """
+
+    dof_pos_index: Union[slice, np.ndarray]
+    dof_vel_index: Union[slice, np.ndarray]
+    kps: np.ndarray
+    kds: np.ndarray
+    default_angles: np.ndarray
+    torque_limits: np.ndarray
 
 
 class Legged_Robot:
+    # control tables shared by all envs built from the same config and model,
+    # key = (env class, config, actuator names)
+    _control_tables_cache = {}
+
     def __init__(self, Cfg: LeggedRobotCfg):
         self.config = Cfg
+        # The renderer is created on first use, see get_render()
+        self._render = None
         self.env_init()
-        self.render_init()
-        self.render_draw_init()
+        # the height scan is part of the observation layout, so it is set up before the buffers
+        if self.config.terrain.measure_heights:
+            self._init_height_points()
         self.buffer_init()
         self.reset()
-        if self.config.terrain.measure_heights:
-            self.nrows, self.ncols, self.height_data = load_hfield_with_header(
-                LEGGED_GYM_ENVS_DIR + self.config.terrain.hfield_path
-            )
-            min = np.min(self.height_data)
-            max = np.max(self.height_data)
-            self.height_data = self.height_data - min
-            self.height_data = self.height_data / (max - min)
-            measured_points_x = [
-                -0.8,
-                -0.7,
-                -0.6,
-                -0.5,
-                -0.4,
-                -0.3,
-                -0.2,
-                -0.1,
-                0.0,
-                0.1,
-                0.2,
-                0.3,
-                0.4,
-                0.5,
-                0.6,
-                0.7,
-                0.8,
-            ]  # 1mx1.6m rectangle (without center line)
-            measured_points_y = [-0.5, -0.4, -0.3, -0.2, -0.1, 0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
-            gridx, gridy = np.meshgrid(measured_points_x, measured_points_y)
-            num_height_points = len(measured_points_x) * len(measured_points_y)
-            self.points = np.zeros([num_height_points, 3])
-            self.points[:, 0] = gridx.flatten()
-            self.points[:, 1] = gridy.flatten()
 
     def render_draw_init(self):
         self._render.gizmos.draw_collider = False
@@ -92,71 +93,165 @@ class Legged_Robot:
         self._render.gizmos.collider_color = Color.rgb(0.5, 1, 0.5)
         self._render.gizmos.joint_color = Color.rgb(1, 1, 0.5)
 
+    @property
+    def headless(self):
+        return self.config.viewer.render_mode is None
+
     def get_render(self):
+        """Return the RenderApp, launching it on the first call."""
+        if self.headless:
+            raise RuntimeError("rendering is disabled, config.viewer.render_mode is None")
+        if self._render is None:
+            self.render_init()
+            self.render_draw_init()
         return self._render
 
     def buffer_init(self):
         # init buffers
-        unified_stiffness = False
-        unified_damping = False
+        self._init_control_tables()
         self.commands = np.zeros(3, dtype=np.float32)
-        self.obs = np.zeros(self.config.env.num_observations, dtype=np.float32)
-        self.kps = np.ones(self.config.env.num_actions, dtype=np.float32)
-        self.kds = np.ones(self.config.env.num_actions, dtype=np.float32)
+        self._init_obs_buffer()
         self.e_angle = np.ones(self.config.env.num_actions)
+        self.max_episode_length = self.config.sim.max_episode_length
+        self.torques = np.zeros((*self.data.shape, self.config.env.num_actions), dtype=np.float32)
+        self._damping_torques = np.zeros_like(self.torques)
+        if self.config.control.fused_substeps:
+            self._init_fused_control()
+        self.dt = self.config.sim.dt * self.config.control.decimation
+
+        self.body = self.model.get_body(self.config.asset.body_name)
+        self.fb = self.body.floatingbase
+        self.joints = []
+        names = self.model.joint_names
+        for i in range(len(names)):
+            self.joints.append(self.model.get_joint(names[i]))
+        self.reset_buffers()
+
+    def obs_terms(self):
+        """
+        Declare the observation layout as a list of ObsTerm, filled in place by compute_obs().
+        :return: list of ObsTerm, or None when compute_obs() builds its own observation array
+        """
+        return None
+
+    def _init_obs_buffer(self):
+        """Allocate the persistent float32 observation buffer, shape (*data.shape, num_obs)."""
+        terms = self.obs_terms()
+        if terms is None:
+            self.obs_layout = None
+            self.obs = np.zeros((*self.data.shape, self.config.env.num_observations), dtype=np.float32)
+            return
+        if self.config.terrain.measure_heights:
+            # compute_height_obs() is already scaled
+            terms = [*terms, ObsTerm("heights", self.num_height_points)]
+        self.obs_layout = ObservationLayout(terms)
+        self.obs = self.obs_layout.allocate(self.data.shape)
+
+    def reset_buffers(self):
+        """Reset the per-episode buffers, the control tables are kept."""
+        self.reset_buf = False
+        self.episode_length_buf = 0
+        self.common_step_counter = 0
+        self.last_actions = np.zeros(self.config.env.num_actions, dtype=np.float32)
+        self.commands = np.zeros(3, dtype=np.float32)
+        self.commands = self.resample_commands()
+        self._sync_dof_data()
+
+    def _init_control_tables(self):
+        """Look up the cached control table, compiling it on first use."""
+        key = (type(self), self.config, tuple(self.model.actuator_names))
+        table = Legged_Robot._control_tables_cache.get(key)
+        if table is None:
+            table = self._compile_control_table(*self._build_control_tables())
+            Legged_Robot._control_tables_cache[key] = table
+        self.control_table = table
+        self.kps, self.kds, self.default_angles = table.kps, table.kds, table.default_angles
+        self.torque_limits = table.torque_limits
+        self._neg_torque_limits = -table.torque_limits
+
+    def _init_fused_control(self):
+        """Load the kp / kd tables into the engine position actuators, see `control.fused_substeps`."""
+        for actuator_index, actuator in enumerate(self.model.actuators):
+            if not isinstance(actuator, PositionActuator):
+                raise ValueError(
+                    f"control.fused_substeps requires position actuators, '{actuator.name}' is a"
+                    f" '{actuator.typ}' actuator. The bundled robot scenes use motor actuators, set"
+                    " asset.file to a scene with position actuators or disable control.fused_substeps"
+                )
+            actuator.set_kp_override(self.data, np.full(self.data.shape, self.kps[actuator_index], dtype=np.float32))
+            actuator.set_damping_override(
+                self.data, np.full(self.data.shape, self.kds[actuator_index], dtype=np.float32)
+            )
+        self.targets = np.zeros((*self.data.shape, self.config.env.num_actions), dtype=np.float32)
+
+    def _compile_control_table(self, kps, kds, default_angles):
+        """
+        Resolve the dof indices of the actuated joints and freeze the per-actuator vectors.
+        :return: ControlTable
+        """
+        num_actions = self.config.env.num_actions
+        joints = [self.model.get_joint(actuator.target_name) for actuator in self.model.actuators]
+        vectors = [
+            np.array(np.broadcast_to(value, num_actions), dtype=np.float32)
+            for value in (kps, kds, default_angles, self.config.control.torque_limits)
+        ]
+        for vector in vectors:
+            # shared between env instances, must not be modified in place
+            vector.setflags(write=False)
+        return ControlTable(
+            _as_index([joint.dof_pos_index for joint in joints]),
+            _as_index([joint.dof_vel_index for joint in joints]),
+            *vectors,
+        )
+
+    def _build_control_tables(self):
+        """
+        Resolve the per-actuator PD gains and default joint angles from the config.
+        :return: (kps, kds, default_angles)
+        """
+        unified_stiffness = False
+        unified_damping = False
+        kps = np.ones(self.config.env.num_actions, dtype=np.float32)
+        kds = np.ones(self.config.env.num_actions, dtype=np.float32)
         if type(self.config.control.stiffness) is int:
-            self.kps = self.kps * self.config.control.stiffness
+            kps = kps * self.config.control.stiffness
             unified_stiffness = True
         else:
             assert isinstance(self.config.control.stiffness, dict), "config.control.stiffess must be a dict or an int"
 
         if type(self.config.control.damping) is int:
-            self.kds = self.kds * self.config.control.damping
+            kds = kds * self.config.control.damping
             unified_damping = True
         else:
             assert isinstance(self.config.control.damping, dict), "config.control.damping must be a dict or an int"
 
-        self.max_episode_length = self.config.sim.max_episode_length
-        self.reset_buf = False
-        self.default_angles = np.zeros(self.config.env.num_actions, dtype=np.float16)
+        default_angles = np.zeros(self.config.env.num_actions, dtype=np.float32)
 
         for actuator_index, actuator in enumerate(self.model.actuators):
             assert actuator.target_type == "joint", "The actuator must target a joint"
-            assert actuator.typ == "motor", "The actuator type must be 'motor' for this implementation"
+            if not self.config.control.fused_substeps:
+                assert actuator.typ == "motor", "The actuator type must be 'motor' for this implementation"
             actuator_name = actuator.name
             joint_name = actuator.target_name
             default_joint_angle = self.config.init_state.default_joint_angles.get(joint_name, None)
 
             if default_joint_angle is not None:
-                self.default_angles[actuator_index] = default_joint_angle
+                default_angles[actuator_index] = default_joint_angle
             else:
                 # If no specific default angle is set for the joint, use the default value
-                self.default_angles[actuator_index] = self.config.init_state.default_joint_angles.get("default", 0.0)
+                default_angles[actuator_index] = self.config.init_state.default_joint_angles.get("default", 0.0)
                 print(
                     f"""Warning: No default angle set for joint '{joint_name}',
-                      using default value {self.default_angles[actuator_index]}"""
+                      using default value {default_angles[actuator_index]}"""
                 )
 
             if not unified_stiffness:
-                self.kps[actuator_index] = self.config.control.stiffness[actuator_name]
+                kps[actuator_index] = self.config.control.stiffness[actuator_name]
 
             if not unified_damping:
-                self.kds[actuator_index] = self.config.control.damping[actuator_name]
+                kds[actuator_index] = self.config.control.damping[actuator_name]
 
-        self.episode_length_buf = 0
-        self.common_step_counter = 0
-        self.last_actions = np.zeros(self.config.env.num_actions, dtype=np.float16)
-        self.commands = self.resample_commands()
-        self.torque_limits = self.config.control.torque_limits
-        self.dt = self.config.sim.dt * self.config.control.decimation
-        self._sync_dof_data()
-
-        self.body = self.model.get_body(self.config.asset.body_name)
-        self.fb = self.body.floatingbase
-        self.joints = []
-        names = self.model.joint_names
-        for i in range(len(names)):
-            self.joints.append(self.model.get_joint(names[i]))
+        return kps, kds, default_angles
 
     def render_init(self):
         # Create render window for visualization
@@ -174,21 +269,48 @@ class Legged_Robot:
         self.data = SceneData(self.model)
         self.model.forward_kinematic(self.data)
         self.body = self.model.get_body(self.config.asset.body_name)
+        # The dof state written back on reset
+        self.init_dof_pos = self.model.compute_init_dof_pos()
+        self.init_dof_vel = np.zeros(self.model.num_dof_vel, dtype=np.float32)
 
     def step(self, actions):
         # Apply actuations, simulate, call self.post_physics_step()
 
         self.actions = actions
-        for _ in range(self.config.control.decimation):
-            self.torques = self._compute_torques(self.actions)
-            self.data.actuator_ctrls = self.torques
-            step(self.model, self.data)
+        self._simulate(self.actions)
         self.post_physics_step()
         self.obs = self.compute_obs()
 
+    def _simulate(self, actions):
+        """Advance the simulation by `decimation` substeps with the PD targets of `actions`."""
+        decimation = self.config.control.decimation
+        if self.config.control.fused_substeps:
+            # the position actuators track the targets, one engine call for all the substeps
+            np.multiply(actions, self.config.control.action_scale, out=self.targets)
+            self.targets += self.default_angles
+            self.data.actuator_ctrls = self.targets
+            self.model.step_n(self.data, decimation)
+            # the substeps are not observable here, refresh the derived state once from the last one
+            self._sync_dof_data()
+            self._update_substep_state()
+            return
+        for _ in range(decimation):
+            self.torques = self._compute_torques(actions)
+            self._update_substep_state()
+            self.data.actuator_ctrls = self.torques
+            step(self.model, self.data)
+
+    def _update_substep_state(self):
+        """
+        Hook for the state an env derives from the dof state at every substep, e.g. an estimate of the joint angles.
+        Called once per policy step after the substeps when `control.fused_substeps` is set.
+        """
+
     def render(self):
-        """Render the scene"""
-        self._render.sync(self.data)
+        """Render the scene, does nothing when headless"""
+        if self.headless:
+            return
+        self.get_render().sync(self.data)
 
     def post_physics_step(self):
         """check terminations, compute observations and rewards
@@ -202,8 +324,7 @@ class Legged_Robot:
         self.linear_vel = self.get_sensor_value(self.config.sensor.local_linvel)
         self.gyro = self.get_sensor_value(self.config.sensor.gyro)
         self.pose = self.body.get_pose(self.data)
-        inv_rotation = Rotation.from_quat(self.pose[3:7]).inv()  ###xyzw
-        self.gravity = inv_rotation.apply(np.array([0.0, 0.0, -1.0]))
+        self.gravity = projected_gravity(self.pose[3:7])  ###xyzw
         self._sync_dof_data()
         self._post_physics_step_callback()
         self.check_termination()
@@ -220,6 +341,62 @@ class Legged_Robot:
         """
         if self.episode_length_buf % 100 == 0:
             self.commands = self.resample_commands()
+        if self.config.terrain.measure_heights:
+            self.measured_heights = self._get_heights()
+
+    def _init_height_points(self):
+        """
+        Build the grid of height scan points in the yaw frame of the base and the terrain to sample:
+        the engine TerrainScanner when `terrain.geom_name` is a height field geom, else `terrain.hfield_path`.
+        """
+        terrain = self.config.terrain
+        gridx, gridy = np.meshgrid(terrain.measured_points_x, terrain.measured_points_y)
+        self.num_height_points = gridx.size
+        self.points = np.zeros([self.num_height_points, 3])
+        self.points[:, 0] = gridx.flatten()
+        self.points[:, 1] = gridy.flatten()
+
+        self.height_scanner = None
+        if terrain.geom_name is not None:
+            geom = self.model.get_geom(terrain.geom_name)
+            if not isinstance(geom, GeomHField):
+                raise ValueError(f"terrain geom '{terrain.geom_name}' must be a height field")
+            self.height_scanner = TerrainScanner(
+                terrain=geom,
+                frame=self.body.base_link,
+                offsets=self.points[:, :2].astype(np.float32),
+                alignment="yaw",
+                output="height",
+            )
+        else:
+            # shared read-only memory map, normalized while sampling
+            self.heightmap = HeightMap.load(LEGGED_GYM_ENVS_DIR + terrain.hfield_path)
+            self.nrows, self.ncols = self.heightmap.nrows, self.heightmap.ncols
+            self.height_data = self.heightmap.height_data
+
+        self.measured_heights = np.zeros((*self.data.shape, self.num_height_points), dtype=np.float32)
+        self.pose = self.body.get_pose(self.data)
+        self.measured_heights = self._get_heights()
+
+    def _get_heights(self):
+        """Terrain world z under every scan point, shape (*data.shape, num_height_points)."""
+        if self.height_scanner is not None:
+            return self.height_scanner.scan(self.data, out=self.measured_heights)
+        return sample_hfield_heights(
+            self.height_data,
+            self.config.terrain.hfield_size,
+            self.config.terrain.hfield_pos,
+            self.pose[..., :3],
+            yaw_from_quat(self.pose[..., 3:7]),
+            self.points,
+            height_range=(self.heightmap.min, self.heightmap.max),
+        ).astype(np.float32)
+
+    def compute_height_obs(self):
+        """Height scan observation, clipped base height above every scan point."""
+        base_height = self.pose[..., 2, None]
+        heights = np.clip(base_height - 0.5 - self.measured_heights, -1.0, 1.0)
+        return heights * self.config.normalization.obs_scales.height_measurements
 
     def check_termination(self):
         """Check if environments need to be reset"""
@@ -230,22 +407,26 @@ class Legged_Robot:
         # print(result)
 
     def is_fall(self):
-        rotation = Rotation.from_quat(self.pose[3:7])  # xyzw
-        rotated_z_axis = rotation.apply(np.array([0.0, 0.0, 1.0]))
         thr = 0.3
-        dot = np.dot(rotated_z_axis, np.array([0.0, 0.0, 1.0]))
-        return dot < thr
+        return up_axis_z(self.pose[..., 3:7]) < thr
 
     def reset(self):
         if self.reset_buf:
             self.env_reset()
-            self.buffer_init()
+            self.reset_buffers()
 
     def env_reset(self):
-        self.data.reset(self.model)
+        # only the dof state is rewritten, actuator ctrls are recomputed by the next step
+        self.data.set_dof_pos(self.init_dof_pos, self.model)
+        self.data.set_dof_vel(self.init_dof_vel)
         self.model.forward_kinematic(self.data)
 
     def get_observation(self):
+        if self.config.terrain.measure_heights:
+            # the height scan is appended after the env specific observations
+            if self.obs_layout is not None:
+                return self.obs_layout.fill(self.obs, heights=self.compute_height_obs())
+            return np.concatenate([self.obs, self.compute_height_obs()], axis=-1).astype(np.float32)
         return self.obs
 
     def compute_obs(self):
@@ -277,16 +458,24 @@ class Legged_Robot:
 
     def _compute_torques(self, actions):
         # Compute torques from actions.
-        # pd controller
-        actions_scaled = actions * self.config.control.action_scale
+        # pd controller, evaluated in place into self.torques
         control_type = self.config.control.control_type
         self._sync_dof_data()
         if control_type == "P":
-            torques = self.kps * (actions_scaled + self.default_angles - self.dof_pos) - self.kds * self.dof_vel
+            torques = self.torques
+            np.multiply(actions, self.config.control.action_scale, out=torques)
+            torques += self.default_angles
+            torques -= self.dof_pos
+            torques *= self.kps
+            np.multiply(self.kds, self.dof_vel, out=self._damping_torques)
+            torques -= self._damping_torques
         else:
             raise NameError(f"Unknown controller type: {control_type}")
-        return np.clip(torques, -self.torque_limits, self.torque_limits)
+        np.minimum(torques, self.torque_limits, out=torques)
+        np.maximum(torques, self._neg_torque_limits, out=torques)
+        return torques
 
     def _sync_dof_data(self):
-        self.dof_pos = self.body.get_joint_dof_pos(self.data)
-        self.dof_vel = self.body.get_joint_dof_vel(self.data)
+        # actuated joints, in actuator order
+        self.dof_pos = self.data.dof_pos[..., self.control_table.dof_pos_index]
+        self.dof_vel = self.data.dof_vel[..., self.control_table.dof_vel_index]
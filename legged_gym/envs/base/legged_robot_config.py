@@ -24,6 +24,10 @@ class LeggedRobotCfg:
     class env:
         num_observations = 48
         num_actions = 12
+        # number of instances simulated by the batched envs (VecLeggedRobot)
+        num_envs = 1
+        # distance between rendered instances [m], only affects rendering
+        env_spacing = 1.0
 
     class init_state:
         # the initial position of the robot in the world frame
@@ -45,10 +49,42 @@ class LeggedRobotCfg:
             "RR_calf": -1.5,
         }
 
+    class viewer:
+        # "human": open a render window on the first call to render() / get_render()
+        # None: headless, the renderer is never created and render() does nothing
+        render_mode = "human"
+
     class terrain:
         measure_heights = False
         type = "plane"
         hfield_path = "/resources/robots/G1/heightmap.hfield"
+        # name of a GeomHField geom scanned with the engine TerrainScanner, None samples hfield_path instead
+        geom_name = None
+        # placement of hfield_path, same as the MJCF hfield size (radius_x, radius_y, elevation_z, base_z)
+        # and the hfield geom pos
+        hfield_size = [10.0, 10.0, 1.0, 0.1]
+        hfield_pos = [0.0, 0.0, 0.0]
+        # 1mx1.6m rectangle (without center line)
+        measured_points_x = [
+            -0.8,
+            -0.7,
+            -0.6,
+            -0.5,
+            -0.4,
+            -0.3,
+            -0.2,
+            -0.1,
+            0.0,
+            0.1,
+            0.2,
+            0.3,
+            0.4,
+            0.5,
+            0.6,
+            0.7,
+            0.8,
+        ]
+        measured_points_y = [-0.5, -0.4, -0.3, -0.2, -0.1, 0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
 
     class commands:
         resampling_interval = 200  # dt
@@ -69,6 +105,13 @@ class LeggedRobotCfg:
         # decimation: Number of control action updates @ sim DT per policy DT
         decimation = 4
         torque_limits = 23.7
+        # hand the PD law to the engine and advance the decimation substeps in one call,
+        # requires position actuators: the torque limits are their forcerange and the
+        # damping is integrated implicitly by the engine. The bundled robot scenes (go1, T1,
+        # BHL) use motor actuators, so only configs pointing asset.file to a scene with
+        # position actuators can enable it. The per-substep state (see
+        # Legged_Robot._update_substep_state) is then only refreshed after the last substep
+        fused_substeps = False
 
     class asset:
         file = LEGGED_GYM_ENVS_DIR + "/resources/robots/go1/scene.xml"
@@ -80,6 +123,7 @@ class LeggedRobotCfg:
             ang_vel = 1.0
             dof_pos = 1.0
             dof_vel = 1.0
+            height_measurements = 5.0
 
     class sensor:
         local_linvel = "local_linvel"
@@ -0,0 +1,141 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+
+from legged_gym.envs.base.legged_robot import Legged_Robot
+from legged_gym.utils.rotation import projected_gravity
+from motrixsim import SceneData, load_model
+from motrixsim.render import RenderApp
+
+
+class VecLeggedRobot(Legged_Robot):
+    """
+    Batched version of Legged_Robot, simulating `config.env.num_envs` instances on one SceneData.
+
+    Every per-env buffer (commands, obs, actions, last_actions, episode_length_buf, reset_buf, ...)
+    has a leading (num_envs,) dimension and is updated with whole-batch NumPy ops.
+
+    Robot specific envs are built by mixing this class in front of the single-env implementation,
+    e.g. `class Go1_vec_env(VecLeggedRobot, Go1_env)`, so the actuator tables, configs and observation
+    layout are shared: the observation buffer is allocated with the (num_envs,) batch shape of the data.
+    """
+
+    def env_init(self):
+        self.num_envs = self.config.env.num_envs
+        # The scene description file
+        path = self.config.asset.file
+        # Load the scene model
+        self.model = load_model(path)
+        self.model.options.timestep = self.config.sim.dt
+        # Create the physics data of the model, with one instance per env
+        self.data = SceneData(self.model, batch=(self.num_envs,))
+        self.model.forward_kinematic(self.data)
+        self.body = self.model.get_body(self.config.asset.body_name)
+        # The dof state written back on reset, broadcast to every reset instance
+        self.init_dof_pos = self.model.compute_init_dof_pos()
+        self.init_dof_vel = np.zeros(self.model.num_dof_vel, dtype=np.float32)
+
+    def render_init(self):
+        # Create render window for visualization
+        self._render = RenderApp()
+        # Launch the render in batch mode.
+        # Note: The offset only affects the render objects, the physics instances are still at the origin.
+        self._render.launch(self.model, batch=self.num_envs, render_offset=self._render_offsets())
+
+    def _render_offsets(self):
+        """Lay the rendered instances out on a square grid with `config.env.env_spacing` spacing."""
+        num_cols = int(np.ceil(np.sqrt(self.num_envs)))
+        env_ids = np.arange(self.num_envs)
+        offsets = np.zeros((self.num_envs, 3))
+        offsets[:, 0] = -(env_ids // num_cols) * self.config.env.env_spacing
+        offsets[:, 1] = (env_ids % num_cols) * self.config.env.env_spacing
+        return offsets.tolist()
+
+    def reset_buffers(self):
+        # The per-actuator tables (kps, kds, default_angles) of the single-env implementation
+        # broadcast against the (num_envs, num_actions) buffers below.
+        num_actions = self.config.env.num_actions
+        self.actions = np.zeros((self.num_envs, num_actions), dtype=np.float32)
+        self.last_actions = np.zeros((self.num_envs, num_actions), dtype=np.float32)
+        self.episode_length_buf = np.zeros(self.num_envs, dtype=np.int64)
+        self.common_step_counter = 0
+        self.reset_buf = np.zeros(self.num_envs, dtype=bool)
+        self.commands = np.zeros((self.num_envs, 3), dtype=np.float32)
+        self.commands = self.resample_commands()
+        self._sync_dof_data()
+
+    def post_physics_step(self):
+        """check terminations and resets for the whole batch"""
+        self.episode_length_buf += 1
+        self.common_step_counter += 1
+
+        # prepare quantities
+        if self.config.sensor.local_linvel is not None:
+            self.linear_vel = self.get_sensor_value(self.config.sensor.local_linvel)
+        self.gyro = self.get_sensor_value(self.config.sensor.gyro)
+        self.pose = self.body.get_pose(self.data)
+        self.gravity = projected_gravity(self.pose[:, 3:7])  ###xyzw
+        self._sync_dof_data()
+        self._post_physics_step_callback()
+        self.check_termination()
+        self.reset()
+
+    def _post_physics_step_callback(self):
+        env_ids = np.flatnonzero(self.episode_length_buf % 100 == 0)
+        if len(env_ids) > 0:
+            self.commands[env_ids] = self.resample_commands(env_ids)
+        if self.config.terrain.measure_heights:
+            self.measured_heights = self._get_heights()
+
+    def reset(self):
+        if np.any(self.reset_buf):
+            self.reset_idx(self.reset_buf)
+
+    def reset_idx(self, env_mask):
+        """
+        Reset the instances selected by the boolean `env_mask`, the others keep running.
+        Only the dof state, commands and counters of the selected instances are rewritten,
+        the control tables and buffers are reused.
+        """
+        env_data = self.data[env_mask]
+        env_data.set_dof_pos(self.init_dof_pos, self.model)
+        env_data.set_dof_vel(self.init_dof_vel)
+        self.model.forward_kinematic(env_data)
+
+        env_ids = np.flatnonzero(env_mask)
+        self.episode_length_buf[env_ids] = 0
+        self.last_actions[env_ids] = 0.0
+        self.commands[env_ids] = 0.0
+        self.commands[env_ids] = self.resample_commands(env_ids)
+        self.reset_buf[env_ids] = False
+        self._sync_dof_data()
+
+    def resample_commands(self, env_ids=None):
+        num = self.num_envs if env_ids is None else len(env_ids)
+        ranges = self.config.commands.ranges
+        x = np.random.random(num) * (ranges.lin_vel_x[1] - ranges.lin_vel_x[0]) - ranges.lin_vel_x[1]
+        y = np.random.random(num) * (ranges.lin_vel_y[1] - ranges.lin_vel_y[0]) - ranges.lin_vel_y[1]
+        rot = np.random.random(num) * (ranges.ang_vel_yaw[1] - ranges.ang_vel_yaw[0]) + ranges.ang_vel_yaw[0]
+        target_action = np.stack(
+            [
+                x * self.config.normalization.obs_scales.lin_vel,
+                y * self.config.normalization.obs_scales.lin_vel,
+                rot * self.config.normalization.obs_scales.ang_vel,
+            ],
+            axis=-1,
+        )
+        commands = self.commands if env_ids is None else self.commands[env_ids]
+        return (target_action * 0.2 + commands * 0.8).astype(np.float32)
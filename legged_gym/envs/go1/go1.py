@@ -13,38 +13,41 @@
 # limitations under the License.
 # ==============================================================================
 
-import numpy as np
-
 from legged_gym.envs.base.legged_robot import Legged_Robot
-from motrixsim import step
+from legged_gym.envs.base.vec_legged_robot import VecLeggedRobot
+from legged_gym.utils.observation import ObsTerm
 
 
 class Go1_env(Legged_Robot):
+    def obs_terms(self):
+        obs_scales = self.config.normalization.obs_scales
+        return [
+            ObsTerm("lin_vel", 3, scale=obs_scales.lin_vel),
+            ObsTerm("gyro", 3, scale=obs_scales.ang_vel),
+            ObsTerm("gravity", 3),
+            ObsTerm("dof_pos", 12, offset=self.default_angles),
+            ObsTerm("dof_vel", 12),
+            ObsTerm("last_actions", 12),
+            ObsTerm("commands", 3),
+        ]
+
     def compute_obs(self):
-        obs = np.zeros(self.config.env.num_observations, dtype=np.float16)
-        diff = self.dof_pos - self.default_angles
-        obs[:3] = self.linear_vel * self.config.normalization.obs_scales.lin_vel
-        obs[3:6] = self.gyro * self.config.normalization.obs_scales.ang_vel
-        obs[6:9] = self.gravity
-        obs[9:21] = diff
-        obs[21:33] = self.dof_vel
-        obs[33:45] = self.last_actions
-        obs[45:48] = self.commands
-        self.last_actions = self.actions
-        return obs
-
-    def step(self, actions):
-        # Apply actuations, simulate, call self.post_physics_step()
-
-        self.actions = actions
-        for _ in range(self.config.control.decimation):
-            self.torques = self._compute_torques(self.actions)
-            self.e_angle = self.dof_estimate()
-            self.data.actuator_ctrls = self.torques
-            step(self.model, self.data)
-
-        self.post_physics_step()
-        self.obs = self.compute_obs()
+        self.obs_layout.fill(
+            self.obs,
+            lin_vel=self.linear_vel,
+            gyro=self.gyro,
+            gravity=self.gravity,
+            dof_pos=self.dof_pos,
+            dof_vel=self.dof_vel,
+            last_actions=self.last_actions,
+            commands=self.commands,
+        )
+        # copied, the actions may be the output buffer of the policy which is overwritten in place
+        self.last_actions[:] = self.actions
+        return self.obs
+
+    def _update_substep_state(self):
+        self.e_angle = self.dof_estimate()
 
     def env_reset(self):
         super().env_reset()
@@ -55,3 +58,7 @@ class Go1_env(Legged_Robot):
         d_angle = k * (actions_scaled - self.dof_pos) * self.config.sim.dt
         estimate_angle = self.dof_pos + d_angle
         return estimate_angle
+
+
+class Go1_vec_env(VecLeggedRobot, Go1_env):
+    """Batched Go1_env, the observation layout is shared with the single-env implementation."""
@@ -14,30 +14,32 @@
 # ==============================================================================
 
 import numpy as np
-import onnxruntime as ort
 
 from legged_gym.addr import LEGGED_GYM_ENVS_DIR
 from legged_gym.envs.Berkeley_Humanoid.BHA import BHA_env
 from legged_gym.envs.Berkeley_Humanoid.BHA_config import BHACfg
 from legged_gym.utils import runner
+from legged_gym.utils.policy import OnnxPolicy
 
 policy_path = "/policy/Berkeley_Humanoid/policy_humanoid.onnx"
 env = BHA_env(BHACfg)
-session = ort.InferenceSession(LEGGED_GYM_ENVS_DIR + policy_path, providers=["CPUExecutionProvider"])
-input_name = session.get_inputs()[0].name
-output_name = session.get_outputs()[0].name
-actions = np.zeros(22)
+policy = OnnxPolicy(LEGGED_GYM_ENVS_DIR + policy_path)
+actions = np.zeros(22, dtype=np.float32)
 
 
-def step():
-    global actions
+def physics_step():
     env.step(actions)
-    obs = env.get_observation()
-    # print(obs)
-    input_data = obs.reshape(1, env.config.env.num_observations).astype(np.float32)
-    outputs = session.run([output_name], {input_name: input_data})
-    # Read actions from output
-    actions = outputs[0][0]
 
 
-runner.loop(policy_step=step, render=env.render, policy_dt=env.config.sim.dt * env.config.control.decimation)
+def policy_step():
+    global actions
+    # the observation buffer is bound in place, no copy nor cast
+    actions = policy.infer(env.get_observation())
+
+
+runner.loop(
+    physics_step=physics_step,
+    policy_step=policy_step,
+    render=env.render,
+    policy_dt=env.config.sim.dt * env.config.control.decimation,
+)
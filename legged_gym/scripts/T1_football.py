@@ -14,12 +14,12 @@
 # ==============================================================================
 
 import numpy as np
-import onnxruntime as ort
 
 from legged_gym.addr import LEGGED_GYM_ENVS_DIR
 from legged_gym.envs.T1_football.T1 import T1_Football_env
 from legged_gym.envs.T1_football.T1_config import T1FootballCfg
 from legged_gym.utils import runner
+from legged_gym.utils.policy import OnnxPolicy
 
 policy_path = "/policy/booster_t1/loco.onnx"
 policy_kick = "/policy/booster_t1/n_kick.onnx"
@@ -31,29 +31,10 @@ actions = np.zeros(12)
 camera = env.model.cameras[0]
 env.get_render().set_main_camera(camera)
 
-
-class PolicyRunner:
-    session: ort.InferenceSession
-    input_name: str
-    output_name: str
-
-    def __init__(self, path: str):
-        self.session = ort.InferenceSession(LEGGED_GYM_ENVS_DIR + path, providers=["CPUExecutionProvider"])
-        self.input_name = self.session.get_inputs()[0].name
-        self.output_name = self.session.get_outputs()[0].name
-
-    def infer(self, observation: np.ndarray) -> np.ndarray:
-        input_data = observation.reshape(1, -1).astype(np.float32)
-        outputs = self.session.run([self.output_name], {self.input_name: input_data})
-        return outputs[0][0]
-
-
-walk_policy = PolicyRunner(policy_path)
-kick_policy = PolicyRunner(policy_kick)
-
+# one policy per state of the env, the observation of the current state is bound in place
 policies = {
-    "walk": walk_policy,
-    "kick": kick_policy,
+    "walk": OnnxPolicy(LEGGED_GYM_ENVS_DIR + policy_path),
+    "kick": OnnxPolicy(LEGGED_GYM_ENVS_DIR + policy_kick),
 }
 
 
@@ -0,0 +1,51 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+
+from legged_gym.addr import LEGGED_GYM_ENVS_DIR
+from legged_gym.envs.go1.go1 import Go1_vec_env
+from legged_gym.envs.go1.go1_config import Go1Cfg
+from legged_gym.utils import runner
+from legged_gym.utils.policy import OnnxPolicy
+
+
+class Go1VecCfg(Go1Cfg):
+    class env(Go1Cfg.env):
+        num_envs = 16
+
+
+policy_path = "/policy/go1/go1_policy.onnx"
+env = Go1_vec_env(Go1VecCfg)
+policy = OnnxPolicy(LEGGED_GYM_ENVS_DIR + policy_path)
+actions = np.zeros((env.num_envs, 12), dtype=np.float32)
+
+
+def physics_step():
+    env.step(actions)
+
+
+def policy_step():
+    global actions
+    # (num_envs, 48) observations are evaluated in a single call
+    actions = policy.infer(env.get_observation())
+
+
+runner.loop(
+    physics_step=physics_step,
+    policy_step=policy_step,
+    render=env.render,
+    policy_dt=env.config.sim.dt * env.config.control.decimation,
+)
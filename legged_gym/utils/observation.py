@@ -0,0 +1,98 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ObsTerm:
+    """
+    One named slice of an observation vector.
+
+    Attributes:
+        name (str): Name used to fill the term, see :meth:`ObservationLayout.fill`.
+        size (int): Number of elements of the term.
+        scale (float | np.ndarray): Multiplier applied to the value, scalar or of shape (size,).
+        offset (np.ndarray | None): Subtracted from the value before scaling, e.g. the default joint angles.
+    """
+
+    name: str
+    size: int
+    scale: Union[float, np.ndarray] = 1.0
+    offset: Optional[np.ndarray] = None
+
+
+class ObservationLayout:
+    """
+    Ordered list of :class:`ObsTerm` packed into one float32 observation vector.
+
+    The observation buffer is allocated once with :meth:`allocate`, then every policy step
+    :meth:`fill` writes `(value - offset) * scale` of each term in place into its slice. The
+    buffer has shape (num_obs,) or (num_envs, num_obs) and can be handed to ONNX Runtime as is.
+
+    Example::
+
+        layout = ObservationLayout(
+            [
+                ObsTerm("gyro", 3, scale=0.25),
+                ObsTerm("dof_pos", 12, offset=default_angles),
+            ]
+        )
+        obs = layout.allocate((num_envs,))
+        layout.fill(obs, gyro=gyro, dof_pos=dof_pos)
+    """
+
+    def __init__(self, terms: Sequence[ObsTerm]):
+        self.terms = {}
+        self.slices = {}
+        start = 0
+        for term in terms:
+            if term.name in self.terms:
+                raise ValueError(f"duplicate observation term '{term.name}'")
+            self.terms[term.name] = term
+            self.slices[term.name] = slice(start, start + term.size)
+            start += term.size
+        self.num_obs = start
+
+    def allocate(self, batch_shape=()) -> np.ndarray:
+        """Allocate a zeroed float32 buffer of shape (*batch_shape, num_obs)."""
+        return np.zeros((*batch_shape, self.num_obs), dtype=np.float32)
+
+    def fill(self, buffer: np.ndarray, **values) -> np.ndarray:
+        """
+        Write the given terms in place into `buffer`, terms that are not given are left untouched.
+
+        Args:
+            buffer (np.ndarray): Buffer returned by :meth:`allocate`.
+            **values: Term name to value, of shape (*batch_shape, size). Terms of size 1 also accept
+                values of shape batch_shape.
+
+        Returns:
+            np.ndarray: `buffer`.
+        """
+        for name, value in values.items():
+            term = self.terms[name]
+            out = buffer[..., self.slices[name]]
+            if term.size == 1 and np.ndim(value) == out.ndim - 1:
+                value = np.expand_dims(value, -1)
+            if term.offset is not None:
+                np.subtract(value, term.offset, out=out)
+                out *= term.scale
+            else:
+                np.multiply(value, term.scale, out=out)
+        return buffer
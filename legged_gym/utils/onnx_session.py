@@ -0,0 +1,187 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Process-wide registry of ONNX Runtime sessions.
+
+Every policy of the examples and of legged_gym loads its model through :func:`get_session`:
+
+* Controllers loading the same .onnx file with the same providers and threading share one session
+  (`InferenceSession.run` is thread safe), so the model is parsed and optimized once per process.
+* The graph optimized by ONNX Runtime is saved to a local cache directory and loaded by the next
+  processes, which skips most of the graph optimization at startup. The cache entry is keyed by the
+  content of the model, the ONNX Runtime version, the providers and the optimization level, so a
+  retrained policy or an upgraded runtime never picks up a stale graph. The saved graph is optimized
+  up to ORT_ENABLE_EXTENDED only: the ORT_ENABLE_ALL layout optimizations depend on the instruction
+  set of the CPU, they are applied in memory when the cached graph is loaded, so a cache directory
+  shared by hosts with different CPUs stays valid.
+
+The cache directory is `$MOTRIXSIM_ONNX_CACHE`, or `~/.cache/motrixsim/onnx` when it is not set.
+Set `MOTRIXSIM_ONNX_CACHE` to an empty string to disable the on-disk cache.
+
+The sessions run on `$MOTRIXSIM_ONNX_NUM_THREADS` intra-op threads, 1 when it is not set, unless the
+caller passes its own thread counts. 0 lets ONNX Runtime decide.
+"""
+
+import hashlib
+import os
+import platform
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import onnxruntime as ort
+
+DEFAULT_PROVIDERS = ("CPUExecutionProvider",)
+# one thread by default, so that the session does not spin up a thread pool competing with the
+# physics threads for a small MLP. Large batches can raise it with $MOTRIXSIM_ONNX_NUM_THREADS.
+DEFAULT_INTRA_OP_NUM_THREADS = int(os.environ.get("MOTRIXSIM_ONNX_NUM_THREADS") or 1)
+# the graph is executed sequentially, the inter-op pool is unused
+DEFAULT_INTER_OP_NUM_THREADS = 1
+# highest optimization level of the graphs saved to the cache, the higher levels are hardware specific
+_CACHED_OPTIMIZATION_LEVEL = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+
+_sessions: Dict[tuple, ort.InferenceSession] = {}
+_lock = threading.Lock()
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Directory of the optimized models, None when the on-disk cache is disabled."""
+    cache_dir = os.environ.get("MOTRIXSIM_ONNX_CACHE")
+    if cache_dir is None:
+        return Path.home() / ".cache" / "motrixsim" / "onnx"
+    return Path(cache_dir) if cache_dir else None
+
+
+def get_session(
+    path: Union[str, os.PathLike],
+    providers: Sequence[str] = DEFAULT_PROVIDERS,
+    intra_op_num_threads: int = DEFAULT_INTRA_OP_NUM_THREADS,
+    inter_op_num_threads: int = DEFAULT_INTER_OP_NUM_THREADS,
+    graph_optimization_level: ort.GraphOptimizationLevel = ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    cache_dir: Union[str, os.PathLike, None, bool] = True,
+) -> ort.InferenceSession:
+    """
+    Get the shared session of an ONNX model, creating it on first use.
+
+    Args:
+        path (str | os.PathLike): Path of the .onnx file.
+        providers (Sequence[str]): Execution providers of the session, in priority order.
+        intra_op_num_threads (int): Threads used inside an operator, 0 lets ONNX Runtime decide. Defaults to
+            `$MOTRIXSIM_ONNX_NUM_THREADS`, or 1.
+        inter_op_num_threads (int): Threads used across operators, 0 lets ONNX Runtime decide.
+        graph_optimization_level (ort.GraphOptimizationLevel): Graph optimizations applied to the model.
+        cache_dir (str | os.PathLike | None | bool): Directory of the optimized models. True uses
+            :func:`default_cache_dir`, None or False disables the on-disk cache.
+
+    Returns:
+        ort.InferenceSession: The session, shared with every caller using the same arguments.
+    """
+    path = os.path.realpath(path)
+    providers = tuple(providers)
+    key = (path, providers, intra_op_num_threads, inter_op_num_threads, graph_optimization_level)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            if cache_dir is True:
+                cache_dir = default_cache_dir()
+            session = _create_session(
+                path,
+                providers,
+                intra_op_num_threads,
+                inter_op_num_threads,
+                graph_optimization_level,
+                Path(cache_dir) if cache_dir else None,
+            )
+            _sessions[key] = session
+    return session
+
+
+def clear_sessions() -> None:
+    """Drop every shared session, the next :func:`get_session` calls create new ones."""
+    with _lock:
+        _sessions.clear()
+
+
+def _session_options(intra_op_num_threads, inter_op_num_threads, graph_optimization_level) -> ort.SessionOptions:
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_num_threads
+    options.inter_op_num_threads = inter_op_num_threads
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = graph_optimization_level
+    return options
+
+
+def _cached_model_path(path: str, providers: tuple, graph_optimization_level, cache_dir: Path) -> Path:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    runtime = (ort.__version__, platform.machine(), *providers, str(int(graph_optimization_level)))
+    digest.update("|".join(runtime).encode())
+    return cache_dir / f"{Path(path).stem}-{digest.hexdigest()[:16]}.onnx"
+
+
+def _create_session(
+    path: str,
+    providers: tuple,
+    intra_op_num_threads: int,
+    inter_op_num_threads: int,
+    graph_optimization_level: ort.GraphOptimizationLevel,
+    cache_dir: Optional[Path],
+) -> ort.InferenceSession:
+    options = _session_options(intra_op_num_threads, inter_op_num_threads, graph_optimization_level)
+    if cache_dir is None or graph_optimization_level == ort.GraphOptimizationLevel.ORT_DISABLE_ALL:
+        return ort.InferenceSession(path, sess_options=options, providers=list(providers))
+
+    cached_level = min(graph_optimization_level, _CACHED_OPTIMIZATION_LEVEL, key=int)
+    cached_path = _cached_model_path(path, providers, cached_level, cache_dir)
+    if cached_path.is_file() or _write_cached_model(path, providers, cached_level, cached_path):
+        # the graph is already optimized up to the cached level, only the higher levels are applied
+        if int(graph_optimization_level) <= int(cached_level):
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return ort.InferenceSession(str(cached_path), sess_options=options, providers=list(providers))
+        except Exception:
+            # e.g. a truncated file, loaded without the cache
+            options.graph_optimization_level = graph_optimization_level
+    return ort.InferenceSession(path, sess_options=options, providers=list(providers))
+
+
+def _write_cached_model(
+    path: str, providers: tuple, graph_optimization_level: ort.GraphOptimizationLevel, cached_path: Path
+) -> bool:
+    """Save the graph of `path` optimized up to `graph_optimization_level`, False when it cannot be saved."""
+    try:
+        cached_path.parent.mkdir(parents=True, exist_ok=True)
+        # written next to the final entry and renamed, so concurrent processes never load a partial file
+        fd, tmp_path = tempfile.mkstemp(suffix=".onnx", dir=cached_path.parent)
+        os.close(fd)
+    except OSError:
+        return False
+
+    options = _session_options(1, 1, graph_optimization_level)
+    options.optimized_model_filepath = tmp_path
+    try:
+        ort.InferenceSession(path, sess_options=options, providers=list(providers))
+        os.replace(tmp_path, cached_path)
+        return True
+    except Exception:
+        # providers with compiled nodes cannot serialize the optimized graph
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,148 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from typing import Dict, Mapping, Sequence, Union
+
+import numpy as np
+import onnxruntime as ort
+
+from legged_gym.utils.onnx_session import DEFAULT_INTER_OP_NUM_THREADS, DEFAULT_INTRA_OP_NUM_THREADS, get_session
+
+
+class OnnxPolicy:
+    """
+    ONNX policy evaluated on a whole (num_envs, obs_dim) batch of observations per call.
+
+    Inputs and outputs are bound to CPU buffers with an ONNX Runtime IOBinding: the observation
+    buffer is bound in place (rebound only when another buffer is passed) and the actions are
+    written into a persistent float32 buffer, so a policy step does no allocation. The session comes
+    from :func:`legged_gym.utils.onnx_session.get_session` and is shared with the other policies
+    loading the same model, each policy keeps its own binding.
+
+    Args:
+        path (str): Path of the .onnx file.
+        intra_op_num_threads (int): Threads used inside an operator, 0 lets ONNX Runtime decide. Defaults to
+            `$MOTRIXSIM_ONNX_NUM_THREADS`, or 1.
+        inter_op_num_threads (int): Threads used across operators, 0 lets ONNX Runtime decide.
+        graph_optimization_level (ort.GraphOptimizationLevel): Graph optimizations applied on load.
+        providers (Sequence[str]): Execution providers of the session.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        intra_op_num_threads: int = DEFAULT_INTRA_OP_NUM_THREADS,
+        inter_op_num_threads: int = DEFAULT_INTER_OP_NUM_THREADS,
+        graph_optimization_level: ort.GraphOptimizationLevel = ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+        providers: Sequence[str] = ("CPUExecutionProvider",),
+    ):
+        self.session = get_session(
+            path,
+            providers=providers,
+            intra_op_num_threads=intra_op_num_threads,
+            inter_op_num_threads=inter_op_num_threads,
+            graph_optimization_level=graph_optimization_level,
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.output_name = self.session.get_outputs()[0].name
+        action_dim = self.session.get_outputs()[0].shape[-1]
+        # None for a symbolic dimension, resolved by the first call
+        self.action_dim = action_dim if isinstance(action_dim, int) else None
+
+        self._binding = self.session.io_binding()
+        self._input = None
+        self._actions = np.zeros((0, self.action_dim or 0), dtype=np.float32)
+        self._num_bound_actions = -1
+
+    def infer(self, obs: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the policy.
+
+        Args:
+            obs (np.ndarray): Observations of shape (obs_dim,) or (num_envs, obs_dim). Contiguous float32
+                buffers, e.g. the observation buffer of the env, are bound without any copy.
+
+        Returns:
+            np.ndarray: Actions of shape (action_dim,) or (num_envs, action_dim). The array is a view of
+            the output buffer, which is overwritten by the next call: copy it to keep it.
+        """
+        batch = np.ascontiguousarray(obs.reshape(-1, obs.shape[-1]), dtype=np.float32)
+        num_envs = batch.shape[0]
+        if self.action_dim is None:
+            self.action_dim = self.session.run([self.output_name], {self.input_name: batch})[0].shape[-1]
+
+        if self._input is None or self._input.ctypes.data != batch.ctypes.data or self._input.shape != batch.shape:
+            self._binding.bind_input(self.input_name, "cpu", 0, np.float32, list(batch.shape), batch.ctypes.data)
+            # keep the bound buffer alive
+            self._input = batch
+
+        if num_envs != self._num_bound_actions:
+            if num_envs > self._actions.shape[0] or self._actions.shape[1] != self.action_dim:
+                # grow only, smaller batches are bound to a prefix of the buffer
+                self._actions = np.zeros((num_envs, self.action_dim), dtype=np.float32)
+            actions = self._actions[:num_envs]
+            self._binding.bind_output(self.output_name, "cpu", 0, np.float32, list(actions.shape), actions.ctypes.data)
+            self._num_bound_actions = num_envs
+
+        self.session.run_with_iobinding(self._binding)
+        actions = self._actions[:num_envs]
+        return actions if obs.ndim > 1 else actions[0]
+
+
+class PolicyRouter:
+    """
+    Evaluate a batch of envs with several policies, routing every env to the policy of its state,
+    e.g. {"walk": walk_policy, "kick": kick_policy}. Each policy is called once per step on the
+    sub-batch of envs in its state. The same policy may serve several states.
+
+    Args:
+        policies (Mapping[str, OnnxPolicy]): Policy of every state.
+    """
+
+    def __init__(self, policies: Mapping[str, OnnxPolicy]):
+        self.policies = dict(policies)
+        ids = [id(policy) for policy in self.policies.values()]
+        # the actions of a policy serving several states are copied, the next sub-batch overwrites its buffer
+        self._shared = {policy_id for policy_id in ids if ids.count(policy_id) > 1}
+
+    def infer(
+        self, states: Union[np.ndarray, Sequence[str]], obs: Union[np.ndarray, Mapping[str, np.ndarray]]
+    ) -> Dict[str, tuple]:
+        """
+        Evaluate every policy on the envs in its state.
+
+        Args:
+            states (np.ndarray | Sequence[str]): State of every env, shape (num_envs,).
+            obs (np.ndarray | Mapping[str, np.ndarray]): Observations of shape (num_envs, obs_dim), or one
+                such array per state when the policies observe different quantities. Only the rows of the
+                envs in the state of a policy are evaluated.
+
+        Returns:
+            dict[str, tuple[np.ndarray, np.ndarray]]: For every state with at least one env, the env ids
+            and their actions of shape (len(env_ids), action_dim). The actions of a policy serving a single
+            state are a view of its output buffer, valid until the next call: copy them to keep them.
+        """
+        states = np.asarray(states)
+        results = {}
+        for state, policy in self.policies.items():
+            env_ids = np.flatnonzero(states == state)
+            if len(env_ids) == 0:
+                continue
+            state_obs = obs[state] if isinstance(obs, Mapping) else obs
+            # the whole batch is bound in place, sub-batches are gathered
+            batch = state_obs if len(env_ids) == len(states) else state_obs[env_ids]
+            actions = policy.infer(batch)
+            results[state] = (env_ids, actions.copy() if id(policy) in self._shared else actions)
+        return results
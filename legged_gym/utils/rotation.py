@@ -0,0 +1,127 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Rotation kernels on xyzw quaternions, the layout returned by `get_pose` / `get_rotation`.
+
+Every function takes quaternions of shape (..., 4), single or batched, and evaluates the few
+entries of the rotation matrix it needs with plain NumPy arithmetic, so per-step code does not
+build a `scipy.spatial.transform.Rotation` to rotate one vector.
+"""
+
+import numpy as np
+
+
+def projected_gravity(quat, out=None):
+    """
+    Gravity direction [0, 0, -1] expressed in the frame of the quaternions, i.e. R^T @ [0, 0, -1].
+
+    Args:
+        quat (np.ndarray): Quaternions in xyzw order, shape (..., 4).
+        out (np.ndarray | None): Output of shape (..., 3), allocated when None.
+
+    Returns:
+        np.ndarray: Minus the last row of the rotation matrices, shape (..., 3).
+    """
+    if out is None:
+        out = np.empty((*np.shape(quat)[:-1], 3), dtype=np.result_type(quat, np.float32))
+    x, y, z, w = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    out[..., 0] = 2.0 * (w * y - x * z)
+    out[..., 1] = -2.0 * (y * z + w * x)
+    out[..., 2] = 2.0 * (x * x + y * y) - 1.0
+    return out
+
+
+def up_axis_z(quat):
+    """
+    World z component of the rotated z-axis, the dot product of the body up-axis with the world up-axis.
+
+    Args:
+        quat (np.ndarray): Quaternions in xyzw order, shape (..., 4).
+
+    Returns:
+        np.ndarray: 1 when upright, -1 when upside down, shape (...).
+    """
+    x, y = quat[..., 0], quat[..., 1]
+    return 1.0 - 2.0 * (x * x + y * y)
+
+
+def quat_rotate(quat, vec):
+    """
+    Rotate vectors by quaternions, i.e. R @ vec.
+
+    Args:
+        quat (np.ndarray): Quaternions in xyzw order, shape (..., 4).
+        vec (np.ndarray): Vectors, shape (..., 3), broadcast against the quaternions.
+
+    Returns:
+        np.ndarray: Rotated vectors, shape (..., 3).
+    """
+    q = quat[..., :3]
+    w = quat[..., 3:4]
+    t = 2.0 * np.cross(q, vec)
+    return vec + w * t + np.cross(q, t)
+
+
+def yaw_from_quat(quat):
+    """
+    Heading angle (rotation about world Z) of xyzw quaternions.
+
+    Args:
+        quat (np.ndarray): Quaternions in xyzw order, shape (..., 4).
+
+    Returns:
+        np.ndarray: Yaw angles in radians, shape (...).
+    """
+    x, y, z, w = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    return np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+
+
+def quat_conjugate(quat):
+    """
+    Conjugate of xyzw quaternions, the inverse rotation of unit quaternions.
+
+    Args:
+        quat (np.ndarray): Quaternions in xyzw order, shape (..., 4).
+
+    Returns:
+        np.ndarray: Conjugate quaternions, shape (..., 4).
+    """
+    out = np.array(quat, copy=True)
+    out[..., :3] *= -1.0
+    return out
+
+
+def quat_mul(a, b, out=None):
+    """
+    Hamilton product a * b of xyzw quaternions, the rotation b followed by a.
+
+    Args:
+        a (np.ndarray): Quaternions in xyzw order, shape (..., 4).
+        b (np.ndarray): Quaternions in xyzw order, shape (..., 4), broadcast against `a`.
+        out (np.ndarray | None): Output of shape (..., 4), allocated when None.
+
+    Returns:
+        np.ndarray: Product quaternions, shape (..., 4).
+    """
+    ax, ay, az, aw = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bx, by, bz, bw = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    if out is None:
+        out = np.empty((*np.broadcast_shapes(np.shape(a), np.shape(b))[:-1], 4), dtype=np.result_type(a, b))
+    out[..., 0] = aw * bx + ax * bw + ay * bz - az * by
+    out[..., 1] = aw * by - ax * bz + ay * bw + az * bx
+    out[..., 2] = aw * bz + ax * by - ay * bx + az * bw
+    out[..., 3] = aw * bw - ax * bx - ay * by - az * bz
+    return out
@@ -13,31 +13,200 @@
 # limitations under the License.
 # ==============================================================================
 
+import os
 import time
-from typing import Callable
+from dataclasses import dataclass
+from typing import Callable, Optional
 
+REALTIME = "realtime"
+FAST = "fast"
 
-def loop(policy_step: Callable, render: Callable, policy_dt: float, render_dt: float = 0.016):
+
+@dataclass
+class RunStats:
+    """
+    Timing of a run, returned by :meth:`Scheduler.run`.
+
+    The phase times are the total wall time spent in the physics step, the policy step and the render,
+    the rest of `wall_time` is spent sleeping in real-time mode.
+    """
+
+    steps: int = 0
+    renders: int = 0
+    wall_time: float = 0.0
+    physics_time: float = 0.0
+    policy_time: float = 0.0
+    render_time: float = 0.0
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.wall_time if self.wall_time > 0 else 0.0
+
+    def summary(self) -> str:
+        def per_step_ms(total, count):
+            return 1000.0 * total / count if count > 0 else 0.0
+
+        return (
+            f"{self.steps} steps in {self.wall_time:.3f} s ({self.steps_per_second:.1f} steps/s), "
+            f"physics {per_step_ms(self.physics_time, self.steps):.3f} ms/step, "
+            f"policy {per_step_ms(self.policy_time, self.steps):.3f} ms/step, "
+            f"render {per_step_ms(self.render_time, self.renders):.3f} ms/frame ({self.renders} frames)"
+        )
+
+
+class Scheduler:
+    """
+    Run policy steps at a fixed simulated rate and render at its own cadence.
+
+    Args:
+        policy_step (Callable): Computes the next actions, e.g. runs the policy on the observations.
+        policy_dt (float): Simulated time of one step in seconds.
+        physics_step (Callable | None): Advances the simulation by `policy_dt`, called before `policy_step`.
+            When None, `policy_step` is expected to do both and is timed as the policy phase.
+        render (Callable | None): Renders the environment, None disables rendering.
+        render_dt (float | None): Time between two renders in seconds, None disables rendering.
+            Real time in `"realtime"` mode, simulated time in `"fast"` mode.
+        mode (str): `"realtime"` paces the steps on the wall clock, `"fast"` runs them back to back.
+        num_steps (int | None): Stop after this number of steps, None runs until `stop` returns True.
+        stop (Callable | None): Called after every step, stops the run when it returns True.
+    """
+
+    def __init__(
+        self,
+        policy_step: Callable,
+        policy_dt: float,
+        physics_step: Optional[Callable] = None,
+        render: Optional[Callable] = None,
+        render_dt: Optional[float] = 0.016,
+        mode: str = REALTIME,
+        num_steps: Optional[int] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ):
+        if mode not in (REALTIME, FAST):
+            raise ValueError(f"unknown scheduler mode '{mode}', expected '{REALTIME}' or '{FAST}'")
+        self.policy_step = policy_step
+        self.policy_dt = policy_dt
+        self.physics_step = physics_step
+        self.render = render if render_dt is not None else None
+        self.render_dt = render_dt
+        self.mode = mode
+        self.num_steps = num_steps
+        self.stop = stop
+        self.stats = RunStats()
+
+    def _done(self) -> bool:
+        if self.num_steps is not None and self.stats.steps >= self.num_steps:
+            return True
+        return self.stop is not None and self.stop()
+
+    def _step(self):
+        stats = self.stats
+        if self.physics_step is not None:
+            t0 = time.perf_counter()
+            self.physics_step()
+            stats.physics_time += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        self.policy_step()
+        stats.policy_time += time.perf_counter() - t0
+        stats.steps += 1
+
+    def _render(self):
+        t0 = time.perf_counter()
+        self.render()
+        self.stats.render_time += time.perf_counter() - t0
+        self.stats.renders += 1
+
+    def run(self) -> RunStats:
+        """Run until `num_steps` steps are done or `stop` returns True, forever otherwise."""
+        self.stats = RunStats()
+        start = time.perf_counter()
+        try:
+            if self.mode == REALTIME:
+                self._run_realtime()
+            else:
+                self._run_fast()
+        finally:
+            self.stats.wall_time = time.perf_counter() - start
+        return self.stats
+
+    def _run_realtime(self):
+        frame_dt = max(self.render_dt or 0.0, self.policy_dt)
+        accumulated_time = 0.0
+        # the budget is checked before the first step too, like in fast mode
+        if self._done():
+            return
+        while True:
+            t0 = time.perf_counter()
+            while accumulated_time > self.policy_dt:
+                accumulated_time -= self.policy_dt
+                self._step()
+                if self._done():
+                    return
+
+            if self.render is not None:
+                self._render()
+            passed = time.perf_counter() - t0
+            if passed < frame_dt:
+                time.sleep(frame_dt - passed)
+
+            accumulated_time += time.perf_counter() - t0
+
+    def _run_fast(self):
+        render_every = max(1, round(self.render_dt / self.policy_dt)) if self.render is not None else 0
+        while not self._done():
+            self._step()
+            if render_every and self.stats.steps % render_every == 0:
+                self._render()
+
+
+def _options_from_env():
+    """
+    Scheduler options overridden by environment variables, so the play scripts can be used for soak
+    tests and benchmarks without editing them:
+
+    - `LEGGED_GYM_RUN_MODE`: `realtime` or `fast`.
+    - `LEGGED_GYM_NUM_STEPS`: number of steps before stopping.
+    - `LEGGED_GYM_RENDER_DT`: time between two renders in seconds, `none` disables rendering.
+    """
+    options = {}
+    if "LEGGED_GYM_RUN_MODE" in os.environ:
+        options["mode"] = os.environ["LEGGED_GYM_RUN_MODE"]
+    if "LEGGED_GYM_NUM_STEPS" in os.environ:
+        options["num_steps"] = int(os.environ["LEGGED_GYM_NUM_STEPS"])
+    if "LEGGED_GYM_RENDER_DT" in os.environ:
+        render_dt = os.environ["LEGGED_GYM_RENDER_DT"]
+        options["render_dt"] = None if render_dt.lower() == "none" else float(render_dt)
+    return options
+
+
+def loop(
+    policy_step: Callable,
+    render: Callable,
+    policy_dt: float,
+    render_dt: float = 0.016,
+    physics_step: Optional[Callable] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> RunStats:
     """
     A simple runner that run the policy step and render in different intervals.
 
+    Runs in real time forever by default, the `LEGGED_GYM_RUN_MODE`, `LEGGED_GYM_NUM_STEPS` and
+    `LEGGED_GYM_RENDER_DT` environment variables switch to the other modes of :class:`Scheduler`.
+    The timing stats are printed when the run stops.
+
     Args:
         policy_step (Callable): A function that performs a single policy step.
         render (Callable): A function that renders the environment.
         policy_dt (float): The time interval for policy steps in seconds.
         render_dt (float): The time interval for rendering in seconds. Default is 0.016 seconds (60 FPS).
+        physics_step (Callable | None): A function that steps the simulation, timed separately from `policy_step`.
+        stop (Callable | None): A function returning True to stop the run.
     """
-    render_dt = max(render_dt, policy_dt)
-    policy_step_accumulated_times = 0.0
-    while True:
-        t0 = time.time()
-        while policy_step_accumulated_times > policy_dt:
-            policy_step_accumulated_times -= policy_dt
-            policy_step()
-
-        render()
-        passed = time.time() - t0
-        if passed < render_dt:
-            time.sleep(render_dt - passed)
-
-        policy_step_accumulated_times += time.time() - t0
+    options = dict(render_dt=render_dt)
+    options.update(_options_from_env())
+    scheduler = Scheduler(
+        policy_step=policy_step, policy_dt=policy_dt, physics_step=physics_step, render=render, stop=stop, **options
+    )
+    stats = scheduler.run()
+    print(stats.summary())
+    return stats
@@ -0,0 +1,101 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+
+import numpy as np
+
+
+class HeightMap:
+    """
+    Heightmap of a `.hfield` file: an int32 nrows, int32 ncols header followed by nrows * ncols float32.
+
+    The elevation is memory-mapped read-only right after the 8 bytes header, so pages are loaded on
+    demand and shared by every env of the process and, through the OS page cache, by every worker
+    process of a job. The data is never copied nor renormalized: `min` / `max` are computed once and
+    passed to :func:`sample_hfield_heights`, which normalizes the sampled values only.
+
+    Use :meth:`load` to get the cached instance of a file.
+    """
+
+    _cache = {}
+
+    def __init__(self, file_path):
+        header = np.fromfile(file_path, dtype=np.int32, count=2)
+        self.nrows = int(header[0])
+        self.ncols = int(header[1])
+        self.height_data = np.memmap(file_path, dtype=np.float32, mode="r", offset=8, shape=(self.nrows, self.ncols))
+        self.min = float(np.min(self.height_data))
+        self.max = float(np.max(self.height_data))
+
+    @classmethod
+    def load(cls, file_path):
+        key = os.path.realpath(file_path)
+        heightmap = cls._cache.get(key)
+        if heightmap is None:
+            heightmap = cls(file_path)
+            cls._cache[key] = heightmap
+        return heightmap
+
+
+def sample_hfield_heights(height_data, hfield_size, hfield_pos, base_pos, base_yaw, points, height_range=(0.0, 1.0)):
+    """
+    Bilinearly sample a height field at scan points attached to the yaw frame of each robot.
+
+    The height field follows the MJCF convention used by the engine: columns span x from -size
+    to +size and rows span y from +size to -size around `hfield_pos`, and the normalized
+    elevation in [0, 1] is scaled by the elevation size `hfield_size[2]`. Raw elevation data is
+    normalized with `height_range` after sampling, which is the same as sampling the normalized data.
+
+    Args:
+        height_data (np.ndarray): Elevation, shape (nrows, ncols).
+        hfield_size (Sequence[float]): MJCF hfield size (radius_x, radius_y, elevation_z, ...).
+        hfield_pos (Sequence[float]): World position of the height field geom.
+        base_pos (np.ndarray): World position of the robot bases, shape (..., 3).
+        base_yaw (np.ndarray): Yaw of the robot bases, shape (...).
+        points (np.ndarray): Scan points in the yaw frame of the base, shape (P, 2) or (P, 3).
+        height_range (tuple[float, float]): (min, max) of `height_data`, mapped to [0, 1].
+
+    Returns:
+        np.ndarray: Terrain world z at every scan point, shape (..., P).
+    """
+    nrows, ncols = height_data.shape
+    cos_yaw = np.cos(base_yaw)[..., None]
+    sin_yaw = np.sin(base_yaw)[..., None]
+    px = points[:, 0]
+    py = points[:, 1]
+    world_x = base_pos[..., 0, None] + cos_yaw * px - sin_yaw * py
+    world_y = base_pos[..., 1, None] + sin_yaw * px + cos_yaw * py
+
+    # continuous grid coordinates, clamped to the border of the height field
+    u = (world_x - hfield_pos[0] + hfield_size[0]) / (2.0 * hfield_size[0]) * (ncols - 1)
+    v = (hfield_pos[1] + hfield_size[1] - world_y) / (2.0 * hfield_size[1]) * (nrows - 1)
+    u = np.clip(u, 0.0, ncols - 1)
+    v = np.clip(v, 0.0, nrows - 1)
+    col = np.minimum(u.astype(np.int64), ncols - 2)
+    row = np.minimum(v.astype(np.int64), nrows - 2)
+    du = u - col
+    dv = v - row
+
+    # gather the four corners of every cell at once from the flattened grid
+    flat = height_data.reshape(-1)
+    index = row * ncols + col
+    h00 = flat[index]
+    h01 = flat[index + 1]
+    h10 = flat[index + ncols]
+    h11 = flat[index + ncols + 1]
+    heights = (h00 * (1.0 - du) + h01 * du) * (1.0 - dv) + (h10 * (1.0 - du) + h11 * du) * dv
+    heights = (heights - height_range[0]) / (height_range[1] - height_range[0])
+    return hfield_pos[2] + heights * hfield_size[2]
@@ -0,0 +1,51 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def write_linear_policy():
+    """
+    Writer of ONNX policies computing actions = obs @ weight (+ bias), with a dynamic batch dimension.
+
+    The returned function takes the output path, a (obs_dim, action_dim) weight and an optional
+    (action_dim,) bias, and returns the path as a string.
+    """
+    onnx = pytest.importorskip("onnx")
+    from onnx import TensorProto, helper, numpy_helper
+
+    def write(path, weight: np.ndarray, bias=None) -> str:
+        obs_dim, action_dim = weight.shape
+        initializers = [numpy_helper.from_array(np.asarray(weight, dtype=np.float32), "weight")]
+        if bias is None:
+            node = helper.make_node("MatMul", ["obs", "weight"], ["actions"])
+        else:
+            node = helper.make_node("Gemm", ["obs", "weight", "bias"], ["actions"])
+            initializers.append(numpy_helper.from_array(np.asarray(bias, dtype=np.float32), "bias"))
+        graph = helper.make_graph(
+            [node],
+            "linear_policy",
+            [helper.make_tensor_value_info("obs", TensorProto.FLOAT, ["batch", obs_dim])],
+            [helper.make_tensor_value_info("actions", TensorProto.FLOAT, ["batch", action_dim])],
+            initializers,
+        )
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        model.ir_version = 8
+        onnx.save(model, str(path))
+        return str(path)
+
+    return write
@@ -0,0 +1,58 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "examples"
+ACCURACY = EXAMPLES_DIR / "bench" / "accuracy.py"
+
+
+def test_accuracy_benchmark_reports_pareto_front(tmp_path):
+    command = [
+        sys.executable,
+        str(ACCURACY),
+        "--scenarios=gyroscope_zero_gravity",
+        "--iterations=1,4",
+        "--timesteps=0.002,0.004",
+        "--reference_iterations=20",
+        "--duration=0.2",
+    ]
+    result = subprocess.run([*command, f"--json={tmp_path / 'accuracy.json'}"], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    (scenario,) = json.loads((tmp_path / "accuracy.json").read_text())["results"]
+    assert scenario["scenario"] == "gyroscope_zero_gravity"
+    assert scenario["reference"] == {"max_iterations": 20, "timestep": 0.002}
+    rows = scenario["rows"]
+    assert [(row["max_iterations"], row["timestep"]) for row in rows] == [
+        (1, 0.002),
+        (4, 0.002),
+        (1, 0.004),
+        (4, 0.004),
+    ]
+    assert any(row["pareto"] for row in rows)
+    for row in rows:
+        # a single free body: no hinge or slide joint, the position and orientation errors are separate
+        assert row["joint_pos_rmse"] is None
+        assert row["free_pos_rmse"] >= 0.0
+        assert 0.0 <= row["orientation_rmse"] <= np.pi
+        assert row["realtime_factor"] > 0.0
+        # no contacts in zero gravity
+        assert row["max_penetration_mm"] == 0.0
@@ -0,0 +1,67 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "examples"
+sys.path.insert(0, str(EXAMPLES_DIR))
+
+from bench.memory import superlinear_growth  # noqa: E402
+
+MEMORY = EXAMPLES_DIR / "bench" / "memory.py"
+MODEL = EXAMPLES_DIR / "assets" / "falling_ball.xml"
+
+
+def test_memory_benchmark_reports_bytes_per_env(tmp_path):
+    command = [sys.executable, str(MEMORY), f"--model={MODEL}", "--batch-sizes=1,16,64,256", "--steps=2"]
+    result = subprocess.run([*command, f"--json={tmp_path / 'memory.json'}"], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    (model,) = json.loads((tmp_path / "memory.json").read_text())["results"]
+    assert model["model"] == "falling_ball"
+    assert [row["num_envs"] for row in model["rows"]] == [1, 16, 64, 256]
+    for row in model["rows"]:
+        # a free body: 7 dof positions and 6 dof velocities per env
+        assert row["dof_state_bytes"] == 13 * 4 * row["num_envs"]
+    fit = model["fit"]
+    assert fit["dof_state_bytes_per_env"] == pytest.approx(13 * 4)
+    parts = ("dof_state", "lidar", "sensors", "contacts", "other")
+    assert sum(fit[f"{part}_bytes_per_env"] for part in parts) == pytest.approx(fit["bytes_per_env"])
+    # the verdict on live RSS depends on the page noise of the run, see test_superlinear_growth
+    assert isinstance(model["superlinear"], bool)
+
+
+@pytest.mark.parametrize(
+    "marginals, superlinear",
+    [
+        ([1000.0, 1010.0, 990.0], False),
+        ([100000.0, 120000.0], False),
+        ([100000.0, 130000.0], True),
+        # page noise, including a first pair with no measurable growth
+        ([0.0, 8000.0], False),
+        ([-4096.0, 30000.0], False),
+        ([1000.0, 40000.0], True),
+        ([0.0, 40000.0], True),
+        ([1000.0], False),
+        ([], False),
+    ],
+)
+def test_superlinear_growth(marginals, superlinear):
+    assert superlinear_growth(marginals, tolerance=0.25, noise_floor=4 * 4096) is superlinear
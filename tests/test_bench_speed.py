@@ -0,0 +1,114 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import csv
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "examples"
+SPEED = EXAMPLES_DIR / "bench" / "speed.py"
+MODEL = EXAMPLES_DIR / "assets" / "falling_ball.xml"
+LIDAR_SCENE = """<mujoco model="phase_lidar">
+  <asset>
+    <lidar name="profile" cutoff="10" pattern="grid" hscan="64" vscan="8" hrange="-180 180" vrange="-15 15" />
+  </asset>
+  <worldbody>
+    <geom name="floor" type="plane" size="5 5 0.1" />
+    <body name="box" pos="0 0 0.5">
+      <freejoint />
+      <geom type="box" size="0.1 0.1 0.1" mass="1" />
+      <site name="lidar_site" size="0.01" />
+    </body>
+  </worldbody>
+  <sensor>
+    <lidar name="lidar" site="lidar_site" asset="profile" exclude="parentbody" />
+    <framepos name="box_pos" objtype="site" objname="lidar_site" />
+  </sensor>
+</mujoco>
+"""
+
+
+def _run_speed(*args, model=MODEL, env=None):
+    command = [sys.executable, str(SPEED), f"--file={model}", "--engine=motrixsim", "--steps=20", "--warmup=0"]
+    return subprocess.run([*command, *args], capture_output=True, text=True, env=env)
+
+
+def test_speed_results_sink_and_baseline_gate(tmp_path):
+    result = _run_speed("--rounds=3", f"--json={tmp_path / 'run.json'}", f"--csv={tmp_path / 'run.csv'}")
+    assert result.returncode == 0, result.stderr
+
+    run = json.loads((tmp_path / "run.json").read_text())
+    assert run["host"]["cpu_count"] > 0
+    assert run["host"]["versions"]["motrixsim"]
+    (record,) = run["results"]
+    assert (record["model"], record["engine"], record["num_envs"]) == ("falling_ball", "motrixsim", 0)
+    assert len(record["rounds"]) == 3
+    throughput = record["stats"]["throughput"]
+    assert throughput["p5"] <= throughput["median"] <= throughput["p95"]
+    with open(tmp_path / "run.csv", newline="") as f:
+        assert [int(row["round"]) for row in csv.DictReader(f)] == [0, 1, 2]
+
+    # a baseline far faster than any machine fails the gate, a far slower one passes it
+    median = throughput["median"]
+    for scale, returncode in ((1e6, 1), (1e-6, 0)):
+        throughput["median"] = median * scale
+        (tmp_path / "baseline.json").write_text(json.dumps(run))
+        result = _run_speed(f"--baseline={tmp_path / 'baseline.json'}")
+        assert result.returncode == returncode, result.stdout + result.stderr
+
+    # an ambient RAYON_NUM_THREADS is not part of the result key
+    env = {**os.environ, "RAYON_NUM_THREADS": "1"}
+    result = _run_speed(f"--baseline={tmp_path / 'baseline.json'}", env=env)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    # a run that matches no baseline result has nothing to compare and fails the gate
+    result = _run_speed(f"--baseline={tmp_path / 'baseline.json'}", "--max_iterations=7")
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert "no baseline result" in result.stdout
+
+
+def test_speed_scaling_sweep_runs_every_cell(tmp_path):
+    result = _run_speed("--sweep_envs=8,1", "--sweep_threads=2,1,2", f"--json={tmp_path / 'sweep.json'}")
+    assert result.returncode == 0, result.stderr
+    assert "Parallel efficiency" in result.stdout
+
+    records = json.loads((tmp_path / "sweep.json").read_text())["results"]
+    assert [(r["num_envs"], r["threads"]) for r in records] == [(1, 1), (1, 2), (8, 1), (8, 2)]
+    assert all(r["model"] == "falling_ball" for r in records)
+
+
+def test_speed_phase_breakdown_toggles_contacts_solver_and_sensors(tmp_path):
+    model = tmp_path / "phase_lidar.xml"
+    model.write_text(LIDAR_SCENE)
+    result = _run_speed("--phases", "--rounds=2", f"--json={tmp_path / 'phases.json'}", model=model)
+    assert result.returncode == 0, result.stderr
+
+    (record,) = json.loads((tmp_path / "phases.json").read_text())["results"]
+    assert set(record["variants"]) == {"full", "no_contacts", "double_iterations", "no_lidar", "no_sensors"}
+    assert {"collision + contacts", "lidar sensors", "other sensors"} <= set(record["phases"])
+    # the phases add up to the full step
+    full = record["variants"]["full"]["median"]
+    assert sum(record["phases"].values()) == pytest.approx(full)
+    assert record["stats"]["avg_step_ms"]["median"] == pytest.approx(full)
+
+    # the full step of a breakdown never stands in for a plain run in the baseline gate
+    result = _run_speed(f"--baseline={tmp_path / 'phases.json'}", model=model)
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert "no baseline result" in result.stdout
@@ -0,0 +1,124 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "examples" / "control"))
+
+from g1_motion_tracking_helpers import contract, reference  # noqa: E402
+
+NUM_BODIES = max(contract.MOTION_BODY_INDICES) + 1
+BODY_INDICES = list(contract.MOTION_BODY_INDICES)
+
+
+def _write_clip(path, rng, num_frames, fps=50):
+    quat = rng.standard_normal((num_frames, NUM_BODIES, 4))
+    np.savez_compressed(
+        path,
+        fps=np.array([fps]),
+        joint_pos=rng.standard_normal((num_frames, contract.EXPECTED_ACTION_DIM)),
+        joint_vel=rng.standard_normal((num_frames, contract.EXPECTED_ACTION_DIM)),
+        body_pos_w=rng.standard_normal((num_frames, NUM_BODIES, 3)),
+        body_quat_w=quat / np.linalg.norm(quat, axis=-1, keepdims=True),
+        body_lin_vel_w=rng.standard_normal((num_frames, NUM_BODIES, 3)),
+        body_ang_vel_w=rng.standard_normal((num_frames, NUM_BODIES, 3)),
+    )
+    return path
+
+
+@pytest.fixture
+def clips(tmp_path):
+    rng = np.random.default_rng(0)
+    return [
+        _write_clip(tmp_path / f"clip_{i}.npz", rng, num_frames, fps=30 + 10 * i)
+        for i, num_frames in enumerate((7, 3, 11))
+    ]
+
+
+def test_motion_library_hands_out_views_of_mapped_clips(tmp_path, clips):
+    library = reference.MotionLibrary.build(tmp_path / "library", clips, body_indices=BODY_INDICES)
+    assert library.num_clips == 3
+    assert library.clip_names == ["clip_0", "clip_1", "clip_2"]
+    np.testing.assert_array_equal(library.fps, [30, 40, 50])
+    assert all(isinstance(array, np.memmap) for array in library.arrays.values())
+
+    expected = [reference.MotionReference(str(clip), body_indices=BODY_INDICES) for clip in clips]
+    frame = library.frame(2, 13)
+    assert np.shares_memory(frame.body_quat_w, library.arrays["body_quat_w"])
+    assert not frame.joint_pos.flags.writeable
+    np.testing.assert_array_equal(frame.body_quat_w, expected[2].body_quat_w[13 % 11])
+
+    # one frame per robot, by (clip_id, frame), wrapped around the length of each clip
+    clip_ids = np.array([0, 1, 2, 1])
+    frame_indices = np.array([6, 4, 10, 2])
+    out = library.allocate((4,))
+    assert library.frames(clip_ids, frame_indices, out=out) is out
+    for i, (clip_id, frame_index) in enumerate(zip(clip_ids, frame_indices)):
+        single = expected[clip_id].frame(frame_index)
+        for name in reference.MOTION_FIELDS:
+            np.testing.assert_array_equal(getattr(out, name)[i], getattr(single, name))
+
+    # a clip of the library plays like the .npz it was built from, without copying the frames
+    clip = reference.MotionReference(str(tmp_path / "library"), body_indices=BODY_INDICES, clip_id=2)
+    assert clip.fps == 50 and clip.num_frames == 11
+    clip.advance(4)
+    assert isinstance(clip.current().joint_vel, np.memmap)
+    np.testing.assert_array_equal(clip.current().body_pos_w, expected[2].frame(4).body_pos_w)
+
+    with pytest.raises(ValueError, match="keeps the bodies"):
+        reference.MotionReference(str(tmp_path / "library"), body_indices=BODY_INDICES[:3])
+
+
+def test_motion_reference_frames_are_read_only_views(clips):
+    motion = reference.MotionReference(str(clips[0]), body_indices=BODY_INDICES)
+    frame = motion.frame(3)
+    assert np.shares_memory(frame.joint_pos, motion.joint_pos)
+    with pytest.raises(ValueError):
+        frame.joint_pos[0] = 1.0
+
+    frames = motion.frames(np.array([1, 8]), out=motion.allocate((2,)))
+    np.testing.assert_array_equal(frames.body_pos_w, motion.body_pos_w[[1, 1]])
+
+
+def test_motion_sampling_interpolates_between_frames(tmp_path, clips):
+    clip = reference.MotionReference(str(clips[0]), body_indices=BODY_INDICES)
+    # integer frame times match the frames
+    exact = clip.sample(3 / clip.fps)
+    np.testing.assert_allclose(exact.joint_pos, clip.frame(3).joint_pos, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(exact.body_quat_w, clip.frame(3).body_quat_w, rtol=1e-5, atol=1e-6)
+
+    # half way between two frames, the vectors are averaged and the quaternions slerped
+    mid = clip.sample(np.array([2.5, 6.5]) / clip.fps, out=clip.allocate((2,)))
+    f2, f3, f6 = clip.frame(2), clip.frame(3), clip.frame(6)
+    np.testing.assert_allclose(mid.joint_pos[0], (f2.joint_pos + f3.joint_pos) / 2, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(mid.body_quat_w, axis=-1), 1.0, rtol=1e-5)
+    q0 = f2.body_quat_w
+    q1 = np.where(np.sum(q0 * f3.body_quat_w, axis=-1, keepdims=True) < 0, -f3.body_quat_w, f3.body_quat_w)
+    half = (q0 + q1) / np.linalg.norm(q0 + q1, axis=-1, keepdims=True)
+    np.testing.assert_allclose(mid.body_quat_w[0], half, rtol=1e-4, atol=1e-5)
+    # the last frame is held instead of blending into the first one
+    np.testing.assert_allclose(mid.joint_pos[1], f6.joint_pos, rtol=1e-6, atol=1e-6)
+
+    # the library samples every robot in its own clip, at the fps of that clip
+    library = reference.MotionLibrary.build(tmp_path / "library", clips, body_indices=BODY_INDICES)
+    clip_ids = np.array([0, 2])
+    times = np.array([2.5 / 30, 4.0 / 50])
+    out = library.sample(clip_ids, times, out=library.allocate((2,)))
+    np.testing.assert_allclose(out.joint_pos[0], mid.joint_pos[0], rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(out.body_pos_w[1], library.frame(2, 4).body_pos_w, rtol=1e-5, atol=1e-6)
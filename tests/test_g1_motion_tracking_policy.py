@@ -0,0 +1,150 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "examples"
+sys.path.insert(0, str(EXAMPLES_DIR / "utils"))
+sys.path.insert(0, str(EXAMPLES_DIR / "control"))
+
+from g1_motion_tracking_helpers import contract, initializer, reference  # noqa: E402
+from g1_motion_tracking_helpers import policy as policy_module  # noqa: E402
+from g1_motion_tracking_helpers.robot import G1MotionTrackingRobot  # noqa: E402
+
+from motrixsim import SceneData, load_model  # noqa: E402
+
+NUM_MOTION_BODIES = max(contract.MOTION_BODY_INDICES) + 1
+
+
+def _write_robot_model(path):
+    """A stand-in for the G1 with the joint, actuator, sensor and anchor names of the tracking policy."""
+    joints = "".join(
+        f'<body name="{name}_link"><joint name="{name}" type="hinge" axis="0 1 0" range="-1 1"/>'
+        '<geom type="sphere" size="0.01" mass="0.1"/></body>'
+        for name in contract.JOINT_NAMES
+    )
+    actuators = "".join(f'<position name="{name}" joint="{name}" kp="20"/>' for name in contract.ACTUATOR_NAMES)
+    path.write_text(
+        f"""<mujoco>
+  <worldbody>
+    <geom type="plane" size="5 5 0.1"/>
+    <body name="pelvis" pos="0 0 0.8">
+      <freejoint/>
+      <site name="imu"/>
+      <geom type="box" size="0.1 0.1 0.1" mass="5"/>
+      <body name="{contract.ANCHOR_BODY_NAME}" pos="0 0 0.2">
+        <site name="imu_torso"/>
+        <geom type="box" size="0.1 0.1 0.1" mass="3"/>
+        {joints}
+      </body>
+    </body>
+  </worldbody>
+  <actuator>{actuators}</actuator>
+  <sensor>
+    <velocimeter name="{contract.LOCAL_LINEAR_VELOCITY_SENSOR}" site="imu"/>
+    <gyro name="{contract.GYRO_SENSOR}" site="imu_torso"/>
+  </sensor>
+</mujoco>"""
+    )
+    return str(path)
+
+
+def _write_motion(path, rng, num_frames=12):
+    quat = rng.standard_normal((num_frames, NUM_MOTION_BODIES, 4))
+    body_pos_w = rng.uniform(-0.2, 0.2, (num_frames, NUM_MOTION_BODIES, 3))
+    body_pos_w[..., 2] += 0.8
+    np.savez(
+        path,
+        fps=np.array([50]),
+        joint_pos=rng.uniform(-0.5, 0.5, (num_frames, contract.EXPECTED_ACTION_DIM)),
+        joint_vel=rng.standard_normal((num_frames, contract.EXPECTED_ACTION_DIM)),
+        body_pos_w=body_pos_w,
+        body_quat_w=quat / np.linalg.norm(quat, axis=-1, keepdims=True),
+        body_lin_vel_w=0.1 * rng.standard_normal((num_frames, NUM_MOTION_BODIES, 3)),
+        body_ang_vel_w=0.1 * rng.standard_normal((num_frames, NUM_MOTION_BODIES, 3)),
+    )
+    return reference.MotionReference(str(path), body_indices=contract.MOTION_BODY_INDICES)
+
+
+def test_quaternion_kernels_match_scipy():
+    transform = pytest.importorskip("scipy.spatial.transform")
+    rng = np.random.default_rng(0)
+    quat = rng.standard_normal((16, 4)).astype(np.float32)
+    quat /= np.linalg.norm(quat, axis=-1, keepdims=True)
+    other = quat[::-1]
+    vector = rng.standard_normal((16, 3)).astype(np.float32)
+
+    def rotation(wxyz):
+        return transform.Rotation.from_quat(wxyz[..., [1, 2, 3, 0]])
+
+    np.testing.assert_allclose(policy_module._quat_apply(quat, vector), rotation(quat).apply(vector), atol=1e-5)
+    np.testing.assert_allclose(policy_module._matrix_from_quat(quat), rotation(quat).as_matrix(), atol=1e-5)
+    np.testing.assert_allclose(
+        policy_module._matrix_from_quat(policy_module._quat_mul(quat, other)),
+        (rotation(quat) * rotation(other)).as_matrix(),
+        atol=1e-5,
+    )
+    # single quaternions keep their shape
+    assert policy_module._quat_apply(quat[0], vector[0]).shape == (3,)
+    assert policy_module._matrix_from_quat(quat[0]).shape == (3, 3)
+
+
+def test_batched_policy_matches_single_robots(tmp_path, write_linear_policy):
+    rng = np.random.default_rng(0)
+    model = load_model(_write_robot_model(tmp_path / "g1.xml"))
+    motion = _write_motion(tmp_path / "motion.npz", rng)
+    weight = 0.05 * rng.standard_normal((contract.EXPECTED_OBS_DIM, contract.EXPECTED_ACTION_DIM))
+    onnx_path = write_linear_policy(tmp_path / "policy.onnx", weight)
+    tracking_robot = G1MotionTrackingRobot(model.get_body("pelvis"))
+
+    num_envs = 3
+    offsets = np.arange(num_envs) * 4
+    batched = SceneData(model, batch=(num_envs,))
+    batched_policy = policy_module.G1MotionTrackingPolicy(tracking_robot, onnx_path)
+    initializer.initialize_motion_tracking_state(tracking_robot, model, batched, motion.frames(offsets))
+
+    singles = []
+    for offset in offsets:
+        data = SceneData(model)
+        initializer.initialize_motion_tracking_state(tracking_robot, model, data, motion.frame(offset))
+        singles.append((policy_module.G1MotionTrackingPolicy(tracking_robot, onnx_path), data))
+
+    for frame in range(3):
+        for _ in range(3):
+            model.step(batched)
+            for _, data in singles:
+                model.step(data)
+        actions = batched_policy.step(batched, motion.frames(offsets + frame))
+        assert actions.shape == (num_envs, contract.EXPECTED_ACTION_DIM)
+        for i, (policy, data) in enumerate(singles):
+            np.testing.assert_allclose(
+                policy.step(data, motion.frame(offsets[i] + frame)), actions[i], rtol=1e-4, atol=1e-5
+            )
+
+    observation = batched_policy.build_actor_observation(batched, motion.frames(offsets))
+    assert observation.shape == (num_envs, contract.EXPECTED_OBS_DIM)
+    for i, (policy, data) in enumerate(singles):
+        single = policy.build_actor_observation(data, motion.frame(offsets[i]))
+        np.testing.assert_allclose(observation[i], single, rtol=1e-4, atol=1e-5)
+        # the anchor position is the motion anchor expressed in the frame of the robot torso
+        anchor_pose = model.get_link(contract.ANCHOR_BODY_NAME).get_pose(data)
+        anchor_quat = policy_module._xyzw_to_wxyz(anchor_pose[3:7])
+        motion_anchor = motion.frame(offsets[i]).body_pos_w[contract.BODY_NAMES.index(contract.ANCHOR_BODY_NAME)]
+        expected = policy_module._quat_apply(policy_module._quat_inv(anchor_quat), motion_anchor - anchor_pose[:3])
+        np.testing.assert_allclose(single[58:61], expected, rtol=1e-4, atol=1e-5)
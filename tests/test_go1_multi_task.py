@@ -0,0 +1,97 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from motrixsim import msd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "examples"))
+
+import go1_multi_task as mt
+from utils.robot import Go2Robot
+
+
+@pytest.fixture
+def controller_class(tmp_path, write_linear_policy):
+    rng = np.random.default_rng(0)
+
+    def write(path, obs_dim):
+        weight = 0.05 * rng.standard_normal((obs_dim, 12))
+        return write_linear_policy(path, weight, 0.05 * rng.standard_normal(12))
+
+    class Go2MultiTaskPolicy(mt.Go1MultiTaskPolicy):
+        # the Go1 meshes are not always available, the Go2 has the same joints, sensors and actuators
+        robot_class = Go2Robot
+        first_actuator = "FL_hip"
+        policy_paths = {
+            mode: write(tmp_path / f"{mode}.onnx", obs_slice.stop - obs_slice.start)
+            for mode, obs_slice in mt.OBS_SLICES.items()
+        }
+
+    return Go2MultiTaskPolicy
+
+
+def test_mode_requests_are_vectorized(controller_class):
+    policy = controller_class(msd.from_file(Go2Robot.mjcf_path).build())
+    policy.reset(4)
+    policy.modes[:] = [mt.JOYSTICK, mt.HANDSTAND, mt.FOOTSTAND, mt.GETUP]
+
+    policy.handle_mode_request("handstand")
+    np.testing.assert_array_equal(policy.modes, [mt.JOYSTICK, mt.GETUP, mt.GETUP, mt.JOYSTICK])
+    np.testing.assert_array_equal(policy.wait_to_stand, [mt.HANDSTAND, mt.NO_MODE, mt.NO_MODE, mt.NO_MODE])
+    np.testing.assert_array_equal(policy.mode_to_getup, [mt.NO_MODE, mt.HANDSTAND, mt.FOOTSTAND, mt.NO_MODE])
+    np.testing.assert_array_equal(policy.mode_to_getup_wait_steps, [0, 15, 15, 0])
+
+    policy.handle_mode_request("recovery", env_mask=np.array([True, True, False, False]))
+    np.testing.assert_array_equal(policy.modes, [mt.GETUP, mt.JOYSTICK, mt.GETUP, mt.JOYSTICK])
+    np.testing.assert_array_equal(policy.wait_to_stand, mt.NO_MODE)
+    assert policy.status_text == "joystick: 2, getup: 2"
+
+
+def test_batched_controller_matches_single_instance_controllers(controller_class):
+    model = msd.from_file(Go2Robot.mjcf_path).build()
+    requests = [None, "handstand", "recovery"]
+    commands = np.array([[0.5, 0.0, 0.2], [0.0, 0.0, 0.0], [0.0, 0.3, 0.0]], dtype=np.float32)
+
+    batch_policy = controller_class(model)
+    batch = batch_policy.reset(len(requests))
+    singles = []
+    for i, request in enumerate(requests):
+        single_policy = controller_class(model)
+        single_data = single_policy.reset()
+        if request is not None:
+            single_policy.handle_mode_request(request)
+            batch_policy.handle_mode_request(request, env_mask=np.arange(len(requests)) == i)
+        singles.append((single_policy, single_data))
+
+    for step in range(40):
+        model.step(batch)
+        for _, single_data in singles:
+            model.step(single_data)
+        if step % 4 == 3:
+            assert batch_policy.step(batch, commands) is None
+            for i, (single_policy, single_data) in enumerate(singles):
+                single_policy.step(single_data, commands[i])
+            np.testing.assert_array_equal(batch_policy.modes, [policy.modes[0] for policy, _ in singles])
+            np.testing.assert_allclose(
+                batch_policy.last_action, [policy.last_action[0] for policy, _ in singles], rtol=1e-4, atol=1e-4
+            )
+        np.testing.assert_allclose(batch.dof_pos, [data.dof_pos for _, data in singles], rtol=1e-4, atol=1e-4)
+    # the handstand request went through the wait-to-stand transition
+    assert batch_policy.modes[1] == mt.HANDSTAND
@@ -0,0 +1,86 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import importlib
+
+import numpy as np
+import onnxruntime as ort
+import pytest
+
+from legged_gym.utils import onnx_session
+from legged_gym.utils.policy import OnnxPolicy
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("MOTRIXSIM_ONNX_CACHE", str(cache_dir))
+    onnx_session.clear_sessions()
+    yield cache_dir
+    onnx_session.clear_sessions()
+
+
+def test_sessions_are_shared_and_optimized_graph_is_cached(tmp_path, cache_dir, write_linear_policy):
+    rng = np.random.default_rng(0)
+    weight = rng.standard_normal((6, 3)).astype(np.float32)
+    bias = rng.standard_normal(3).astype(np.float32)
+    path = write_linear_policy(tmp_path / "policy.onnx", weight, bias)
+
+    session = onnx_session.get_session(path)
+    assert onnx_session.get_session(path) is session
+    assert onnx_session.get_session(path, intra_op_num_threads=2) is not session
+    cached = list(cache_dir.glob("policy-*.onnx"))
+    assert len(cached) == 1
+
+    # two policies on the same file share the session but not their bound buffers
+    first, second = OnnxPolicy(path, intra_op_num_threads=1), OnnxPolicy(path, intra_op_num_threads=1)
+    assert first.session is second.session
+    obs = rng.standard_normal((4, 6)).astype(np.float32)
+    expected = obs @ weight + bias
+    np.testing.assert_allclose(first.infer(obs), expected, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(second.infer(obs[:2]), expected[:2], rtol=1e-5, atol=1e-5)
+
+    # a new process loads the optimized graph from the cache
+    onnx_session.clear_sessions()
+    warm = onnx_session.get_session(path)
+    assert warm is not session
+    assert list(cache_dir.glob("policy-*.onnx")) == cached
+    (actions,) = warm.run(None, {"obs": obs})
+    np.testing.assert_allclose(actions, expected, rtol=1e-5, atol=1e-5)
+
+    # the hardware specific ORT_ENABLE_ALL optimizations are not saved, both levels share the cached graph
+    extended = onnx_session.get_session(path, graph_optimization_level=ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED)
+    assert list(cache_dir.glob("policy-*.onnx")) == cached
+    (actions,) = extended.run(None, {"obs": obs})
+    np.testing.assert_allclose(actions, expected, rtol=1e-5, atol=1e-5)
+
+    # a retrained model gets its own cache entry
+    write_linear_policy(tmp_path / "policy.onnx", -weight, bias)
+    onnx_session.clear_sessions()
+    (actions,) = onnx_session.get_session(path).run(None, {"obs": obs})
+    np.testing.assert_allclose(actions, obs @ -weight + bias, rtol=1e-5, atol=1e-5)
+    assert len(list(cache_dir.glob("policy-*.onnx"))) == 2
+    assert not list(cache_dir.glob("tmp*"))
+
+
+def test_default_thread_counts_are_single_threaded_unless_overridden(monkeypatch):
+    monkeypatch.setenv("MOTRIXSIM_ONNX_NUM_THREADS", "4")
+    assert importlib.reload(onnx_session).DEFAULT_INTRA_OP_NUM_THREADS == 4
+
+    monkeypatch.delenv("MOTRIXSIM_ONNX_NUM_THREADS")
+    importlib.reload(onnx_session)
+    # never the ONNX Runtime thread pool sized to the cores, which competes with the physics threads
+    assert onnx_session.DEFAULT_INTRA_OP_NUM_THREADS == 1
+    assert onnx_session.DEFAULT_INTER_OP_NUM_THREADS == 1
@@ -0,0 +1,87 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+from legged_gym.utils.policy import OnnxPolicy, PolicyRouter
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def _linear(rng, obs_dim, action_dim):
+    return (
+        rng.standard_normal((obs_dim, action_dim)).astype(np.float32),
+        rng.standard_normal(action_dim).astype(np.float32),
+    )
+
+
+def test_onnx_policy_evaluates_batch_in_bound_buffers(tmp_path, rng, write_linear_policy):
+    weight, bias = _linear(rng, 6, 3)
+    policy = OnnxPolicy(write_linear_policy(tmp_path / "policy.onnx", weight, bias), intra_op_num_threads=1)
+
+    obs = rng.standard_normal((8, 6)).astype(np.float32)
+    actions = policy.infer(obs)
+    np.testing.assert_allclose(actions, obs @ weight + bias, rtol=1e-5, atol=1e-5)
+
+    # the same observation buffer, updated in place, is evaluated into the same action buffer
+    obs[:] = rng.standard_normal((8, 6))
+    assert np.shares_memory(policy.infer(obs), actions)
+    np.testing.assert_allclose(actions, obs @ weight + bias, rtol=1e-5, atol=1e-5)
+
+    single = policy.infer(obs[3])
+    assert single.shape == (3,)
+    np.testing.assert_allclose(single, obs[3] @ weight + bias, rtol=1e-5, atol=1e-5)
+
+
+def test_policy_router_routes_sub_batches_by_state(tmp_path, rng, write_linear_policy):
+    walk_weight, walk_bias = _linear(rng, 4, 2)
+    kick_weight, kick_bias = _linear(rng, 5, 3)
+    router = PolicyRouter(
+        {
+            "walk": OnnxPolicy(write_linear_policy(tmp_path / "walk.onnx", walk_weight, walk_bias)),
+            "kick": OnnxPolicy(write_linear_policy(tmp_path / "kick.onnx", kick_weight, kick_bias)),
+        }
+    )
+    walk_obs = rng.standard_normal((5, 4)).astype(np.float32)
+    kick_obs = rng.standard_normal((5, 5)).astype(np.float32)
+    states = np.array(["walk", "kick", "walk", "walk", "kick"])
+
+    results = router.infer(states, {"walk": walk_obs, "kick": kick_obs})
+
+    walk_ids, walk_actions = results["walk"]
+    kick_ids, kick_actions = results["kick"]
+    np.testing.assert_array_equal(walk_ids, [0, 2, 3])
+    np.testing.assert_array_equal(kick_ids, [1, 4])
+    np.testing.assert_allclose(walk_actions, walk_obs[walk_ids] @ walk_weight + walk_bias, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(kick_actions, kick_obs[kick_ids] @ kick_weight + kick_bias, rtol=1e-5, atol=1e-5)
+
+    assert "kick" not in router.infer(np.array(["walk"] * 5), {"walk": walk_obs, "kick": kick_obs})
+
+
+def test_policy_router_keeps_actions_of_a_policy_shared_by_states(tmp_path, rng, write_linear_policy):
+    weight, bias = _linear(rng, 4, 2)
+    policy = OnnxPolicy(write_linear_policy(tmp_path / "policy.onnx", weight, bias))
+    router = PolicyRouter({"walk": policy, "trot": policy})
+    obs = rng.standard_normal((4, 4)).astype(np.float32)
+
+    results = router.infer(np.array(["walk", "trot", "walk", "trot"]), obs)
+
+    for state in ("walk", "trot"):
+        env_ids, actions = results[state]
+        np.testing.assert_allclose(actions, obs[env_ids] @ weight + bias, rtol=1e-5, atol=1e-5)
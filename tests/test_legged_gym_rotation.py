@@ -0,0 +1,55 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+from legged_gym.utils.rotation import (
+    projected_gravity,
+    quat_conjugate,
+    quat_mul,
+    quat_rotate,
+    up_axis_z,
+    yaw_from_quat,
+)
+
+transform = pytest.importorskip("scipy.spatial.transform")
+
+
+@pytest.fixture
+def quats():
+    quat = np.random.default_rng(0).standard_normal((32, 4))
+    return quat / np.linalg.norm(quat, axis=-1, keepdims=True)
+
+
+def test_rotation_kernels_match_scipy(quats):
+    rotation = transform.Rotation.from_quat(quats)
+    np.testing.assert_allclose(projected_gravity(quats), rotation.apply([0.0, 0.0, -1.0], inverse=True), atol=1e-12)
+    np.testing.assert_allclose(up_axis_z(quats), rotation.apply([0.0, 0.0, 1.0])[:, 2], atol=1e-12)
+    vec = np.array([0.4, -0.1, 0.05])
+    np.testing.assert_allclose(quat_rotate(quats, vec), rotation.apply(vec), atol=1e-12)
+    np.testing.assert_allclose(yaw_from_quat(quats), rotation.as_euler("ZYX")[:, 0], atol=1e-12)
+    other = quats[::-1]
+    product = transform.Rotation.from_quat(quat_mul(quats, quat_conjugate(other)))
+    np.testing.assert_allclose(
+        product.as_matrix(), (rotation * transform.Rotation.from_quat(other).inv()).as_matrix(), atol=1e-12
+    )
+
+
+def test_rotation_kernels_accept_single_quaternion(quats):
+    out = np.empty(3, dtype=np.float32)
+    assert projected_gravity(quats[0].astype(np.float32), out=out) is out
+    np.testing.assert_allclose(out, projected_gravity(quats)[0], atol=1e-6)
+    assert np.ndim(up_axis_z(quats[0])) == 0
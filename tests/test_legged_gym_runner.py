@@ -0,0 +1,97 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import pytest
+
+from legged_gym.utils import runner
+from legged_gym.utils.runner import Scheduler
+
+
+class _Counter:
+    def __init__(self):
+        self.calls = []
+
+    def phase(self, name):
+        return lambda: self.calls.append(name)
+
+
+def test_fast_mode_runs_fixed_number_of_steps_with_render_cadence():
+    counter = _Counter()
+    scheduler = Scheduler(
+        policy_step=counter.phase("policy"),
+        physics_step=counter.phase("physics"),
+        render=counter.phase("render"),
+        policy_dt=0.02,
+        render_dt=0.1,
+        mode="fast",
+        num_steps=20,
+    )
+    stats = scheduler.run()
+
+    assert stats.steps == 20
+    assert stats.renders == 4
+    assert counter.calls[:2] == ["physics", "policy"]
+    assert counter.calls.count("physics") == 20
+    assert stats.physics_time > 0.0 and stats.policy_time > 0.0
+    assert stats.wall_time >= stats.physics_time + stats.policy_time + stats.render_time
+
+
+def test_stop_condition_and_disabled_render():
+    counter = _Counter()
+    stats = Scheduler(
+        policy_step=counter.phase("policy"),
+        render=counter.phase("render"),
+        policy_dt=0.02,
+        render_dt=None,
+        mode="fast",
+        stop=lambda: len(counter.calls) >= 7,
+    ).run()
+
+    assert stats.steps == 7
+    assert stats.renders == 0
+    assert "render" not in counter.calls
+
+
+def test_realtime_mode_paces_steps_on_the_wall_clock():
+    stats = Scheduler(policy_step=lambda: None, policy_dt=0.01, render_dt=None, num_steps=10).run()
+
+    assert stats.steps == 10
+    assert stats.wall_time >= 0.09
+
+
+@pytest.mark.parametrize("mode", ["realtime", "fast"])
+def test_zero_step_budget_runs_no_step(mode):
+    counter = _Counter()
+    stats = Scheduler(policy_step=counter.phase("policy"), policy_dt=0.01, render_dt=None, mode=mode, num_steps=0).run()
+
+    assert stats.steps == 0
+    assert counter.calls == []
+
+
+def test_loop_options_from_environment(monkeypatch):
+    monkeypatch.setenv("LEGGED_GYM_RUN_MODE", "fast")
+    monkeypatch.setenv("LEGGED_GYM_NUM_STEPS", "5")
+    monkeypatch.setenv("LEGGED_GYM_RENDER_DT", "none")
+    counter = _Counter()
+
+    stats = runner.loop(policy_step=counter.phase("policy"), render=counter.phase("render"), policy_dt=1.0)
+
+    assert stats.steps == 5
+    assert counter.calls == ["policy"] * 5
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        Scheduler(policy_step=lambda: None, policy_dt=0.02, mode="warp")
@@ -0,0 +1,139 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+
+from legged_gym.envs.base.legged_robot_config import LeggedRobotCfg
+from legged_gym.envs.base.vec_legged_robot import VecLeggedRobot
+from legged_gym.utils.rotation import yaw_from_quat
+from legged_gym.utils.terrain import HeightMap, sample_hfield_heights
+from motrixsim import SceneData, TerrainScanner, msd
+
+NROWS, NCOLS = 5, 7
+HFIELD_SIZE = [2.0, 3.0, 0.5, 0.1]
+HFIELD_POS = [0.5, 0.25, 0.2]
+ELEVATION = np.random.default_rng(0).random((NROWS, NCOLS))
+ELEVATION[0, 0] = 0.0
+ELEVATION[-1, -1] = 1.0
+
+MJCF = f"""
+<mujoco>
+  <asset>
+    <hfield name="terrain" nrow="{NROWS}" ncol="{NCOLS}"
+            elevation="{" ".join(str(value) for value in ELEVATION.flatten())}"
+            size="{" ".join(str(value) for value in HFIELD_SIZE)}"/>
+  </asset>
+  <worldbody>
+    <geom name="floor" type="hfield" hfield="terrain" pos="{" ".join(str(value) for value in HFIELD_POS)}"/>
+    <body name="trunk" pos="0.3 -0.2 1" quat="0.9238795 0 0 0.3826834">
+      <freejoint/>
+      <geom type="box" size="0.2 0.1 0.05" mass="5"/>
+      <site name="imu"/>
+      <body name="leg" pos="0.2 0 0">
+        <joint name="leg_joint" type="hinge" axis="0 1 0"/>
+        <geom type="capsule" fromto="0 0 0 0 0 -0.3" size="0.02" mass="0.5"/>
+      </body>
+    </body>
+  </worldbody>
+  <actuator>
+    <motor name="leg_motor" joint="leg_joint"/>
+  </actuator>
+  <sensor>
+    <gyro name="gyro" site="imu"/>
+    <velocimeter name="local_linvel" site="imu"/>
+  </sensor>
+</mujoco>
+"""
+
+
+def test_sample_hfield_heights_matches_terrain_scanner():
+    model = msd.from_str(MJCF).build()
+    data = SceneData(model, batch=(3,))
+    model.forward_kinematic(data)
+    points = np.random.default_rng(1).uniform(-1.5, 1.5, (20, 2)).astype(np.float32)
+    scanner = TerrainScanner(model.get_geom("floor"), model.get_link("trunk"), points, alignment="yaw")
+
+    pose = model.get_body("trunk").get_pose(data)
+    heights = sample_hfield_heights(
+        ELEVATION, HFIELD_SIZE, HFIELD_POS, pose[:, :3], yaw_from_quat(pose[:, 3:7]), points
+    )
+    np.testing.assert_allclose(heights, scanner.scan(data), atol=1e-5)
+
+
+def test_vec_env_appends_height_scan_to_observations(tmp_path):
+    scene_path = tmp_path / "scene.xml"
+    scene_path.write_text(MJCF)
+
+    class Cfg(LeggedRobotCfg):
+        class env(LeggedRobotCfg.env):
+            num_observations = 3
+            num_actions = 1
+            num_envs = 2
+
+        class init_state(LeggedRobotCfg.init_state):
+            default_joint_angles = {"leg_joint": 0.0}
+
+        class terrain(LeggedRobotCfg.terrain):
+            measure_heights = True
+            geom_name = "floor"
+
+        class asset(LeggedRobotCfg.asset):
+            file = str(scene_path)
+            body_name = "trunk"
+
+        class viewer(LeggedRobotCfg.viewer):
+            render_mode = None
+
+    class Env(VecLeggedRobot):
+        def compute_obs(self):
+            return self.gravity.astype(np.float32)
+
+    env = Env(Cfg)
+    env.step(np.zeros((2, 1), dtype=np.float32))
+
+    num_points = len(Cfg.terrain.measured_points_x) * len(Cfg.terrain.measured_points_y)
+    obs = env.get_observation()
+    assert env.measured_heights.shape == (2, num_points)
+    assert obs.shape == (2, 3 + num_points)
+    np.testing.assert_allclose(obs[:, 3:], env.compute_height_obs(), atol=1e-6)
+
+
+def test_heightmap_is_memory_mapped_once_and_normalized_on_sampling(tmp_path):
+    path = tmp_path / "terrain.hfield"
+    elevation = (ELEVATION * 3.0 - 1.0).astype(np.float32)
+    with open(path, "wb") as f:
+        np.array([NROWS, NCOLS], dtype=np.int32).tofile(f)
+        elevation.tofile(f)
+
+    heightmap = HeightMap.load(str(path))
+    assert HeightMap.load(str(path)) is heightmap
+    assert isinstance(heightmap.height_data, np.memmap)
+    assert not heightmap.height_data.flags.writeable
+    np.testing.assert_array_equal(heightmap.height_data, elevation)
+
+    base_pos = np.array([[0.3, -0.2, 1.0], [0.0, 0.5, 1.0]])
+    base_yaw = np.array([0.3, -1.2])
+    points = np.random.default_rng(2).uniform(-1.5, 1.5, (10, 2))
+    heights = sample_hfield_heights(
+        heightmap.height_data,
+        HFIELD_SIZE,
+        HFIELD_POS,
+        base_pos,
+        base_yaw,
+        points,
+        height_range=(heightmap.min, heightmap.max),
+    )
+    expected = sample_hfield_heights(ELEVATION, HFIELD_SIZE, HFIELD_POS, base_pos, base_yaw, points)
+    np.testing.assert_allclose(heights, expected, atol=1e-5)
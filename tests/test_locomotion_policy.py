@@ -0,0 +1,146 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from motrixsim import SceneData, msd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "examples"))
+
+from utils.policy import G1Policy12Dof, Go2LocomotionPolicy, PipelinedPolicy
+from utils.robot import Go2Robot
+
+NUM_ENVS = 3
+
+
+def _diverged_state(model, robot, num_steps, seed):
+    """Dof state of a robot driven a few steps with random controls, to give every env its own state."""
+    rng = np.random.default_rng(seed)
+    data = SceneData(model)
+    for _ in range(num_steps):
+        robot.set_actuator_ctrls(data, rng.uniform(-0.5, 0.5, robot.num_actuators).astype(np.float32))
+        model.step(data)
+    return data.dof_pos, data.dof_vel
+
+
+@pytest.mark.parametrize("batch", [(), (NUM_ENVS,)])
+def test_robot_state_matches_accessors(batch):
+    model = msd.from_file(Go2Robot.mjcf_path).build()
+    robot = Go2Robot(model.get_body(Go2Robot.base_link_name))
+    data = SceneData(model, batch=batch) if batch else SceneData(model)
+    for _ in range(20):
+        model.step(data)
+
+    state = robot.state(data)
+    np.testing.assert_array_equal(state.local_linear_vel, robot.local_linear_vel(data))
+    np.testing.assert_array_equal(state.gyro, robot.gyro(data))
+    np.testing.assert_array_equal(state.dof_pos, robot.dof_pos(data))
+    np.testing.assert_array_equal(state.dof_vel, robot.dof_vel(data))
+    np.testing.assert_array_equal(np.concatenate([state.base_pos, state.base_quat], axis=-1), robot.base_pose(data))
+    rot = robot.body.get_rotation_mat(data)
+    np.testing.assert_allclose(state.gravity, np.einsum("...ji,j->...i", rot, [0.0, 0.0, -1.0]), atol=1e-5)
+
+    # the snapshot is refreshed in place
+    model.step(data)
+    assert robot.state(data) is state
+    np.testing.assert_array_equal(state.dof_pos, robot.dof_pos(data))
+
+
+@pytest.mark.parametrize("policy_class", [Go2LocomotionPolicy, G1Policy12Dof])
+def test_batched_policy_matches_single_instance_policies(tmp_path, monkeypatch, policy_class, write_linear_policy):
+    model = msd.from_file(Go2Robot.mjcf_path).build()
+    robot = Go2Robot(model.get_body(Go2Robot.base_link_name))
+    rng = np.random.default_rng(0)
+    weight = 0.05 * rng.standard_normal((policy_class.obs_dim, 12))
+    onnx_path = write_linear_policy(tmp_path / "policy.onnx", weight, 0.05 * rng.standard_normal(12))
+    monkeypatch.setattr(policy_class, "onnx_path", onnx_path)
+
+    batch = SceneData(model, batch=(NUM_ENVS,))
+    singles = [SceneData(model) for _ in range(NUM_ENVS)]
+    dof_pos = np.zeros((NUM_ENVS, model.num_dof_pos), dtype=np.float32)
+    dof_vel = np.zeros((NUM_ENVS, model.num_dof_vel), dtype=np.float32)
+    for i, single in enumerate(singles):
+        dof_pos[i], dof_vel[i] = _diverged_state(model, robot, 5 * (i + 1), seed=i)
+        single.set_dof_pos(dof_pos[i], model)
+        single.set_dof_vel(dof_vel[i])
+        model.forward_kinematic(single)
+    batch.set_dof_pos(dof_pos, model)
+    batch.set_dof_vel(dof_vel)
+    model.forward_kinematic(batch)
+
+    batch_policy = policy_class(robot)
+    single_policies = [policy_class(robot) for _ in range(NUM_ENVS)]
+    commands = np.array([[0.5, 0.0, 0.0], [0.0, 0.3, 0.0], [0.0, 0.0, -0.4]], dtype=np.float32)
+
+    for _ in range(3):
+        fallen = batch_policy.step(batch, commands)
+        assert fallen.shape == (NUM_ENVS,)
+        single_fallen = [
+            policy.step(data, commands[i]) for i, (policy, data) in enumerate(zip(single_policies, singles))
+        ]
+        np.testing.assert_array_equal(fallen, single_fallen)
+        np.testing.assert_allclose(
+            batch_policy.last_action, [policy.last_action for policy in single_policies], rtol=1e-5, atol=1e-5
+        )
+        # the observations are built into the persistent batch buffer
+        assert batch_policy.get_observation(batch, commands).shape == (NUM_ENVS, policy_class.obs_dim)
+
+        if hasattr(batch_policy, "pre_physics_step"):
+            batch_policy.pre_physics_step(batch)
+            for policy, data in zip(single_policies, singles):
+                policy.pre_physics_step(data)
+        model.step(batch)
+        for data in singles:
+            model.step(data)
+        np.testing.assert_allclose(batch.dof_pos, [data.dof_pos for data in singles], rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("policy_class", [Go2LocomotionPolicy, G1Policy12Dof])
+def test_pipelined_policy_applies_actions_one_tick_later(tmp_path, monkeypatch, policy_class, write_linear_policy):
+    model = msd.from_file(Go2Robot.mjcf_path).build()
+    robot = Go2Robot(model.get_body(Go2Robot.base_link_name))
+    rng = np.random.default_rng(1)
+    weight = 0.05 * rng.standard_normal((policy_class.obs_dim, 12))
+    onnx_path = write_linear_policy(tmp_path / "policy.onnx", weight, 0.05 * rng.standard_normal(12))
+    monkeypatch.setattr(policy_class, "onnx_path", onnx_path)
+    data = SceneData(model, batch=(NUM_ENVS,))
+    for _ in range(10):
+        model.step(data)
+    commands = np.array([[0.5, 0.0, 0.0], [0.0, 0.3, 0.0], [0.0, 0.0, -0.4]], dtype=np.float32)
+
+    # without physics in between, the pipelined policy lags the synchronous one by exactly one tick
+    sync_policy = policy_class(robot)
+    pipelined = PipelinedPolicy(policy_class(robot), latency=1)
+    try:
+        pipelined.step(data, commands)
+        assert not np.any(pipelined.last_action)
+        for _ in range(3):
+            sync_policy.step(data, commands)
+            fallen = pipelined.step(data, commands)
+            assert fallen.shape == (NUM_ENVS,)
+            np.testing.assert_allclose(pipelined.last_action, sync_policy.last_action, rtol=1e-5, atol=1e-6)
+
+        # the in-flight actions of reset instances are dropped
+        reset = np.array([False, True, False])
+        pipelined.reset(reset)
+        pipelined.step(data, commands)
+        assert not np.any(pipelined.last_action[1])
+        assert np.all(np.any(pipelined.last_action[~reset], axis=-1))
+    finally:
+        pipelined.close()
@@ -0,0 +1,132 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "examples" / "control"))
+
+import shadow_hand_repose as repose  # noqa: E402
+
+from motrixsim import SceneData, load_model  # noqa: E402
+
+
+def _write_hand_model(path):
+    """A stand-in for the shadow hand scene with the joint, link, actuator and body names of the policy."""
+    joints = "".join(
+        f'<body name="segment_{i}"><joint name="{name}" type="hinge" axis="0 1 0"/>'
+        '<geom type="sphere" size="0.005" mass="0.01"/>'
+        for i, name in enumerate(repose.HAND_JOINTS)
+    )
+    fingertips = "".join(
+        f'<body name="{name}" pos="0.0{i + 1} 0 0.3"><joint name="{name}_joint" type="hinge" axis="1 0 0"/>'
+        '<geom type="sphere" size="0.01" mass="0.01"/></body>'
+        for i, name in enumerate(repose.FINGERTIP_LINKS)
+    )
+    actuators = "".join(
+        f'<position name="{name}" joint="{repose.HAND_JOINTS[i]}" kp="1"/>' for i, name in enumerate(repose.ACTUATORS)
+    )
+    path.write_text(
+        f"""<mujoco>
+  <worldbody>
+    <body name="hand" pos="0.3 0 0.2">{joints}{"</body>" * len(repose.HAND_JOINTS)}</body>
+    {fingertips}
+    <body name="cube" pos="0.33 0 0.295"><freejoint/><geom type="box" size="0.02 0.02 0.02" mass="0.1"/></body>
+    <body name="target" mocap="true" pos="0.33 0 0.5">
+      <geom type="box" size="0.02 0.02 0.02" contype="0" conaffinity="0"/>
+    </body>
+  </worldbody>
+  <actuator>{actuators}</actuator>
+</mujoco>"""
+    )
+    return str(path)
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch, write_linear_policy):
+    weight = np.random.default_rng(0).standard_normal((repose.OBS_DIM, repose.ACTION_DIM)).astype(np.float32)
+    monkeypatch.setattr(repose, "ONNX_FILE", write_linear_policy(tmp_path / "policy.onnx", 0.1 * weight))
+    monkeypatch.setenv("MOTRIXSIM_ONNX_CACHE", "")
+    return load_model(_write_hand_model(tmp_path / "hand.xml"))
+
+
+def test_batched_repose_matches_single_instances(model):
+    num_envs = 3
+    batched_policy = repose.ShadowHandReposePolicy(model)
+    batched = SceneData(model, batch=(num_envs,))
+    batched_policy.reset_data(batched)
+    assert batched_policy.goal_rot.shape == (num_envs, 4)
+
+    singles = []
+    for i in range(num_envs):
+        policy = repose.ShadowHandReposePolicy(model)
+        data = SceneData(model)
+        policy.reset_data(data)
+        policy.goal_rot[:] = batched_policy.goal_rot[i]
+        singles.append((policy, data))
+
+    for _ in range(3):
+        for _ in range(5):
+            model.step(batched)
+            for _, data in singles:
+                model.step(data)
+        batched_policy.step(batched)
+        for policy, data in singles:
+            policy.step(data)
+
+    obs = batched_policy.compute_observation(batched)
+    assert obs.shape == (num_envs, repose.OBS_DIM)
+    for i, (policy, data) in enumerate(singles):
+        single_obs = policy.compute_observation(data)
+        assert single_obs.shape == (repose.OBS_DIM,)
+        np.testing.assert_allclose(obs[i], single_obs, rtol=1e-5, atol=1e-5)
+
+        # the sliced reads agree with the per-joint, per-link and per-actuator accessors
+        hand_pos = [model.get_joint(name).get_dof_pos(data)[0] for name in repose.HAND_JOINTS]
+        np.testing.assert_allclose(
+            single_obs[: repose.HAND_DOF_DIM],
+            repose.unscale(np.array(hand_pos), repose.HAND_DOF_LOWER, repose.HAND_DOF_UPPER),
+            rtol=1e-5,
+            atol=1e-5,
+        )
+        fingertip_pos = np.concatenate([model.get_link(name).get_pose(data)[:3] for name in repose.FINGERTIP_LINKS])
+        start = 2 * repose.HAND_DOF_DIM + 24
+        np.testing.assert_allclose(single_obs[start : start + 15], fingertip_pos, rtol=1e-5, atol=1e-5)
+        ctrls = [model.get_actuator(name).get_ctrl(data) for name in repose.ACTUATORS]
+        np.testing.assert_allclose(np.ravel(ctrls), policy.prev_actions, rtol=1e-6)
+
+
+def test_reset_data_resets_selected_instances(model):
+    policy = repose.ShadowHandReposePolicy(model)
+    data = SceneData(model, batch=(4,))
+    policy.reset_data(data)
+    for _ in range(3):
+        model.step(data)
+        policy.step(data)
+
+    goal_rot = policy.goal_rot.copy()
+    ctrls = data.actuator_ctrls.copy()
+    mask = np.array([False, True, False, True])
+    policy.reset_data(data, mask)
+
+    np.testing.assert_array_equal(policy.goal_rot[~mask], goal_rot[~mask])
+    np.testing.assert_allclose(np.linalg.norm(policy.goal_rot[mask], axis=-1), 1.0, rtol=1e-6)
+    np.testing.assert_array_equal(data.actuator_ctrls[~mask], ctrls[~mask])
+    assert not np.any(data.actuator_ctrls[mask])
+    assert not np.any(policy.prev_actions[mask])
+    np.testing.assert_allclose(data.dof_pos[mask][:, policy.cube_dof_pos_indices], [policy.cube_initial_dof_pos] * 2)
@@ -0,0 +1,291 @@
+# Copyright (C) 2020-2026 Motphys Technology Co., Ltd. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from legged_gym.envs.base.legged_robot_config import LeggedRobotCfg
+from legged_gym.envs.base.vec_legged_robot import VecLeggedRobot
+from legged_gym.utils.observation import ObsTerm
+from motrixsim import load_model
+
+MJCF = """
+<mujoco>
+  <worldbody>
+    <geom type="plane" size="5 5 0.1"/>
+    <body name="trunk" pos="0 0 0.5">
+      <freejoint/>
+      <geom type="box" size="0.2 0.1 0.05" mass="5"/>
+      <site name="imu"/>
+      <body name="front_leg" pos="0.2 0 0">
+        <joint name="front_joint" type="hinge" axis="0 1 0"/>
+        <geom type="capsule" fromto="0 0 0 0 0 -0.3" size="0.02" mass="0.5"/>
+      </body>
+      <body name="rear_leg" pos="-0.2 0 0">
+        <joint name="rear_joint" type="hinge" axis="0 1 0"/>
+        <geom type="capsule" fromto="0 0 0 0 0 -0.3" size="0.02" mass="0.5"/>
+      </body>
+    </body>
+  </worldbody>
+  <actuator>
+    <motor name="front_motor" joint="front_joint"/>
+    <motor name="rear_motor" joint="rear_joint"/>
+  </actuator>
+  <sensor>
+    <gyro name="gyro" site="imu"/>
+    <velocimeter name="local_linvel" site="imu"/>
+  </sensor>
+</mujoco>
+"""
+
+NUM_ENVS = 4
+
+
+class _VecEnv(VecLeggedRobot):
+    def compute_obs(self):
+        obs = np.zeros((self.num_envs, self.config.env.num_observations), dtype=np.float32)
+        obs[:, :3] = self.gravity
+        obs[:, 3:5] = self.dof_pos - self.default_angles
+        obs[:, 5:7] = self.dof_vel
+        obs[:, 7:10] = self.commands
+        return obs
+
+
+class _LayoutVecEnv(VecLeggedRobot):
+    def obs_terms(self):
+        return [
+            ObsTerm("gravity", 3),
+            ObsTerm("dof_pos", 2, offset=self.default_angles),
+            ObsTerm("dof_vel", 2),
+            ObsTerm("commands", 3),
+        ]
+
+    def compute_obs(self):
+        return self.obs_layout.fill(
+            self.obs, gravity=self.gravity, dof_pos=self.dof_pos, dof_vel=self.dof_vel, commands=self.commands
+        )
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    scene_path = tmp_path / "scene.xml"
+    scene_path.write_text(MJCF)
+
+    class Cfg(LeggedRobotCfg):
+        class env(LeggedRobotCfg.env):
+            num_observations = 10
+            num_actions = 2
+            num_envs = NUM_ENVS
+
+        class init_state(LeggedRobotCfg.init_state):
+            default_joint_angles = {"front_joint": 0.1, "rear_joint": -0.1}
+
+        class asset(LeggedRobotCfg.asset):
+            file = str(scene_path)
+            body_name = "trunk"
+
+        class viewer(LeggedRobotCfg.viewer):
+            render_mode = None
+
+    return Cfg
+
+
+def test_vec_buffers_are_batched(cfg):
+    env = _VecEnv(cfg)
+    env.step(np.zeros((NUM_ENVS, 2), dtype=np.float32))
+
+    assert env.data.shape == (NUM_ENVS,)
+    assert env.get_observation().shape == (NUM_ENVS, 10)
+    assert env.commands.shape == (NUM_ENVS, 3)
+    assert env.last_actions.shape == (NUM_ENVS, 2)
+    assert env.episode_length_buf.shape == (NUM_ENVS,)
+    assert env.reset_buf.shape == (NUM_ENVS,)
+    np.testing.assert_array_equal(env.episode_length_buf, 1)
+
+
+def test_vec_gravity_and_torques_match_per_env_computation(cfg):
+    env = _VecEnv(cfg)
+    actions = np.random.default_rng(0).uniform(-1, 1, (NUM_ENVS, 2)).astype(np.float32)
+    for _ in range(5):
+        env.step(actions)
+
+    for i in range(NUM_ENVS):
+        gravity = Rotation.from_quat(env.pose[i, 3:7]).inv().apply(np.array([0.0, 0.0, -1.0]))
+        np.testing.assert_allclose(env.gravity[i], gravity, atol=1e-6)
+
+    torques = env._compute_torques(actions)
+    expected = env.kps * (actions * cfg.control.action_scale + env.default_angles - env.dof_pos) - env.kds * env.dof_vel
+    np.testing.assert_allclose(torques, np.clip(expected, -cfg.control.torque_limits, cfg.control.torque_limits))
+
+
+def test_vec_reset_idx_only_touches_masked_envs(cfg):
+    env = _VecEnv(cfg)
+    actions = np.ones((NUM_ENVS, 2), dtype=np.float32)
+    for _ in range(10):
+        env.step(actions)
+    dof_pos_before = env.data.dof_pos
+
+    mask = np.array([True, False, True, False])
+    env.reset_idx(mask)
+
+    init_dof_pos = env.model.compute_init_dof_pos()
+    np.testing.assert_allclose(env.data.dof_pos[mask], np.broadcast_to(init_dof_pos, (2, init_dof_pos.size)))
+    np.testing.assert_allclose(env.data.dof_pos[~mask], dof_pos_before[~mask])
+    np.testing.assert_array_equal(env.episode_length_buf, [0, 10, 0, 10])
+    np.testing.assert_array_equal(env.last_actions[mask], 0.0)
+
+
+def test_vec_obs_layout_fills_persistent_buffer(cfg):
+    env = _LayoutVecEnv(cfg)
+    obs_buffer = env.obs
+    actions = np.random.default_rng(0).uniform(-1, 1, (NUM_ENVS, 2)).astype(np.float32)
+    for _ in range(3):
+        env.step(actions)
+        obs = env.get_observation()
+        assert obs is obs_buffer
+        np.testing.assert_allclose(obs, _VecEnv.compute_obs(env), atol=1e-6)
+
+    assert obs.dtype == np.float32
+    assert obs.shape == (NUM_ENVS, env.obs_layout.num_obs)
+    assert env.obs_layout.slices["dof_vel"] == slice(5, 7)
+
+
+def test_vec_control_tables_are_cached_across_envs_and_resets(cfg):
+    env = _VecEnv(cfg)
+    other = _VecEnv(cfg)
+    assert other.kps is env.kps
+    assert other.default_angles is env.default_angles
+    assert not env.kps.flags.writeable
+
+    env.reset_buf[:] = True
+    env.reset()
+    assert env.kps is other.kps
+    assert not env.reset_buf.any()
+
+
+def test_control_table_indexes_dofs_in_actuator_order(cfg, tmp_path):
+    env = _VecEnv(cfg)
+    assert env.control_table.dof_pos_index == slice(7, 9)
+    assert env.default_angles.dtype == np.float32
+
+    # actuators declared in the reverse order of the joints
+    scene_path = tmp_path / "reversed.xml"
+    front_motor = '<motor name="front_motor" joint="front_joint"/>'
+    rear_motor = '<motor name="rear_motor" joint="rear_joint"/>'
+    scene_path.write_text(
+        MJCF.replace(front_motor, "FRONT").replace(rear_motor, front_motor).replace("FRONT", rear_motor)
+    )
+
+    class ReversedCfg(cfg):
+        class asset(cfg.asset):
+            file = str(scene_path)
+
+    env = _VecEnv(ReversedCfg)
+    np.testing.assert_array_equal(env.control_table.dof_pos_index, [8, 7])
+    np.testing.assert_array_equal(env.control_table.dof_vel_index, [7, 6])
+    np.testing.assert_allclose(env.default_angles, [-0.1, 0.1])
+    np.testing.assert_allclose(env.dof_pos, env.data.dof_pos[:, [8, 7]])
+
+
+@pytest.mark.parametrize("batch_size", [1, NUM_ENVS])
+def test_fused_substeps_match_python_pd_loop(cfg, tmp_path, batch_size):
+    # position actuators driven by the engine, without damping both integrate the same PD law
+    scene_path = tmp_path / "position.xml"
+    scene_path.write_text(MJCF.replace("<motor ", '<position forcerange="-3 3" '))
+
+    class MotorCfg(cfg):
+        class env(cfg.env):
+            num_envs = batch_size
+
+        class control(cfg.control):
+            stiffness = 20
+            damping = 0
+            torque_limits = 3.0
+
+    class FusedCfg(MotorCfg):
+        class asset(cfg.asset):
+            file = str(scene_path)
+
+        class control(MotorCfg.control):
+            fused_substeps = True
+
+    motor_env = _VecEnv(MotorCfg)
+    fused_env = _VecEnv(FusedCfg)
+    actions = np.random.default_rng(0).uniform(-1, 1, (batch_size, 2)).astype(np.float32)
+    for _ in range(10):
+        motor_env.step(actions)
+        fused_env.step(actions)
+
+    np.testing.assert_allclose(fused_env.data.dof_pos, motor_env.data.dof_pos, atol=1e-5)
+
+
+def test_fused_substeps_update_substep_state(cfg, tmp_path):
+    scene_path = tmp_path / "position.xml"
+    scene_path.write_text(MJCF.replace("<motor ", '<position forcerange="-3 3" '))
+
+    class FusedCfg(cfg):
+        class asset(cfg.asset):
+            file = str(scene_path)
+
+        class control(cfg.control):
+            fused_substeps = True
+
+    class _StateVecEnv(_VecEnv):
+        def _update_substep_state(self):
+            self.estimate = self.dof_pos.copy()
+
+    env = _StateVecEnv(FusedCfg)
+    env.step(np.ones((NUM_ENVS, 2), dtype=np.float32))
+
+    # refreshed from the dof state after the last substep
+    np.testing.assert_array_equal(env.estimate, env.data.dof_pos[..., env.control_table.dof_pos_index])
+
+
+def test_fused_substeps_require_position_actuators(cfg):
+    class FusedCfg(cfg):
+        class control(cfg.control):
+            fused_substeps = True
+
+    with pytest.raises(ValueError, match="position actuators"):
+        _VecEnv(FusedCfg)
+
+
+def test_bundled_go1_config_rejects_fused_substeps():
+    from legged_gym.envs.go1.go1 import Go1_vec_env
+    from legged_gym.envs.go1.go1_config import Go1Cfg
+
+    try:
+        load_model(Go1Cfg.asset.file)
+    except RuntimeError as error:
+        pytest.skip(f"go1 scene assets unavailable: {error}")
+
+    class FusedCfg(Go1Cfg):
+        class control(Go1Cfg.control):
+            fused_substeps = True
+
+    # the bundled scenes declare motor actuators
+    with pytest.raises(ValueError, match="position actuators"):
+        Go1_vec_env(FusedCfg)
+
+
+def test_headless_env_never_creates_renderer(cfg):
+    env = _VecEnv(cfg)
+    env.step(np.zeros((NUM_ENVS, 2), dtype=np.float32))
+    env.render()
+
+    assert env._render is None
+    with pytest.raises(RuntimeError):
+        env.get_render()